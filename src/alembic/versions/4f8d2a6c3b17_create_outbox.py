@@ -0,0 +1,70 @@
+"""Create outbox
+
+Revision ID: 4f8d2a6c3b17
+Revises: 7c2e5b9a1f43
+Create Date: 2026-10-17 21:04:12.381904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f8d2a6c3b17'
+down_revision: Union[str, None] = '7c2e5b9a1f43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'outbox',
+        sa.Column('sequence', sa.BigInteger(), sa.Identity(always=True), nullable=False),
+        sa.Column('event_id', sa.UUID(), nullable=False),
+        sa.Column(
+            'event_type',
+            postgresql.ENUM('CREATED', 'UPDATED', 'DELETED', name='eventtypeenum', create_type=False),
+            nullable=False,
+        ),
+        sa.Column(
+            'entity_type',
+            postgresql.ENUM(
+                'METRIC_SET', 'METRIC_SET_TREE', 'METRIC', 'DATA_METRIC', 'PROPERTY',
+                name='entitytypeenum',
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column('node_id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=True),
+        sa.Column('new_data', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('created', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('sequence'),
+    )
+    # every event, however it is inserted, is copied to the outbox in its own transaction
+    op.execute(
+        """
+        CREATE FUNCTION copy_event_to_outbox() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO outbox (event_id, event_type, entity_type, node_id, user_id, new_data, created)
+            VALUES (NEW.id, NEW.event_type, NEW.entity_type, NEW.node_id, NEW.user_id, NEW.new_data, NEW.created);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER events_copy_to_outbox AFTER INSERT ON events
+        FOR EACH ROW EXECUTE FUNCTION copy_event_to_outbox()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER events_copy_to_outbox ON events')
+    op.execute('DROP FUNCTION copy_event_to_outbox()')
+    op.drop_table('outbox')
@@ -0,0 +1,37 @@
+"""Create meta_data GIN indexes
+
+Revision ID: 7c2e5b9a1f43
+Revises: 2d10f69d0da4
+Create Date: 2026-10-17 10:12:41.503127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5b9a1f43'
+down_revision: Union[str, None] = '2d10f69d0da4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLES = ('metrics', 'data_metrics', 'metric_set_trees', 'metric_sets')
+
+
+def upgrade() -> None:
+    # jsonb_path_ops only serves @> containment, which is what the metadata filters compile to
+    for table in _TABLES:
+        op.create_index(
+            f'ix_{table}_meta_data',
+            table,
+            ['meta_data'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'meta_data': 'jsonb_path_ops'},
+        )
+
+
+def downgrade() -> None:
+    for table in _TABLES:
+        op.drop_index(f'ix_{table}_meta_data', table_name=table)
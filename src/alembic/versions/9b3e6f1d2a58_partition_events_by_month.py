@@ -0,0 +1,119 @@
+"""Partition events by month
+
+Revision ID: 9b3e6f1d2a58
+Revises: 4f8d2a6c3b17
+Create Date: 2026-10-17 22:41:37.518240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3e6f1d2a58'
+down_revision: Union[str, None] = '4f8d2a6c3b17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = 'id, created, updated, deleted, event_type, entity_type, node_id, user_id, new_data'
+
+
+def events_columns() -> list[sa.Column]:
+    return [
+        sa.Column(
+            'event_type',
+            postgresql.ENUM('CREATED', 'UPDATED', 'DELETED', name='eventtypeenum', create_type=False),
+            nullable=False,
+        ),
+        sa.Column(
+            'entity_type',
+            postgresql.ENUM(
+                'METRIC_SET', 'METRIC_SET_TREE', 'METRIC', 'DATA_METRIC', 'PROPERTY',
+                name='entitytypeenum',
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column('node_id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=True),
+        sa.Column('new_data', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('deleted', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated', sa.DateTime(timezone=True), nullable=False),
+    ]
+
+
+def create_events_indexes_and_trigger() -> None:
+    op.create_index(op.f('ix_events_entity_type'), 'events', ['entity_type'], unique=False)
+    op.create_index(op.f('ix_events_node_id'), 'events', ['node_id'], unique=False)
+    # created after the rows are copied, so they are not copied to the outbox again
+    op.execute(
+        """
+        CREATE TRIGGER events_copy_to_outbox AFTER INSERT ON events
+        FOR EACH ROW EXECUTE FUNCTION copy_event_to_outbox()
+        """
+    )
+
+
+def upgrade() -> None:
+    op.execute('DROP TRIGGER events_copy_to_outbox ON events')
+    op.drop_index('ix_events_node_id', table_name='events')
+    op.drop_index('ix_events_entity_type', table_name='events')
+    op.rename_table('events', 'events_unpartitioned')
+    op.execute('ALTER INDEX events_pkey RENAME TO events_unpartitioned_pkey')
+
+    op.create_table(
+        'events',
+        *events_columns(),
+        sa.PrimaryKeyConstraint('created', 'id'),
+        postgresql_partition_by='RANGE (created)',
+    )
+    # catches the events outside of the monthly partitions, it should stay empty
+    op.execute('CREATE TABLE events_default PARTITION OF events DEFAULT')
+    # the months of the existing events and the next 3 months, the CLI creates the following ones
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            partition_month timestamp := date_trunc(
+                'month', coalesce((SELECT min(created) FROM events_unpartitioned), now()) AT TIME ZONE 'UTC'
+            );
+        BEGIN
+            WHILE partition_month <= date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months' LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF events FOR VALUES FROM (%L) TO (%L)',
+                    'events_y' || to_char(partition_month, 'YYYY') || 'm' || to_char(partition_month, 'MM'),
+                    partition_month AT TIME ZONE 'UTC',
+                    (partition_month + interval '1 month') AT TIME ZONE 'UTC'
+                );
+                partition_month := partition_month + interval '1 month';
+            END LOOP;
+        END
+        $$
+        """
+    )
+    op.execute(f'INSERT INTO events ({COLUMNS}) SELECT {COLUMNS} FROM events_unpartitioned')
+    op.drop_table('events_unpartitioned')
+    # the lookups by id alone scan the index of each partition, it cannot be unique without the partition key
+    op.create_index('ix_events_id', 'events', ['id'], unique=False)
+    create_events_indexes_and_trigger()
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER events_copy_to_outbox ON events')
+    op.create_table(
+        'events_unpartitioned',
+        *events_columns(),
+        sa.PrimaryKeyConstraint('id', name='events_unpartitioned_pkey'),
+    )
+    # the partitions detached by the CLI are left out
+    op.execute(f'INSERT INTO events_unpartitioned ({COLUMNS}) SELECT {COLUMNS} FROM events')
+    # drops the attached partitions with it
+    op.drop_table('events')
+    op.rename_table('events_unpartitioned', 'events')
+    op.execute('ALTER INDEX events_unpartitioned_pkey RENAME TO events_pkey')
+    create_events_indexes_and_trigger()
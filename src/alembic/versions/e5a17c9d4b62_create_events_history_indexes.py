@@ -0,0 +1,38 @@
+"""Create events history indexes
+
+Revision ID: e5a17c9d4b62
+Revises: 9b3e6f1d2a58
+Create Date: 2026-10-17 23:52:09.114862
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a17c9d4b62'
+down_revision: Union[str, None] = '9b3e6f1d2a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # created on the partitioned table, so on every partition; they lead with the columns of the single-column ones
+    op.create_index(
+        'ix_events_node_id_created',
+        'events',
+        ['node_id', sa.text('created DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+    op.create_index('ix_events_entity_type_created', 'events', ['entity_type', 'created'], unique=False)
+    op.drop_index('ix_events_node_id', table_name='events')
+    op.drop_index('ix_events_entity_type', table_name='events')
+
+
+def downgrade() -> None:
+    op.create_index('ix_events_entity_type', 'events', ['entity_type'], unique=False)
+    op.create_index('ix_events_node_id', 'events', ['node_id'], unique=False)
+    op.drop_index('ix_events_entity_type_created', table_name='events')
+    op.drop_index('ix_events_node_id_created', table_name='events')
@@ -1,9 +1,16 @@
 # cli.py
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
 import click
 from colorama import Fore, init
 from matter_task_queue import async_to_sync
 
+from app.common.enums.enums import EntityTypeEnum
 from app.dependencies import Dependencies
+from app.env import SETTINGS
 
 init(autoreset=True)
 
@@ -32,5 +39,149 @@ def check_health(deep):
     click.echo(health_status_model.dict())
 
 
+@cli.command()
+@click.option("--limit", default=100, help="Page size of every search.")
+@click.option("--iterations", default=50, help="Number of searches per entity type and read path.")
+def benchmark_meta_data_resolution(limit, iterations):
+    """Compares resolving the metadata property names in SQL against the cached conversion in Python."""
+    find_methods = {
+        EntityTypeEnum.METRIC: Dependencies.metric_service().find_metrics,
+        EntityTypeEnum.DATA_METRIC: Dependencies.data_metric_service().find_data_metrics,
+        EntityTypeEnum.METRIC_SET: Dependencies.metric_set_service().find_metric_sets,
+        EntityTypeEnum.METRIC_SET_TREE: Dependencies.metric_set_tree_service().find_metric_set_trees,
+    }
+
+    async def run_benchmark():
+        await Dependencies.start_background_tasks()
+        try:
+            for entity_type, find_method in find_methods.items():
+                for resolve_meta_data_in_sql, path_name in ((False, "python"), (True, "sql")):
+                    # the first search warms the property cache and the connection pool
+                    await find_method(limit=limit, resolve_meta_data_in_sql=resolve_meta_data_in_sql)
+
+                    durations = []
+                    for _ in range(iterations):
+                        start = time.perf_counter()
+                        await find_method(limit=limit, resolve_meta_data_in_sql=resolve_meta_data_in_sql)
+                        durations.append((time.perf_counter() - start) * 1000)
+
+                    percentiles = statistics.quantiles(durations, n=100)
+                    click.echo(
+                        f"{Fore.GREEN}{entity_type.value:<16} {path_name:<6} "
+                        f"p50={percentiles[49]:.2f}ms p99={percentiles[98]:.2f}ms"
+                    )
+        finally:
+            await Dependencies.stop()
+
+    async_to_sync(run_benchmark)
+
+
+@cli.command()
+@click.option("--limit", default=1000, help="Page size of every search.")
+@click.option("--iterations", default=50, help="Number of searches per entity type and read path.")
+def benchmark_core_read_path(limit, iterations):
+    """Compares the Core read path against the ORM read path, in latency and in memory allocated per search."""
+    find_methods = {
+        EntityTypeEnum.METRIC: Dependencies.metric_service().find_metrics,
+        EntityTypeEnum.DATA_METRIC: Dependencies.data_metric_service().find_data_metrics,
+        EntityTypeEnum.METRIC_SET: Dependencies.metric_set_service().find_metric_sets,
+        EntityTypeEnum.METRIC_SET_TREE: Dependencies.metric_set_tree_service().find_metric_set_trees,
+    }
+
+    async def run_benchmark():
+        await Dependencies.start_background_tasks()
+        try:
+            for entity_type, find_method in find_methods.items():
+                for core_read_path, path_name in ((False, "orm"), (True, "core")):
+                    # the first search warms the property cache, the statement cache and the connection pool
+                    await find_method(limit=limit, core_read_path=core_read_path)
+
+                    durations = []
+                    for _ in range(iterations):
+                        start = time.perf_counter()
+                        await find_method(limit=limit, core_read_path=core_read_path)
+                        durations.append((time.perf_counter() - start) * 1000)
+
+                    # traced separately, tracing slows down every allocation and would skew the durations
+                    peaks = []
+                    tracemalloc.start()
+                    try:
+                        for _ in range(iterations):
+                            tracemalloc.reset_peak()
+                            baseline = tracemalloc.get_traced_memory()[0]
+                            await find_method(limit=limit, core_read_path=core_read_path)
+                            peaks.append((tracemalloc.get_traced_memory()[1] - baseline) / 1024)
+                    finally:
+                        tracemalloc.stop()
+
+                    percentiles = statistics.quantiles(durations, n=100)
+                    click.echo(
+                        f"{Fore.GREEN}{entity_type.value:<16} {path_name:<5} "
+                        f"p50={percentiles[49]:.2f}ms p99={percentiles[98]:.2f}ms "
+                        f"peak={statistics.mean(peaks):.0f}KiB"
+                    )
+        finally:
+            await Dependencies.stop()
+
+    async_to_sync(run_benchmark)
+
+
+@cli.command()
+@click.option("--months-ahead", default=3, help="Number of months after the current one to create the partitions of.")
+@click.option(
+    "--retention-months",
+    default=None,
+    type=int,
+    help="Number of months before the current one to keep the partitions of, all are kept without it.",
+)
+@click.option("--drop", is_flag=True, help="Drop the expired partitions instead of only detaching them.")
+def manage_event_partitions(months_ahead, retention_months, drop):
+    """Creates the upcoming monthly partitions of the events and detaches, or drops, the expired ones."""
+    event_service = Dependencies.event_service()
+
+    async def run():
+        try:
+            return await event_service.manage_partitions(
+                months_ahead=months_ahead,
+                retention_months=retention_months,
+                drop=drop,
+            )
+        finally:
+            await Dependencies.stop()
+
+    created_partitions, detached_partitions = async_to_sync(run)
+    for name in created_partitions:
+        click.echo(f"{Fore.GREEN}Created partition {name}")
+    for name in detached_partitions:
+        click.echo(f"{Fore.GREEN}{'Dropped' if drop else 'Detached'} partition {name}")
+
+
+@cli.command()
+@click.option(
+    "--retention-days",
+    default=SETTINGS.event_retention_days,
+    help="Number of days of events to keep, the older ones are archived.",
+)
+@click.option("--directory", default=SETTINGS.event_archive_directory, help="Directory of the archive files.")
+@click.option("--batch-size", default=SETTINGS.event_archive_batch_size, help="Number of events per file and deletion.")
+@click.option("--compact", is_flag=True, help="Keep one snapshot event per updated node instead of its UPDATE events.")
+def archive_events(retention_days, directory, batch_size, compact):
+    """Archives the events older than the retention to compressed JSON lines files and deletes them."""
+    event_archiver = Dependencies.event_archiver(directory=directory, batch_size=batch_size)
+    before = datetime.now(tz=timezone.utc) - timedelta(days=retention_days)
+
+    async def run():
+        try:
+            return await event_archiver.archive(before=before, compact=compact)
+        finally:
+            await Dependencies.stop()
+
+    archived, deleted, snapshots = async_to_sync(run)
+    click.echo(
+        f"{Fore.GREEN}Archived {archived} events created before {before.isoformat()}, "
+        f"deleted {deleted}, created {snapshots} snapshots"
+    )
+
+
 if __name__ == "__main__":
     cli()
@@ -40,3 +40,9 @@ class PlacementEnum(enum.Enum):
     SDGS = "datasets/sdgs"
     REGULATORY = "datasets/regulatory"
     COLLECTIONS = "collections/matter"
+
+
+class CountModeEnum(enum.Enum):
+    NONE = "none"
+    EXACT = "exact"
+    ESTIMATED = "estimated"
@@ -3,43 +3,70 @@ from typing import List
 from uuid import UUID
 
 from matter_persistence.sql.exceptions import DatabaseRecordNotFoundError
-from matter_persistence.sql.manager import DatabaseManager
 from matter_persistence.sql.utils import SortMethodModel, commit, find, get
-from sqlalchemy import select
+from sqlalchemy import Select, any_, bindparam, delete, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import with_expression
 
+from app.common.enums.enums import EntityTypeEnum
 from app.components.data_metrics.models.data_metric import DataMetricModel
 from app.components.data_metrics.models.data_metric_update import DataMetricUpdateModel
+from app.components.utils.bulk_update_sql import bulk_update_statement
+from app.components.utils.core_read import find_rows, get_row, plain_columns
+from app.components.utils.count_sql import count
+from app.components.utils.meta_data_sql import meta_data_filter, meta_data_names_expression
+from app.components.utils.pagination import Cursor, chain_filters, is_cursor_sort, keyset_pagination
+from app.components.utils.replicated_database_manager import ReplicatedDatabaseManager
+from app.components.utils.sparse_fields import Fields, load_fields
 
 
 class DataMetricDAL:
     def __init__(
         self,
-        database_manager: DatabaseManager,
+        database_manager: ReplicatedDatabaseManager,
     ):
         self._database_manager = database_manager
 
     async def get_data_metric(
         self,
         data_metric_id: UUID,
+        fields: Fields | None = None,
+        core_read_path: bool = False,
     ) -> DataMetricModel:
-        statement = select(DataMetricModel).where(DataMetricModel.id == data_metric_id)
-
-        async with self._database_manager.session() as session:
-            data_metric_model = await get(
-                session=session,
-                statement=statement,
-            )
+        if core_read_path:
+            statement = select(*plain_columns(DataMetricModel, fields)).where(DataMetricModel.id == data_metric_id)
+        else:
+            statement = select(DataMetricModel).where(DataMetricModel.id == data_metric_id)
+            if fields:
+                statement = load_fields(DataMetricModel, fields)(statement)
+
+        async with self._database_manager.read_session() as session:
+            if core_read_path:
+                data_metric_model = await get_row(session=session, statement=statement)
+            else:
+                data_metric_model = await get(
+                    session=session,
+                    statement=statement,
+                )
 
             if data_metric_model is None:
-                raise DatabaseRecordNotFoundError(
-                    description=f"DataMetricModel with Metric Set Id '{data_metric_id}' not found.",
-                    detail={
-                        "data_metric_id": data_metric_id,
-                    },
-                )
+                raise self._not_found_error(data_metric_id)
 
             return data_metric_model
 
+    async def get_data_metrics(
+        self,
+        data_metric_ids: List[UUID],
+    ) -> List[DataMetricModel]:
+        statement = select(DataMetricModel).where(
+            DataMetricModel.id
+            == any_(bindparam("data_metric_ids", data_metric_ids, type_=ARRAY(PG_UUID(as_uuid=True))))
+        )
+
+        async with self._database_manager.read_session() as session:
+            return (await session.execute(statement)).scalars().all()
+
     async def find_data_metrics(
         self,
         skip: int = 0,
@@ -48,8 +75,47 @@ class DataMetricDAL:
         sort_method: SortMethodModel = None,
         with_deleted: bool = True,
         filters: dict | None = None,
+        resolve_meta_data_names: bool = False,
+        after: Cursor | None = None,
+        meta_data_filters: dict | None = None,
+        fields: Fields | None = None,
+        core_read_path: bool = False,
     ) -> List[DataMetricModel]:
-        async with self._database_manager.session() as session:
+        if fields and sort_field and is_cursor_sort(sort_field):
+            # the cursor of the next page is built from the sort field
+            fields = (*fields, sort_field)
+        custom_filter = meta_data_filter(DataMetricModel, meta_data_filters) if meta_data_filters else None
+        if is_cursor_sort(sort_field):
+            # keyset pagination takes over the ordering, with the id breaking ties
+            custom_filter = chain_filters(
+                custom_filter, keyset_pagination(DataMetricModel, sort_field, sort_method, after)
+            )
+            sort_field = None
+
+        if core_read_path:
+            async with self._database_manager.read_session() as session:
+                return await find_rows(
+                    session=session,
+                    db_model=DataMetricModel,
+                    skip=skip,
+                    limit=limit,
+                    sort_field=sort_field,
+                    sort_method=sort_method,
+                    with_deleted=with_deleted,
+                    filters=filters,
+                    custom_filter=custom_filter,
+                    fields=fields,
+                    meta_data_names=meta_data_names_expression(DataMetricModel, EntityTypeEnum.DATA_METRIC)
+                    if resolve_meta_data_names
+                    else None,
+                )
+
+        custom_filter = chain_filters(
+            custom_filter,
+            self._with_meta_data_names if resolve_meta_data_names else None,
+            load_fields(DataMetricModel, fields) if fields else None,
+        )
+        async with self._database_manager.read_session() as session:
             return await find(
                 session=session,
                 db_model=DataMetricModel,
@@ -59,6 +125,26 @@ class DataMetricDAL:
                 sort_method=sort_method,
                 with_deleted=with_deleted,
                 filters=filters,
+                custom_filter=custom_filter,
+            )
+
+    async def count_data_metrics(
+        self,
+        with_deleted: bool = True,
+        filters: dict | None = None,
+        meta_data_filters: dict | None = None,
+        estimated: bool = False,
+    ) -> int:
+        custom_filter = meta_data_filter(DataMetricModel, meta_data_filters) if meta_data_filters else None
+
+        async with self._database_manager.read_session() as session:
+            return await count(
+                session=session,
+                db_model=DataMetricModel,
+                with_deleted=with_deleted,
+                filters=filters,
+                custom_filter=custom_filter,
+                estimated=estimated,
             )
 
     async def create_data_metric(self, data_metric_model: DataMetricModel) -> DataMetricModel:
@@ -68,45 +154,97 @@ class DataMetricDAL:
 
         return data_metric_model
 
+    async def create_data_metrics(self, data_metric_models: List[DataMetricModel]) -> List[DataMetricModel]:
+        async with self._database_manager.session() as session:
+            # the rows are flushed together, as batched multi-row inserts in a single transaction
+            session.add_all(data_metric_models)
+            await commit(session)
+
+        return data_metric_models
+
     async def update_data_metric(
         self,
         data_metric_id: UUID,
         data_metric_update_model: DataMetricUpdateModel,
     ) -> DataMetricModel:
-        data_metric_model = await self.get_data_metric(data_metric_id)
+        values = {
+            k: v
+            for k, v in data_metric_update_model.model_dump().items()
+            if k not in ["created", "deleted", "updated"] and hasattr(DataMetricModel, k) and v is not None
+        }  # deleted is handled by the delete method
+        statement = (
+            update(DataMetricModel)
+            .where(DataMetricModel.id == data_metric_id, DataMetricModel.deleted.is_(None))
+            .values(**values, updated=datetime.now(tz=timezone.utc))
+            .returning(DataMetricModel)
+        )
 
         async with self._database_manager.session() as session:
-            data_metric_model = await session.merge(data_metric_model)
-            for k, v in data_metric_update_model.model_dump().items():
-                if k not in [
-                    "created",
-                    "deleted",
-                    "updated",
-                ]:
-                    if hasattr(data_metric_model, k) and v is not None:
-                        setattr(data_metric_model, k, v)
-
+            data_metric_model = (await session.execute(statement)).scalar_one_or_none()
             await commit(session)
 
+        if data_metric_model is None:
+            raise self._not_found_error(data_metric_id)
+
         return data_metric_model
 
+    async def update_data_metrics(
+        self,
+        data_metric_update_models: dict[UUID, DataMetricUpdateModel],
+    ) -> List[DataMetricModel]:
+        if not data_metric_update_models:
+            return []
+
+        statement = bulk_update_statement(DataMetricModel, data_metric_update_models)
+
+        async with self._database_manager.session() as session:
+            data_metric_models = (await session.execute(statement)).scalars().all()
+            await commit(session)
+
+        return data_metric_models
+
     async def delete_data_metric(
         self,
         data_metric_id: UUID,
         soft_delete: bool = True,
     ) -> DataMetricModel:
-        data_metric_model = await self.get_data_metric(data_metric_id)
+        deleted = datetime.now(tz=timezone.utc)
+        if soft_delete:
+            statement = (
+                update(DataMetricModel)
+                .where(DataMetricModel.id == data_metric_id, DataMetricModel.deleted.is_(None))
+                .values(deleted=deleted, updated=deleted)
+                .returning(DataMetricModel)
+            )
+        else:
+            statement = delete(DataMetricModel).where(DataMetricModel.id == data_metric_id).returning(DataMetricModel)
 
         async with self._database_manager.session() as session:
-            data_metric_model = await session.merge(data_metric_model)
-            if soft_delete:
-                data_metric_model.deleted = datetime.now(tz=timezone.utc)
-            else:
-                await session.delete(data_metric_model)
-
+            data_metric_model = (await session.execute(statement)).scalar_one_or_none()
             await commit(session)
 
-            if data_metric_model.deleted is None:
-                data_metric_model.deleted = datetime.now(tz=timezone.utc)
+        if data_metric_model is None:
+            raise self._not_found_error(data_metric_id)
+
+        if data_metric_model.deleted is None:
+            data_metric_model.deleted = deleted
 
         return data_metric_model
+
+    @staticmethod
+    def _with_meta_data_names(statement: Select) -> Select:
+        return statement.options(
+            with_expression(
+                DataMetricModel.meta_data_names,
+                meta_data_names_expression(DataMetricModel, EntityTypeEnum.DATA_METRIC),
+            )
+        )
+
+    @staticmethod
+    def _not_found_error(data_metric_id: UUID) -> DatabaseRecordNotFoundError:
+        return DatabaseRecordNotFoundError(
+            description=f"DataMetricModel with Metric Set Id '{data_metric_id}' not found.",
+            detail={
+                "data_metric_id": data_metric_id,
+            },
+        )
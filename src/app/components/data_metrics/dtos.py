@@ -20,6 +20,15 @@ class DataMetricUpdateInDTO(DataMetricInDTO):
     meta_data: dict | None = Field(None, alias="metaData")
 
 
+class DataMetricSearchInDTO(DataMetricUpdateInDTO):
+    meta_data_filters: dict | None = Field(None, alias="metaDataFilters")
+
+
+class DataMetricPatchInDTO(BaseModel):
+    id: uuid.UUID = Field(..., alias="id")
+    changes: DataMetricUpdateInDTO = Field(..., alias="changes")
+
+
 class DataMetricOutDTO(FoundationModel):
     id: uuid.UUID
 
@@ -36,5 +45,13 @@ class DataMetricDeletionOutDTO(DataMetricOutDTO):
 
 
 class DataMetricListOutDTO(FoundationModel):
+    count: int
+    total: int | None = Field(None, description="Total number of matching items, given with a count_mode")
+    next_cursor: str | None = Field(None, alias="nextCursor")
+    data_metrics: List[FullDataMetricOutDTO]
+
+
+class DataMetricBatchOutDTO(FoundationModel):
     count: int
     data_metrics: List[FullDataMetricOutDTO]
+    missing_ids: List[uuid.UUID] = Field(..., alias="missingIds")
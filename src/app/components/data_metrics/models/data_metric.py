@@ -1,7 +1,7 @@
 from matter_persistence.sql.base import CustomBase
-from sqlalchemy import UUID, Column, String
+from sqlalchemy import UUID, Column, Index, String
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import query_expression, relationship
 
 
 class DataMetricModel(CustomBase):
@@ -16,5 +16,15 @@ class DataMetricModel(CustomBase):
     metric_type = Column(String(50), nullable=False, index=True)
     name = Column(String(100), nullable=False, index=True)
     meta_data = Column(JSONB, nullable=True)
+    meta_data_names = query_expression()  # meta_data keyed by property name, loaded only on request
 
     metrics = relationship("MetricModel", back_populates="data_metric")
+
+    __table_args__ = (
+        Index(
+            "ix_data_metrics_meta_data",
+            "meta_data",
+            postgresql_using="gin",
+            postgresql_ops={"meta_data": "jsonb_path_ops"},
+        ),
+    )
@@ -1,5 +1,7 @@
+import asyncio
 import uuid
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, List
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, status
 from fastapi.responses import JSONResponse
@@ -8,20 +10,28 @@ from pydantic_core import from_json
 
 from app.auth import jwt_authorizer
 from app.auth.models import AuthorizedClient
-from app.common.enums.enums import EntityTypeEnum, EventTypeEnum
+from app.common.enums.enums import CountModeEnum, EntityTypeEnum, EventTypeEnum
 from app.components.data_metrics.dtos import (
+    DataMetricBatchOutDTO,
     DataMetricDeletionOutDTO,
     DataMetricInDTO,
     DataMetricListOutDTO,
     DataMetricOutDTO,
+    DataMetricPatchInDTO,
+    DataMetricSearchInDTO,
     DataMetricUpdateInDTO,
     FullDataMetricOutDTO,
 )
 from app.components.data_metrics.models.data_metric import DataMetricModel
 from app.components.data_metrics.models.data_metric_update import DataMetricUpdateModel
 from app.components.data_metrics.service import DataMetricService
+from app.components.events.dtos import EventListOutDTO
+from app.components.events.history import history_response
 from app.components.events.models.event import EventModel
 from app.components.events.service import EventService
+from app.components.utils.dtos import BatchGetInDTO, BulkItemOutDTO, BulkOutDTO
+from app.components.utils.pagination import next_cursor
+from app.components.utils.sparse_fields import parse_fields, sparse_dto, sparse_list_dto, sparse_response
 from app.dependencies import Dependencies
 from app.env import SETTINGS
 
@@ -34,6 +44,7 @@ authorizer = jwt_authorizer
     status_code=status.HTTP_201_CREATED,
     response_model=DataMetricOutDTO,
     response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
 )
 async def create_data_metric(
     data_metric_in_dto: DataMetricInDTO,
@@ -65,6 +76,84 @@ async def create_data_metric(
     return response_dto
 
 
+@data_metric_router.post(
+    "/bulk",
+    status_code=status.HTTP_201_CREATED,
+    response_model=BulkOutDTO,
+    response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
+)
+async def create_data_metrics(
+    data_metric_in_dtos: Annotated[List[DataMetricInDTO], Body(max_length=SETTINGS.bulk_max_items)],
+    data_metric_service: DataMetricService = Depends(Dependencies.data_metric_service),
+    event_service: EventService = Depends(Dependencies.event_service),
+    client: AuthorizedClient = Depends(authorizer),
+):
+    if not client.is_super_user():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    """
+    Creates the given data_metrics in one transaction, skipping the ones with invalid metadata.
+    """
+    results = await data_metric_service.create_data_metrics(
+        data_metric_models=[
+            DataMetricModel.parse_obj(data_metric_in_dto) for data_metric_in_dto in data_metric_in_dtos
+        ],
+    )
+    created = [
+        (data_metric_in_dto, result)
+        for data_metric_in_dto, result in zip(data_metric_in_dtos, results)
+        if isinstance(result, DataMetricModel)
+    ]
+    response_dto = BulkOutDTO(
+        count=len(created),
+        items=BulkItemOutDTO.parse_results(results),
+    )
+
+    await event_service.create_events(
+        [
+            EventModel(
+                event_type=EventTypeEnum.CREATED,
+                entity_type=EntityTypeEnum.DATA_METRIC,
+                node_id=created_data_metric_model.id,
+                user_id=client.user_id,
+                new_data=from_json(data_metric_in_dto.model_dump_json()),
+            )
+            for data_metric_in_dto, created_data_metric_model in created
+        ]
+    )
+
+    return response_dto
+
+
+@data_metric_router.post(
+    "/batch-get",
+    status_code=status.HTTP_200_OK,
+    response_model=DataMetricBatchOutDTO,
+    response_class=JSONResponse,
+)
+async def get_data_metrics(
+    batch_get_in_dto: BatchGetInDTO,
+    data_metric_service: DataMetricService = Depends(Dependencies.data_metric_service),
+    client: AuthorizedClient = Depends(authorizer),
+):
+    if not client.is_super_user():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    """
+    Fetches the details of the data_metrics with the given ids, in the order of the ids.
+    """
+    data_metric_models = await data_metric_service.get_data_metrics(data_metric_ids=batch_get_in_dto.ids)
+    found_ids = {data_metric_model.id for data_metric_model in data_metric_models}
+    response_dto = DataMetricBatchOutDTO(
+        count=len(data_metric_models),
+        data_metrics=FullDataMetricOutDTO.parse_obj(data_metric_models),
+        missing_ids=[
+            data_metric_id for data_metric_id in dict.fromkeys(batch_get_in_dto.ids) if data_metric_id not in found_ids
+        ],
+    )
+
+    return response_dto
+
+
 @data_metric_router.get(
     "/{target_data_metric_id}",
     status_code=status.HTTP_200_OK,
@@ -73,6 +162,9 @@ async def create_data_metric(
 )
 async def get_data_metric(
     target_data_metric_id: Annotated[uuid.UUID, Path(title="The ID of the data_metric to retrieve")],
+    fields: str | None = Query(
+        None, description="Comma separated fields to return, like id,name,status. All the fields by default"
+    ),
     data_metric_service: DataMetricService = Depends(Dependencies.data_metric_service),
     client: AuthorizedClient = Depends(authorizer),
 ):
@@ -81,10 +173,49 @@ async def get_data_metric(
     """
     Fetches the details of a data_metric.
     """
-    data_metric_model = await data_metric_service.get_data_metric(data_metric_id=target_data_metric_id)
-    response_dto = FullDataMetricOutDTO.parse_obj(data_metric_model)
+    field_names = parse_fields(fields, FullDataMetricOutDTO)
+    data_metric_model = await data_metric_service.get_data_metric(
+        data_metric_id=target_data_metric_id, fields=field_names
+    )
+    response_dto = sparse_dto(FullDataMetricOutDTO, field_names).parse_obj(data_metric_model)
 
-    return response_dto
+    return sparse_response(response_dto, field_names)
+
+
+@data_metric_router.get(
+    "/{target_data_metric_id}/history",
+    status_code=status.HTTP_200_OK,
+    response_model=EventListOutDTO,
+    response_class=JSONResponse,
+)
+async def get_data_metric_history(
+    target_data_metric_id: Annotated[uuid.UUID, Path(title="The ID of the data metric to retrieve the history of")],
+    cursor: str | None = Query(None, description="Cursor of the page to retrieve, as returned in nextCursor"),
+    limit: int = Query(
+        SETTINGS.pagination_limit_default,
+        ge=0,
+        le=SETTINGS.pagination_limit_max,
+        description="Number of items to retrieve",
+    ),
+    created_from: datetime | None = Query(None, description="Events created at or after it"),
+    created_to: datetime | None = Query(None, description="Events created before it"),
+    event_service: EventService = Depends(Dependencies.event_service),
+    client: AuthorizedClient = Depends(authorizer),
+):
+    if not client.is_super_user():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    """
+    Returns the events of a data metric, newest first.
+    """
+    return await history_response(
+        event_service,
+        entity_type=EntityTypeEnum.DATA_METRIC,
+        node_id=target_data_metric_id,
+        cursor=cursor,
+        limit=limit,
+        created_from=created_from,
+        created_to=created_to,
+    )
 
 
 @data_metric_router.put(
@@ -92,6 +223,7 @@ async def get_data_metric(
     status_code=status.HTTP_200_OK,
     response_model=DataMetricOutDTO,
     response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
 )
 async def update_data_metric(
     target_data_metric_id: Annotated[uuid.UUID, Path(title="The ID of the data_metric to update")],
@@ -125,11 +257,65 @@ async def update_data_metric(
     return response_dto
 
 
+@data_metric_router.patch(
+    "/bulk",
+    status_code=status.HTTP_200_OK,
+    response_model=BulkOutDTO,
+    response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
+)
+async def update_data_metrics(
+    data_metric_patch_in_dtos: Annotated[List[DataMetricPatchInDTO], Body(max_length=SETTINGS.bulk_max_items)],
+    data_metric_service: DataMetricService = Depends(Dependencies.data_metric_service),
+    event_service: EventService = Depends(Dependencies.event_service),
+    client: AuthorizedClient = Depends(authorizer),
+):
+    if not client.is_super_user():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    """
+    Applies the given changes to every data_metric in one statement, skipping the ones with invalid metadata.
+    """
+    results = await data_metric_service.update_data_metrics(
+        data_metric_update_models=[
+            (
+                data_metric_patch_in_dto.id,
+                DataMetricUpdateModel.model_validate(data_metric_patch_in_dto.changes.model_dump(exclude_none=True)),
+            )
+            for data_metric_patch_in_dto in data_metric_patch_in_dtos
+        ],
+    )
+    updated = [
+        (data_metric_patch_in_dto, result)
+        for data_metric_patch_in_dto, result in zip(data_metric_patch_in_dtos, results)
+        if isinstance(result, DataMetricModel)
+    ]
+    response_dto = BulkOutDTO(
+        count=len(updated),
+        items=BulkItemOutDTO.parse_results(results),
+    )
+
+    await event_service.create_events(
+        [
+            EventModel(
+                event_type=EventTypeEnum.UPDATED,
+                entity_type=EntityTypeEnum.DATA_METRIC,
+                node_id=updated_data_metric_model.id,
+                user_id=client.user_id,
+                new_data=from_json(data_metric_patch_in_dto.changes.model_dump_json(exclude_none=True)),
+            )
+            for data_metric_patch_in_dto, updated_data_metric_model in updated
+        ]
+    )
+
+    return response_dto
+
+
 @data_metric_router.delete(
     "/{target_data_metric_id}",
     status_code=status.HTTP_200_OK,
     response_model=DataMetricDeletionOutDTO,
     response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
 )
 async def delete_data_metric(
     target_data_metric_id: Annotated[uuid.UUID, Path(title="The ID of the data_metric to delete")],
@@ -165,6 +351,7 @@ async def delete_data_metric(
 )
 async def filter_data_metrics(
     skip: int = Query(0, ge=0, description="Number of items to skip"),
+    cursor: str | None = Query(None, description="Cursor of the page to retrieve, as returned in nextCursor"),
     limit: int = Query(
         SETTINGS.pagination_limit_default,
         ge=0,
@@ -176,7 +363,14 @@ async def filter_data_metrics(
         SortMethodModel.ASC, title="Sort method", description="Sort method: asc or desc"
     ),
     with_deleted: bool | None = Query(False, description="Include deleted data_metrics"),
-    filters: DataMetricUpdateInDTO | None = Body(None, description="Field to filter"),
+    filters: DataMetricSearchInDTO | None = Body(None, description="Fields and metadata to filter"),
+    count_mode: CountModeEnum = Query(
+        CountModeEnum.NONE,
+        description="Total to return: none, exact (counted) or estimated (from the planner statistics)",
+    ),
+    fields: str | None = Query(
+        None, description="Comma separated fields to return, like id,name,status. All the fields by default"
+    ),
     data_metric_service: DataMetricService = Depends(Dependencies.data_metric_service),
     client: AuthorizedClient = Depends(authorizer),
 ):
@@ -185,19 +379,35 @@ async def filter_data_metrics(
     """
     Return a list of data_metrics, based on given parameters.
     """
+    field_names = parse_fields(fields, FullDataMetricOutDTO)
+    meta_data_filters = None
     if filters:
-        filters = filters.model_dump(exclude_none=True)
-    data_metrics = await data_metric_service.find_data_metrics(
-        skip=skip,
-        limit=limit,
-        sort_field=sort_field,
-        sort_method=sort_method,
-        with_deleted=with_deleted,
-        filters=filters,
+        meta_data_filters = filters.meta_data_filters
+        filters = filters.model_dump(exclude_none=True, exclude={"meta_data_filters"})
+    data_metrics, total = await asyncio.gather(
+        data_metric_service.find_data_metrics(
+            skip=skip,
+            cursor=cursor,
+            limit=limit,
+            sort_field=sort_field,
+            sort_method=sort_method,
+            with_deleted=with_deleted,
+            filters=filters,
+            meta_data_filters=meta_data_filters,
+            fields=field_names,
+        ),
+        data_metric_service.count_data_metrics(
+            count_mode=count_mode,
+            with_deleted=with_deleted,
+            filters=filters,
+            meta_data_filters=meta_data_filters,
+        ),
     )
-    response_dto = DataMetricListOutDTO(
+    response_dto = sparse_list_dto(DataMetricListOutDTO, "data_metrics", FullDataMetricOutDTO, field_names)(
         count=len(data_metrics),
-        data_metrics=FullDataMetricOutDTO.parse_obj(data_metrics),
+        total=total,
+        next_cursor=next_cursor(data_metrics, sort_field, limit),
+        data_metrics=sparse_dto(FullDataMetricOutDTO, field_names).parse_obj(data_metrics),
     )
 
-    return response_dto
+    return sparse_response(response_dto, field_names)
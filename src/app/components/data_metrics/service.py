@@ -1,8 +1,7 @@
-import asyncio
 import uuid
 from typing import List
 
-from matter_exceptions.exceptions.fastapi import ServerError
+from matter_exceptions.exceptions.fastapi import NotFoundError, ServerError, ValidationError
 from matter_observability.metrics import (
     count_occurrence,
     measure_processing_time,
@@ -10,27 +9,61 @@ from matter_observability.metrics import (
 from matter_persistence.sql.exceptions import DatabaseError
 from matter_persistence.sql.utils import SortMethodModel
 
-from app.common.enums.enums import EntityTypeEnum
+from app.common.enums.enums import CountModeEnum, EntityTypeEnum
 from app.components.data_metrics.dal import DataMetricDAL
 from app.components.data_metrics.models.data_metric import DataMetricModel
 from app.components.data_metrics.models.data_metric_update import DataMetricUpdateModel
+from app.components.utils.core_read import is_core_read_path
+from app.components.utils.count_cache import CountCache
 from app.components.utils.meta_data_service import MetaDataService
+from app.components.utils.pagination import decode_cursor
+from app.components.utils.sparse_fields import Fields
 
 
 class DataMetricService:
     def __init__(self, dal: DataMetricDAL, meta_data_service: MetaDataService):
         self._dal = dal
         self._meta_data_service = meta_data_service
+        self._count_cache = CountCache()
 
     @count_occurrence(label="data_metrics.get_data_metric")
     @measure_processing_time(label="data_metrics.get_data_metric")
     async def get_data_metric(
         self,
         data_metric_id: uuid.UUID,
+        fields: Fields | None = None,
+        core_read_path: bool | None = None,
     ) -> DataMetricModel:
-        data_metric = await self._dal.get_data_metric(data_metric_id=data_metric_id)
+        if core_read_path is None:
+            core_read_path = is_core_read_path(entity_type=EntityTypeEnum.DATA_METRIC)
+
+        data_metric = await self._dal.get_data_metric(
+            data_metric_id=data_metric_id, fields=fields, core_read_path=core_read_path
+        )
+        if fields is not None and "meta_data" not in fields:
+            return data_metric
+
         return await self._convert_metadata_out(data_metric=data_metric)
 
+    @count_occurrence(label="data_metrics.get_data_metrics")
+    @measure_processing_time(label="data_metrics.get_data_metrics")
+    async def get_data_metrics(
+        self,
+        data_metric_ids: List[uuid.UUID],
+    ) -> List[DataMetricModel]:
+        data_metrics = await self._dal.get_data_metrics(data_metric_ids=list(dict.fromkeys(data_metric_ids)))
+        await self._meta_data_service.convert_many_ids_to_names(
+            entity_type=EntityTypeEnum.DATA_METRIC, rows=data_metrics
+        )
+
+        # rows come back in the order of the requested ids, missing ids are left out
+        data_metrics_by_id = {data_metric.id: data_metric for data_metric in data_metrics}
+        return [
+            data_metrics_by_id[data_metric_id]
+            for data_metric_id in dict.fromkeys(data_metric_ids)
+            if data_metric_id in data_metrics_by_id
+        ]
+
     @count_occurrence(label="data_metrics.find_data_metrics")
     @measure_processing_time(label="data_metrics.find_data_metrics")
     async def find_data_metrics(
@@ -41,7 +74,27 @@ class DataMetricService:
         sort_method: SortMethodModel | None = None,
         with_deleted: bool = False,
         filters: dict | None = None,
+        cursor: str | None = None,
+        resolve_meta_data_in_sql: bool | None = None,
+        meta_data_filters: dict | None = None,
+        fields: Fields | None = None,
+        core_read_path: bool | None = None,
     ) -> List[DataMetricModel]:
+        after = decode_cursor(cursor, sort_field) if cursor else None
+        if meta_data_filters:
+            meta_data_filters = await self._meta_data_service.convert_filter_names_to_ids(
+                entity_type=EntityTypeEnum.DATA_METRIC, meta_data_filters=meta_data_filters
+            )
+
+        # without metaData in the fields, the metadata is neither loaded nor converted
+        resolves_meta_data = fields is None or "meta_data" in fields
+        if resolve_meta_data_in_sql is None:
+            resolve_meta_data_in_sql = self._meta_data_service.is_resolved_in_sql(
+                entity_type=EntityTypeEnum.DATA_METRIC
+            )
+        if core_read_path is None:
+            core_read_path = is_core_read_path(entity_type=EntityTypeEnum.DATA_METRIC)
+
         data_metrics = await self._dal.find_data_metrics(
             skip=skip,
             limit=limit,
@@ -49,10 +102,53 @@ class DataMetricService:
             sort_method=sort_method,
             with_deleted=with_deleted,
             filters=filters,
+            resolve_meta_data_names=resolves_meta_data and resolve_meta_data_in_sql,
+            after=after,
+            meta_data_filters=meta_data_filters,
+            fields=fields,
+            core_read_path=core_read_path,
+        )
+
+        if not resolves_meta_data:
+            return data_metrics
+
+        if resolve_meta_data_in_sql:
+            return self._meta_data_service.take_names_resolved_in_sql(rows=data_metrics)
+
+        return await self._meta_data_service.convert_many_ids_to_names(
+            entity_type=EntityTypeEnum.DATA_METRIC, rows=data_metrics
         )
 
-        return await asyncio.gather(
-            *[self._convert_metadata_out(data_metric=data_metric) for data_metric in data_metrics]
+    @count_occurrence(label="data_metrics.count_data_metrics")
+    @measure_processing_time(label="data_metrics.count_data_metrics")
+    async def count_data_metrics(
+        self,
+        count_mode: CountModeEnum = CountModeEnum.NONE,
+        with_deleted: bool = False,
+        filters: dict | None = None,
+        meta_data_filters: dict | None = None,
+    ) -> int | None:
+        if count_mode == CountModeEnum.NONE:
+            return None
+
+        if meta_data_filters:
+            meta_data_filters = await self._meta_data_service.convert_filter_names_to_ids(
+                entity_type=EntityTypeEnum.DATA_METRIC, meta_data_filters=meta_data_filters
+            )
+
+        return await self._count_cache.get_or_count(
+            key={
+                "count_mode": count_mode,
+                "with_deleted": with_deleted,
+                "filters": filters,
+                "meta_data_filters": meta_data_filters,
+            },
+            count=lambda: self._dal.count_data_metrics(
+                with_deleted=with_deleted,
+                filters=filters,
+                meta_data_filters=meta_data_filters,
+                estimated=count_mode == CountModeEnum.ESTIMATED,
+            ),
         )
 
     @count_occurrence(label="data_metrics.create_data_metric")
@@ -71,6 +167,35 @@ class DataMetricService:
 
         return await self._convert_metadata_out(data_metric=created_data_metric_model)
 
+    @count_occurrence(label="data_metrics.create_data_metrics")
+    @measure_processing_time(label="data_metrics.create_data_metrics")
+    async def create_data_metrics(
+        self,
+        data_metric_models: List[DataMetricModel],
+    ) -> List[DataMetricModel | ValidationError]:
+        results = await self._meta_data_service.convert_many_names_to_ids(
+            entity_type=EntityTypeEnum.DATA_METRIC,
+            meta_data_list=[data_metric_model.meta_data or {} for data_metric_model in data_metric_models],
+        )
+
+        valid_data_metric_models = []
+        for index, (data_metric_model, result) in enumerate(zip(data_metric_models, results)):
+            if not isinstance(result, ValidationError):
+                data_metric_model.meta_data = result
+                valid_data_metric_models.append(data_metric_model)
+                results[index] = data_metric_model
+
+        try:
+            await self._dal.create_data_metrics(data_metric_models=valid_data_metric_models)
+        except DatabaseError as ex:
+            raise ServerError(description=ex.description, detail=ex.detail)
+
+        await self._meta_data_service.convert_many_ids_to_names(
+            entity_type=EntityTypeEnum.DATA_METRIC, rows=valid_data_metric_models
+        )
+
+        return results
+
     @count_occurrence(label="data_metrics.update_data_metric")
     @measure_processing_time(label="data_metrics.update_data_metric")
     async def update_data_metric(
@@ -79,9 +204,10 @@ class DataMetricService:
         data_metric_update_model: DataMetricUpdateModel,
     ) -> DataMetricModel:
         try:
-            data_metric_update_model.meta_data = await self._convert_metadata_names_to_ids(
-                meta_data=data_metric_update_model.meta_data
-            )
+            if data_metric_update_model.meta_data is not None:
+                data_metric_update_model.meta_data = await self._convert_metadata_names_to_ids(
+                    meta_data=data_metric_update_model.meta_data
+                )
             updated_data_metric = await self._dal.update_data_metric(
                 data_metric_id=data_metric_id, data_metric_update_model=data_metric_update_model
             )
@@ -90,6 +216,60 @@ class DataMetricService:
 
         return await self._convert_metadata_out(data_metric=updated_data_metric)
 
+    @count_occurrence(label="data_metrics.update_data_metrics")
+    @measure_processing_time(label="data_metrics.update_data_metrics")
+    async def update_data_metrics(
+        self,
+        data_metric_update_models: List[tuple[uuid.UUID, DataMetricUpdateModel]],
+    ) -> List[DataMetricModel | NotFoundError | ValidationError]:
+        data_metric_ids = [data_metric_id for data_metric_id, _ in data_metric_update_models]
+        if len(set(data_metric_ids)) != len(data_metric_ids):
+            raise ValidationError(
+                description="Every data_metric can only be patched once per request.",
+                detail={"data_metric_ids": data_metric_ids},
+            )
+
+        results: List = [None] * len(data_metric_update_models)
+        with_meta_data = [
+            index
+            for index, (_, update_model) in enumerate(data_metric_update_models)
+            if update_model.meta_data is not None
+        ]
+        converted_meta_data = await self._meta_data_service.convert_many_names_to_ids(
+            entity_type=EntityTypeEnum.DATA_METRIC,
+            meta_data_list=[data_metric_update_models[index][1].meta_data for index in with_meta_data],
+        )
+        for index, meta_data in zip(with_meta_data, converted_meta_data):
+            if isinstance(meta_data, ValidationError):
+                results[index] = meta_data
+            else:
+                data_metric_update_models[index][1].meta_data = meta_data
+
+        try:
+            updated_data_metrics = await self._dal.update_data_metrics(
+                data_metric_update_models={
+                    data_metric_id: update_model
+                    for (data_metric_id, update_model), result in zip(data_metric_update_models, results)
+                    if result is None
+                }
+            )
+        except DatabaseError as ex:
+            raise ServerError(description=ex.description, detail=ex.detail)
+
+        await self._meta_data_service.convert_many_ids_to_names(
+            entity_type=EntityTypeEnum.DATA_METRIC, rows=updated_data_metrics
+        )
+
+        updated_data_metrics_by_id = {data_metric.id: data_metric for data_metric in updated_data_metrics}
+        for index, data_metric_id in enumerate(data_metric_ids):
+            if results[index] is None:
+                results[index] = updated_data_metrics_by_id.get(data_metric_id) or NotFoundError(
+                    description=f"DataMetricModel with Id '{data_metric_id}' not found.",
+                    detail={"data_metric_id": data_metric_id},
+                )
+
+        return results
+
     @count_occurrence(label="data_metrics.delete_data_metric")
     @measure_processing_time(label="data_metrics.delete_data_metric")
     async def delete_data_metric(
@@ -115,8 +295,6 @@ class DataMetricService:
         )
 
     async def _convert_metadata_names_to_ids(self, meta_data: dict) -> dict:
-        if meta_data is None:
-            return {}
         return await self._meta_data_service.convert_metadata_names_to_ids(
-            entity_type=EntityTypeEnum.DATA_METRIC, meta_data=meta_data
+            entity_type=EntityTypeEnum.DATA_METRIC, meta_data=meta_data or {}
         )
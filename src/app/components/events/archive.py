@@ -0,0 +1,124 @@
+import asyncio
+import gzip
+import json
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+from app.common.enums.enums import EventTypeEnum
+from app.components.events.dal import EventDAL
+from app.components.events.models.event import EventModel
+from app.env import SETTINGS
+
+
+def archive_record(event_model: EventModel) -> dict:
+    return {
+        "id": str(event_model.id),
+        "event_type": event_model.event_type.value,
+        "entity_type": event_model.entity_type.value,
+        "node_id": str(event_model.node_id),
+        "user_id": str(event_model.user_id) if event_model.user_id else None,
+        "new_data": event_model.new_data,
+        "created": event_model.created.isoformat(),
+        "updated": event_model.updated.isoformat(),
+        "deleted": event_model.deleted.isoformat() if event_model.deleted else None,
+    }
+
+
+def archive_file(event_models: List[EventModel]) -> bytes:
+    """
+    Returns the events as gzip compressed JSON lines, one event per line.
+    """
+    lines = "".join(json.dumps(archive_record(event_model)) + "\n" for event_model in event_models)
+    return gzip.compress(lines.encode())
+
+
+class ArchiveStore(ABC):
+    @abstractmethod
+    async def write(self, name: str, data: bytes):
+        pass
+
+
+class LocalArchiveStore(ArchiveStore):
+    """
+    Writes the archive files to a local directory.
+    """
+
+    def __init__(self, directory: str = SETTINGS.event_archive_directory):
+        self._directory = Path(directory)
+
+    async def write(self, name: str, data: bytes):
+        self._directory.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread((self._directory / name).write_bytes, data)
+
+
+class EventArchiver:
+    """
+    Archives the events created before a cutoff to the store, then deletes them from the events table.
+
+    The events are read with a server-side cursor and written in files of batch_size events, so the memory used
+    does not grow with the number of events archived. They are deleted once all the files are written, in
+    transactions of batch_size events. An archival stopped before the deletion archives the same events again on its
+    next run.
+
+    With compaction, the table keeps one snapshot UPDATE event per node that had UPDATE events before the cutoff. It
+    is created at the cutoff, from the data of the node's CREATED event and UPDATE events merged in order, so the
+    following archivals fold it into the next snapshot. The nodes deleted before the cutoff get no snapshot. The
+    snapshots are not published to the change stream, the changes they summarize already were.
+    """
+
+    def __init__(
+        self,
+        dal: EventDAL,
+        store: ArchiveStore,
+        batch_size: int = SETTINGS.event_archive_batch_size,
+    ):
+        self._dal = dal
+        self._store = store
+        self._batch_size = batch_size
+
+    async def archive(self, before: datetime, compact: bool = False) -> tuple[int, int, int]:
+        """
+        Returns the number of events archived, of events deleted and of snapshot events created.
+        """
+        archived = 0
+        # node id -> (snapshot, whether the node had UPDATE events)
+        snapshots: dict[uuid.UUID, tuple[EventModel, bool]] = {}
+        async for event_models in self._dal.stream_events_before(before=before, batch_size=self._batch_size):
+            await self._store.write(
+                f"events_{before:%Y%m%dT%H%M%S}_{archived // self._batch_size:06d}.jsonl.gz",
+                archive_file(event_models),
+            )
+            archived += len(event_models)
+            if compact:
+                for event_model in event_models:
+                    self._fold(snapshots, event_model, before)
+
+        snapshot_models = [snapshot for snapshot, updated in snapshots.values() if updated]
+        for start in range(0, len(snapshot_models), self._batch_size):
+            await self._dal.create_snapshot_events(snapshot_models[start : start + self._batch_size])
+
+        deleted = await self._dal.delete_events_before(before=before, batch_size=self._batch_size)
+        return archived, deleted, len(snapshot_models)
+
+    @staticmethod
+    def _fold(snapshots: dict[uuid.UUID, tuple[EventModel, bool]], event_model: EventModel, before: datetime):
+        if event_model.event_type == EventTypeEnum.DELETED:
+            snapshots.pop(event_model.node_id, None)
+            return
+
+        snapshot, updated = snapshots.get(event_model.node_id, (None, False))
+        if snapshot is None or event_model.event_type == EventTypeEnum.CREATED:
+            snapshot = EventModel(
+                event_type=EventTypeEnum.UPDATED,
+                entity_type=event_model.entity_type,
+                node_id=event_model.node_id,
+                new_data={},
+                created=before,
+            )
+
+        snapshot.new_data = {**snapshot.new_data, **(event_model.new_data or {})}
+        snapshot.user_id = event_model.user_id
+        snapshots[event_model.node_id] = (snapshot, updated or event_model.event_type == EventTypeEnum.UPDATED)
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import re
+from collections.abc import AsyncIterator
+
+from redis import asyncio as aioredis
+
+from app.env import SETTINGS
+
+Change = tuple[str, dict[str, str]]
+
+_STREAM_ID = re.compile(r"^\d+-\d+$")
+
+
+def is_stream_id(value: str) -> bool:
+    return _STREAM_ID.match(value) is not None
+
+
+def _stream_id_key(stream_id: str) -> tuple[int, int]:
+    milliseconds, sequence = stream_id.split("-")
+    return int(milliseconds), int(sequence)
+
+
+class ChangeStream:
+    """
+    Fans the changes relayed to the outbox Redis stream out to the subscribers of the pod.
+
+    A single reader per pod follows the stream and copies every change to the queue of each subscriber, so the
+    subscribers cost no Redis or database query of their own. A subscriber whose queue is full is disconnected; it
+    resumes from the id of the last change it received, which is read back from the stream.
+    """
+
+    def __init__(
+        self,
+        connection_pool: aioredis.ConnectionPool,
+        stream: str = SETTINGS.outbox_stream,
+        subscriber_queue_size: int = SETTINGS.event_stream_subscriber_queue_size,
+        heartbeat_interval: float = SETTINGS.event_stream_heartbeat_interval,
+    ):
+        self._connection_pool = connection_pool
+        self._stream = stream
+        self._subscriber_queue_size = subscriber_queue_size
+        self._heartbeat_interval = heartbeat_interval
+        # None in a queue disconnects its subscriber
+        self._subscribers: set[asyncio.Queue[Change | None]] = set()
+        self._reader_task: asyncio.Task | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def heartbeat_interval(self) -> float:
+        return self._heartbeat_interval
+
+    async def start(self):
+        if self._reader_task is None:
+            self._reader_task = asyncio.create_task(self._read_continuously())
+
+    async def stop(self):
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+            self._reader_task = None
+
+    async def changes(self, last_event_id: str | None = None) -> AsyncIterator[Change | None]:
+        """
+        Yields the changes published after last_event_id, or from now on without it, and None every
+        heartbeat_interval seconds without a change. It ends when the subscriber falls too far behind.
+        """
+        queue: asyncio.Queue[Change | None] = asyncio.Queue(maxsize=self._subscriber_queue_size)
+        # subscribed before reading the missed changes, so none is lost in between
+        self._subscribers.add(queue)
+        try:
+            last_id = last_event_id
+            if last_event_id is not None:
+                async for change in self._read_after(last_event_id):
+                    last_id = change[0]
+                    yield change
+
+            while True:
+                try:
+                    change = await asyncio.wait_for(queue.get(), self._heartbeat_interval)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+
+                if change is None:
+                    return
+                # the changes read back from the stream can also be queued
+                if last_id is None or _stream_id_key(change[0]) > _stream_id_key(last_id):
+                    yield change
+        finally:
+            self._subscribers.discard(queue)
+
+    def publish(self, change: Change):
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(change)
+            except asyncio.QueueFull:
+                self._subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    async def _read_after(self, last_event_id: str) -> AsyncIterator[Change]:
+        async with aioredis.Redis(connection_pool=self._connection_pool) as connection:
+            start = f"({last_event_id}"
+            while True:
+                messages = await connection.xrange(self._stream, min=start, count=self._subscriber_queue_size)
+                for message_id, fields in messages:
+                    yield self._decode(message_id, fields)
+                if len(messages) < self._subscriber_queue_size:
+                    return
+                start = f"({messages[-1][0].decode()}"
+
+    async def _read_continuously(self):
+        last_id = "$"
+        while True:
+            try:
+                async with aioredis.Redis(connection_pool=self._connection_pool) as connection:
+                    while True:
+                        streams = await connection.xread(
+                            {self._stream: last_id}, block=int(self._heartbeat_interval * 1000)
+                        )
+                        for _, messages in streams:
+                            for message_id, fields in messages:
+                                change = self._decode(message_id, fields)
+                                last_id = change[0]
+                                self.publish(change)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception("Change stream reader failed, retrying")
+                await asyncio.sleep(1)
+
+    @staticmethod
+    def _decode(message_id: bytes, fields: dict[bytes, bytes]) -> Change:
+        return message_id.decode(), {key.decode(): value.decode() for key, value in fields.items()}
@@ -1,19 +1,55 @@
-from datetime import datetime, timezone
+from collections.abc import AsyncIterator, Awaitable, Callable
+from datetime import date, datetime, timezone
 from typing import List
 from uuid import UUID
 
 from matter_persistence.sql.exceptions import DatabaseRecordNotFoundError
-from matter_persistence.sql.manager import DatabaseManager
 from matter_persistence.sql.utils import SortMethodModel, commit, find, get
-from sqlalchemy import select
+from sqlalchemy import ARRAY, BigInteger, Select, any_, bindparam, delete, select, text, tuple_, update
 
 from app.components.events.models.event import EventModel
+from app.components.events.models.outbox_entry import OutboxEntryModel
+from app.components.events.partitions import DEFAULT_PARTITION_NAME, partition_bounds, partition_name
+from app.components.utils.count_sql import count
+from app.components.utils.pagination import Cursor, chain_filters, is_cursor_sort, keyset_pagination
+from app.components.utils.replicated_database_manager import ReplicatedDatabaseManager
+
+# held by the instance relaying the outbox, so the entries are published by one relay at a time, in sequence order
+_OUTBOX_RELAY_LOCK_QUERY = text("SELECT pg_try_advisory_xact_lock(hashtext('outbox_relay'))")
+
+_EVENT_PARTITIONS_QUERY = text(
+    "SELECT child.relname FROM pg_inherits "
+    "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+    "WHERE parent.relname = :table_name"
+)
+
+
+def created_range(filters: dict | None) -> Callable[[Select], Select] | None:
+    """
+    Keeps the events created from created_from, included, to created_to, excluded, given in the filters.
+
+    The range is compared with the partition key, so only the partitions of its months are scanned.
+    """
+    created_from = (filters or {}).get("created_from")
+    created_to = (filters or {}).get("created_to")
+    if created_from is None and created_to is None:
+        return None
+
+    def apply(statement: Select) -> Select:
+        if created_from is not None:
+            statement = statement.where(EventModel.created >= created_from)
+        if created_to is not None:
+            statement = statement.where(EventModel.created < created_to)
+        return statement
+
+    return apply
 
 
 class EventDAL:
     def __init__(
         self,
-        database_manager: DatabaseManager,
+        database_manager: ReplicatedDatabaseManager,
     ):
         self._database_manager = database_manager
 
@@ -23,19 +59,14 @@ class EventDAL:
     ) -> EventModel:
         statement = select(EventModel).where(EventModel.id == event_id)
 
-        async with self._database_manager.session() as session:
+        async with self._database_manager.read_session() as session:
             event_model = await get(
                 session=session,
                 statement=statement,
             )
 
             if event_model is None:
-                raise DatabaseRecordNotFoundError(
-                    description=f"EventModel with Event Id '{event_id}' not found.",
-                    detail={
-                        "event_id": event_id,
-                    },
-                )
+                raise self._not_found_error(event_id)
 
             return event_model
 
@@ -47,8 +78,15 @@ class EventDAL:
         sort_method: SortMethodModel = None,
         with_deleted: bool = True,
         filters: dict | None = None,
+        after: Cursor | None = None,
     ) -> List[EventModel]:
-        async with self._database_manager.session() as session:
+        custom_filter = created_range(filters)
+        if is_cursor_sort(sort_field):
+            # keyset pagination takes over the ordering, with the id breaking ties
+            custom_filter = chain_filters(custom_filter, keyset_pagination(EventModel, sort_field, sort_method, after))
+            sort_field = None
+
+        async with self._database_manager.read_session() as session:
             return await find(
                 session=session,
                 db_model=EventModel,
@@ -58,6 +96,23 @@ class EventDAL:
                 sort_method=sort_method,
                 with_deleted=with_deleted,
                 filters=filters,
+                custom_filter=custom_filter,
+            )
+
+    async def count_events(
+        self,
+        with_deleted: bool = True,
+        filters: dict | None = None,
+        estimated: bool = False,
+    ) -> int:
+        async with self._database_manager.read_session() as session:
+            return await count(
+                session=session,
+                db_model=EventModel,
+                with_deleted=with_deleted,
+                filters=filters,
+                custom_filter=created_range(filters),
+                estimated=estimated,
             )
 
     async def create_event(self, event_model: EventModel) -> EventModel:
@@ -67,23 +122,190 @@ class EventDAL:
 
         return event_model
 
+    async def create_events(self, event_models: List[EventModel]) -> List[EventModel]:
+        async with self._database_manager.session() as session:
+            session.add_all(event_models)
+            await commit(session)
+
+        return event_models
+
+    async def create_snapshot_events(self, event_models: List[EventModel]) -> List[EventModel]:
+        """
+        Creates the snapshot events of a compaction, without publishing them to the change stream.
+
+        They only summarize changes already published, so their outbox entries, inserted by the trigger, are deleted
+        in the same transaction and are never relayed.
+        """
+        async with self._database_manager.primary_session() as session:
+            session.add_all(event_models)
+            await session.flush()
+            event_ids = [event_model.id for event_model in event_models]
+            await session.execute(
+                delete(OutboxEntryModel).where(
+                    OutboxEntryModel.event_id
+                    == any_(bindparam("event_ids", event_ids, type_=ARRAY(OutboxEntryModel.event_id.type)))
+                )
+            )
+            await commit(session)
+
+        return event_models
+
+    async def stream_events_before(self, before: datetime, batch_size: int) -> AsyncIterator[List[EventModel]]:
+        """
+        Yields the events created before the cutoff, deleted ones included, in batches read from a server-side cursor.
+        """
+        statement = (
+            select(EventModel)
+            .where(EventModel.created < before)
+            .order_by(EventModel.created, EventModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+
+        async with self._database_manager.primary_session() as session:
+            result = await session.stream_scalars(statement)
+            async for event_models in result.partitions():
+                yield event_models
+                # the yielded events are not kept in the session
+                session.expunge_all()
+
+    async def delete_events_before(self, before: datetime, batch_size: int) -> int:
+        """
+        Deletes the events created before the cutoff, batch_size events per transaction. Returns the number deleted.
+        """
+        batch = select(EventModel.created, EventModel.id).where(EventModel.created < before).limit(batch_size)
+        statement = (
+            delete(EventModel)
+            .where(tuple_(EventModel.created, EventModel.id).in_(batch))
+            .execution_options(synchronize_session=False)
+        )
+
+        deleted = 0
+        while True:
+            async with self._database_manager.primary_session() as session:
+                batch_deleted = (await session.execute(statement)).rowcount
+                await commit(session)
+
+            deleted += batch_deleted
+            if batch_deleted < batch_size:
+                return deleted
+
+    async def relay_outbox_entries(
+        self,
+        limit: int,
+        publish: Callable[[List[OutboxEntryModel]], Awaitable[None]],
+    ) -> int:
+        """
+        Publishes the oldest outbox entries and deletes them, in one transaction on the primary.
+
+        The entries stay in the outbox when the publication fails, so they are published at least once. Returns the
+        number of entries relayed, 0 when another instance is relaying.
+        """
+        async with self._database_manager.primary_session() as session:
+            if not (await session.execute(_OUTBOX_RELAY_LOCK_QUERY)).scalar_one():
+                return 0
+
+            statement = select(OutboxEntryModel).order_by(OutboxEntryModel.sequence).limit(limit)
+            outbox_entries = (await session.execute(statement)).scalars().all()
+            if outbox_entries:
+                await publish(outbox_entries)
+                # only the published entries, an entry committed meanwhile with a lower sequence is kept
+                sequences = [outbox_entry.sequence for outbox_entry in outbox_entries]
+                await session.execute(
+                    delete(OutboxEntryModel).where(
+                        OutboxEntryModel.sequence == any_(bindparam("sequences", sequences, type_=ARRAY(BigInteger)))
+                    )
+                )
+            await commit(session)
+
+        return len(outbox_entries)
+
+    async def find_event_partitions(self) -> List[str]:
+        async with self._database_manager.primary_session() as session:
+            result = await session.execute(_EVENT_PARTITIONS_QUERY, {"table_name": EventModel.__tablename__})
+            return list(result.scalars().all())
+
+    async def create_event_partitions(self, months: List[date]) -> List[str]:
+        """
+        Creates the monthly partitions missing among the given months, returns the names of the created ones.
+
+        The events of a month already in the default partition are moved to its new partition before it is attached,
+        as the default partition cannot hold events of an attached partition's range. The moved events are not copied
+        to the outbox again, the partition has no trigger until it is attached.
+        """
+        existing_partitions = set(await self.find_event_partitions())
+        created_partitions = []
+        async with self._database_manager.primary_session() as session:
+            for month in months:
+                name = partition_name(month)
+                if name in existing_partitions:
+                    continue
+
+                lower_bound, upper_bound = partition_bounds(month)
+                await session.execute(
+                    text(f'CREATE TABLE "{name}" (LIKE {EventModel.__tablename__} INCLUDING DEFAULTS)')
+                )
+                await session.execute(
+                    text(
+                        f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION_NAME}" '
+                        "WHERE created >= :lower_bound AND created < :upper_bound RETURNING *) "
+                        f'INSERT INTO "{name}" SELECT * FROM moved'
+                    ),
+                    {"lower_bound": lower_bound, "upper_bound": upper_bound},
+                )
+                await session.execute(
+                    text(
+                        f'ALTER TABLE {EventModel.__tablename__} ATTACH PARTITION "{name}" '
+                        f"FOR VALUES FROM ('{lower_bound.isoformat()}') TO ('{upper_bound.isoformat()}')"
+                    )
+                )
+                created_partitions.append(name)
+            await commit(session)
+
+        return created_partitions
+
+    async def detach_event_partition(self, name: str, drop: bool = False):
+        """
+        Detaches the partition from the events, so its events are no longer found, and drops it when asked to.
+        """
+        async with self._database_manager.primary_session() as session:
+            await session.execute(text(f'ALTER TABLE {EventModel.__tablename__} DETACH PARTITION "{name}"'))
+            if drop:
+                await session.execute(text(f'DROP TABLE "{name}"'))
+            await commit(session)
+
     async def delete_event(
         self,
         event_id: UUID,
         soft_delete: bool = True,
     ) -> EventModel:
-        event_model = await self.get_event(event_id)
+        deleted = datetime.now(tz=timezone.utc)
+        if soft_delete:
+            statement = (
+                update(EventModel)
+                .where(EventModel.id == event_id, EventModel.deleted.is_(None))
+                .values(deleted=deleted, updated=deleted)
+                .returning(EventModel)
+            )
+        else:
+            statement = delete(EventModel).where(EventModel.id == event_id).returning(EventModel)
 
         async with self._database_manager.session() as session:
-            event_model = await session.merge(event_model)
-            if soft_delete:
-                event_model.deleted = datetime.now(tz=timezone.utc)
-            else:
-                await session.delete(event_model)
-
+            event_model = (await session.execute(statement)).scalar_one_or_none()
             await commit(session)
 
-            if event_model.deleted is None:
-                event_model.deleted = datetime.now(tz=timezone.utc)
+        if event_model is None:
+            raise self._not_found_error(event_id)
+
+        if event_model.deleted is None:
+            event_model.deleted = deleted
 
         return event_model
+
+    @staticmethod
+    def _not_found_error(event_id: UUID) -> DatabaseRecordNotFoundError:
+        return DatabaseRecordNotFoundError(
+            description=f"EventModel with Event Id '{event_id}' not found.",
+            detail={
+                "event_id": event_id,
+            },
+        )
@@ -13,6 +13,8 @@ class EventFilterInDTO(BaseModel):
     entity_type: EntityTypeEnum | None = Field(None, alias="entityType")
     node_id: uuid.UUID | None = Field(None, alias="nodeId")
     user_id: uuid.UUID | None = Field(None, alias="userId")
+    created_from: datetime | None = Field(None, alias="createdFrom", description="Created at or after, included")
+    created_to: datetime | None = Field(None, alias="createdTo", description="Created before, excluded")
 
 
 class EventOutDTO(FoundationModel):
@@ -34,4 +36,6 @@ class EventDeletionOutDTO(EventOutDTO):
 
 class EventListOutDTO(FoundationModel):
     count: int
+    total: int | None = Field(None, description="Total number of matching items, given with a count_mode")
+    next_cursor: str | None = Field(None, alias="nextCursor")
     events: List[FullEventOutDTO]
@@ -0,0 +1,144 @@
+import asyncio
+import functools
+import logging
+import time
+from typing import List
+
+from matter_observability.metrics import (
+    COUNTER_CUSTOM,
+    GAUGE_CUSTOM,
+    LabeledCounter,
+    LabeledGauge,
+    measure_processing_time,
+)
+from matter_persistence.sql.exceptions import DatabaseIntegrityError
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.components.events.dal import EventDAL
+from app.components.events.models.event import EventModel
+from app.components.utils.replicated_database_manager import ReplicatedDatabaseManager
+from app.env import SETTINGS
+
+
+class EventWriter:
+    """
+    Writes the events in the background, in batches of multi-row INSERTs.
+
+    The events of a request are queued once its unit of work is committed, so a rolled back write has no event.
+    A batch is flushed when it reaches batch_size events or flush_interval seconds after its first event. The queue is
+    bounded, enqueuing waits for room when it is full. stop() flushes all the queued events; the events still queued
+    when the process crashes are lost.
+
+    A failed batch is retried with an exponential backoff until it is written, the queue filling up meanwhile. A batch
+    the database rejects is split in halves written separately, so only the rejected events are left out. Once stop()
+    is called, a failed batch is retried stop_max_retries times only and then dropped, so the shutdown cannot block.
+    """
+
+    def __init__(
+        self,
+        dal: EventDAL,
+        database_manager: ReplicatedDatabaseManager,
+        max_queue_size: int = SETTINGS.event_writer_max_queue_size,
+        batch_size: int = SETTINGS.event_writer_batch_size,
+        flush_interval: float = SETTINGS.event_writer_flush_interval,
+        retry_backoff: float = SETTINGS.event_writer_retry_backoff,
+        max_retry_backoff: float = SETTINGS.event_writer_max_retry_backoff,
+        stop_max_retries: int = SETTINGS.event_writer_stop_max_retries,
+    ):
+        self._dal = dal
+        self._database_manager = database_manager
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._retry_backoff = retry_backoff
+        self._max_retry_backoff = max_retry_backoff
+        self._stop_max_retries = stop_max_retries
+        self._stopping = False
+        # None is the sentinel stop() queues behind the pending events
+        self._queue: asyncio.Queue[EventModel | None] = asyncio.Queue(maxsize=max_queue_size)
+        self._queue_depth = LabeledGauge(metric=GAUGE_CUSTOM, label="events.queue_depth")
+        self._failed_flushes = LabeledCounter(metric=COUNTER_CUSTOM, label="events.failed_flushes")
+        self._rejected_events = LabeledCounter(metric=COUNTER_CUSTOM, label="events.rejected_events")
+        self._dropped_batches = LabeledCounter(metric=COUNTER_CUSTOM, label="events.dropped_batches")
+        self._flush_task: asyncio.Task | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    async def start(self):
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._write_batches())
+
+    async def stop(self):
+        if self._flush_task is not None:
+            # set before queuing the sentinel, a full queue only drains once the retries are bounded
+            self._stopping = True
+            await self._queue.put(None)
+            await self._flush_task
+            self._flush_task = None
+            self._stopping = False
+
+    async def enqueue(self, event_models: List[EventModel]):
+        await self._database_manager.after_commit(functools.partial(self._put, event_models))
+
+    async def _put(self, event_models: List[EventModel]):
+        for event_model in event_models:
+            await self._queue.put(event_model)
+        self._queue_depth.set(self._queue.qsize())
+
+    async def _write_batches(self):
+        while True:
+            batch = []
+            event_model = await self._queue.get()
+            deadline = time.monotonic() + self._flush_interval
+            while event_model is not None:
+                batch.append(event_model)
+                timeout = deadline - time.monotonic()
+                if len(batch) >= self._batch_size or timeout <= 0:
+                    break
+                try:
+                    event_model = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+            self._queue_depth.set(self._queue.qsize())
+            if batch:
+                await self._flush(batch)
+            if event_model is None:
+                return
+
+    @measure_processing_time(label="events.flush_events")
+    async def _flush(self, event_models: List[EventModel]):
+        backoff = self._retry_backoff
+        retries = 0
+        while True:
+            try:
+                await self._dal.create_events(event_models)
+                return
+            except (DataError, IntegrityError, DatabaseIntegrityError):
+                # retrying the same batch would fail again, the commit raises the integrity errors as
+                # DatabaseIntegrityError
+                self._failed_flushes.inc()
+                if len(event_models) > 1:
+                    break
+                self._rejected_events.inc()
+                event_model = event_models[0]
+                logging.exception(
+                    f"The {event_model.event_type} event of the {event_model.entity_type} {event_model.node_id} was "
+                    f"rejected, with the data {event_model.new_data}"
+                )
+                return
+            except Exception:
+                self._failed_flushes.inc()
+                if self._stopping and retries >= self._stop_max_retries:
+                    self._dropped_batches.inc()
+                    logging.exception(f"Failed to write a batch of {len(event_models)} events while stopping, dropped")
+                    return
+                retries += 1
+                logging.exception(f"Failed to write a batch of {len(event_models)} events, retrying in {backoff}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self._max_retry_backoff)
+
+        middle = len(event_models) // 2
+        await self._flush(event_models[:middle])
+        await self._flush(event_models[middle:])
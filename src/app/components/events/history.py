@@ -0,0 +1,34 @@
+import uuid
+from datetime import datetime
+
+from app.common.enums.enums import EntityTypeEnum
+from app.components.events.dtos import EventListOutDTO, FullEventOutDTO
+from app.components.events.service import HISTORY_SORT_FIELD, EventService
+from app.components.utils.pagination import next_cursor
+
+
+async def history_response(
+    event_service: EventService,
+    entity_type: EntityTypeEnum,
+    node_id: uuid.UUID,
+    cursor: str | None,
+    limit: int,
+    created_from: datetime | None,
+    created_to: datetime | None,
+) -> EventListOutDTO:
+    """
+    Returns a page of the events of a node, newest first, as the history endpoints of the entities respond it.
+    """
+    events = await event_service.find_node_history(
+        entity_type=entity_type,
+        node_id=node_id,
+        limit=limit,
+        cursor=cursor,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    return EventListOutDTO(
+        count=len(events),
+        next_cursor=next_cursor(events, HISTORY_SORT_FIELD, limit),
+        events=FullEventOutDTO.parse_obj(events),
+    )
@@ -1,5 +1,5 @@
-from matter_persistence.sql.base import CustomBase
-from sqlalchemy import UUID, Column, Enum
+from matter_persistence.sql.base import CustomBase, datetime_with_utc_tz
+from sqlalchemy import UUID, Column, DateTime, Enum, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 
 from app.common.enums.enums import EntityTypeEnum, EventTypeEnum
@@ -7,9 +7,20 @@ from app.common.enums.enums import EntityTypeEnum, EventTypeEnum
 
 class EventModel(CustomBase):
     __tablename__ = "events"
+    __table_args__ = (
+        # the history of a node, newest first, is read in the order of its keyset pagination
+        Index("ix_events_node_id_created", "node_id", text("created DESC"), text("id DESC")),
+        Index("ix_events_entity_type_created", "entity_type", "created"),
+        # the lookups by id alone, it cannot be unique without the partition key
+        Index("ix_events_id", "id"),
+        # monthly partitions, see app.components.events.partitions
+        {"postgresql_partition_by": "RANGE (created)"},
+    )
 
     event_type = Column(Enum(EventTypeEnum), nullable=False)
-    entity_type = Column(Enum(EntityTypeEnum), index=True, nullable=False)
-    node_id = Column(UUID(as_uuid=True), index=True, nullable=False)
+    entity_type = Column(Enum(EntityTypeEnum), nullable=False)
+    node_id = Column(UUID(as_uuid=True), nullable=False)
     user_id = Column(UUID(as_uuid=True), nullable=True)
     new_data = Column(JSONB, nullable=True)
+    # the partition key has to be part of the primary key
+    created = Column(DateTime(timezone=True), primary_key=True, default=datetime_with_utc_tz, nullable=False)
@@ -0,0 +1,24 @@
+from matter_persistence.sql.base import Base
+from sqlalchemy import UUID, BigInteger, Column, DateTime, Enum, Identity
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.common.enums.enums import EntityTypeEnum, EventTypeEnum
+
+
+class OutboxEntryModel(Base):
+    """
+    Copy of an event waiting to be relayed to the change stream.
+
+    The rows are inserted by a trigger on the events table, in the transaction of the event, and deleted once relayed.
+    """
+
+    __tablename__ = "outbox"
+
+    sequence = Column(BigInteger, Identity(always=True), primary_key=True)
+    event_id = Column(UUID(as_uuid=True), nullable=False)
+    event_type = Column(Enum(EventTypeEnum), nullable=False)
+    entity_type = Column(Enum(EntityTypeEnum), nullable=False)
+    node_id = Column(UUID(as_uuid=True), nullable=False)
+    user_id = Column(UUID(as_uuid=True), nullable=True)
+    new_data = Column(JSONB, nullable=True)
+    created = Column(DateTime(timezone=True), nullable=False)
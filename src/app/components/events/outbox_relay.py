@@ -0,0 +1,124 @@
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import List
+
+from redis import asyncio as aioredis
+
+from app.components.events.dal import EventDAL
+from app.components.events.models.outbox_entry import OutboxEntryModel
+from app.env import SETTINGS
+
+
+def outbox_message(outbox_entry: OutboxEntryModel) -> dict[str, str]:
+    return {
+        "sequence": str(outbox_entry.sequence),
+        "event_id": str(outbox_entry.event_id),
+        "event_type": outbox_entry.event_type.value,
+        "entity_type": outbox_entry.entity_type.value,
+        "node_id": str(outbox_entry.node_id),
+        "user_id": str(outbox_entry.user_id) if outbox_entry.user_id else "",
+        "new_data": json.dumps(outbox_entry.new_data),
+        "created": outbox_entry.created.isoformat(),
+    }
+
+
+class OutboxSink(ABC):
+    @abstractmethod
+    async def publish(self, messages: List[dict[str, str]]):
+        pass
+
+
+class MemoryOutboxSink(OutboxSink):
+    """
+    Keeps the published messages in memory, for the tests and the local runs.
+    """
+
+    def __init__(self):
+        self.messages: List[dict[str, str]] = []
+
+    async def publish(self, messages: List[dict[str, str]]):
+        self.messages.extend(messages)
+
+
+class RedisStreamOutboxSink(OutboxSink):
+    """
+    Appends the messages to a Redis stream, trimmed to about max_length messages.
+
+    Consumers read the stream incrementally, with XREAD or a consumer group, from the last id they processed.
+    """
+
+    def __init__(
+        self,
+        connection_pool: aioredis.ConnectionPool,
+        stream: str = SETTINGS.outbox_stream,
+        max_length: int = SETTINGS.outbox_stream_max_length,
+    ):
+        self._connection_pool = connection_pool
+        self._stream = stream
+        self._max_length = max_length
+
+    async def publish(self, messages: List[dict[str, str]]):
+        async with aioredis.Redis(connection_pool=self._connection_pool) as connection:
+            async with connection.pipeline(transaction=True) as pipe:
+                for message in messages:
+                    pipe.xadd(self._stream, message, maxlen=self._max_length, approximate=True)
+                await pipe.execute()
+
+
+class OutboxRelay:
+    """
+    Publishes the outbox entries to the sink, in sequence order, and removes them from the outbox.
+
+    The changes of an entity are published in the order they were committed. Every entry is published at least
+    once: an entry is published again when the relay stops between its publication and its removal.
+    """
+
+    def __init__(
+        self,
+        dal: EventDAL,
+        sink: OutboxSink,
+        batch_size: int = SETTINGS.outbox_batch_size,
+        poll_interval: float = SETTINGS.outbox_poll_interval,
+    ):
+        self._dal = dal
+        self._sink = sink
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._relay_task: asyncio.Task | None = None
+
+    async def start(self):
+        if self._relay_task is None:
+            self._relay_task = asyncio.create_task(self._relay_continuously())
+
+    async def stop(self):
+        if self._relay_task is not None:
+            self._relay_task.cancel()
+            try:
+                await self._relay_task
+            except asyncio.CancelledError:
+                pass
+            self._relay_task = None
+
+    async def relay(self) -> int:
+        return await self._dal.relay_outbox_entries(
+            limit=self._batch_size,
+            publish=lambda outbox_entries: self._sink.publish(
+                [outbox_message(outbox_entry) for outbox_entry in outbox_entries]
+            ),
+        )
+
+    async def _relay_continuously(self):
+        while True:
+            try:
+                relayed = await self.relay()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception("Outbox relay failed, retrying")
+                relayed = 0
+
+            # a full batch means more entries are waiting
+            if relayed < self._batch_size:
+                await asyncio.sleep(self._poll_interval)
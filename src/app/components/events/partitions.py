@@ -0,0 +1,62 @@
+import re
+from datetime import date, datetime, timezone
+from typing import List
+
+# the events are partitioned by month of their created timestamp, in UTC
+_PARTITION_NAME = re.compile(r"^events_y(\d{4})m(\d{2})$")
+
+# holds the events of the months without a partition
+DEFAULT_PARTITION_NAME = "events_default"
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    year, month_index = divmod(month.year * 12 + month.month - 1 + months, 12)
+    return date(year, month_index + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"events_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> date | None:
+    """
+    Returns the month of a monthly partition, or None for another table, like the default partition.
+    """
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def partition_bounds(month: date) -> tuple[datetime, datetime]:
+    """
+    Returns the range of created timestamps of the partition, the upper bound excluded.
+    """
+    next_month = add_months(month, 1)
+    return (
+        datetime(month.year, month.month, 1, tzinfo=timezone.utc),
+        datetime(next_month.year, next_month.month, 1, tzinfo=timezone.utc),
+    )
+
+
+def upcoming_months(today: date, months_ahead: int) -> List[date]:
+    """
+    Returns the current month and the months_ahead following ones.
+    """
+    current_month = month_start(today)
+    return [add_months(current_month, months) for months in range(months_ahead + 1)]
+
+
+def expired_partitions(partition_names: List[str], today: date, retention_months: int) -> List[str]:
+    """
+    Returns the monthly partitions entirely older than the retention_months months before the current one.
+    """
+    oldest_kept_month = add_months(month_start(today), -retention_months)
+    return sorted(
+        name for name in partition_names if (month := partition_month(name)) is not None and month < oldest_kept_month
+    )
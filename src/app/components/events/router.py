@@ -1,12 +1,16 @@
+import asyncio
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Path, Query, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from matter_exceptions.exceptions.fastapi import ValidationError
 from matter_persistence.sql.utils import SortMethodModel
 
 from app.auth import jwt_authorizer
 from app.auth.models import AuthorizedClient
+from app.common.enums.enums import CountModeEnum, EntityTypeEnum
+from app.components.events.change_stream import is_stream_id
 from app.components.events.dtos import (
     EventDeletionOutDTO,
     EventFilterInDTO,
@@ -14,6 +18,7 @@ from app.components.events.dtos import (
     FullEventOutDTO,
 )
 from app.components.events.service import EventService
+from app.components.utils.pagination import next_cursor
 from app.dependencies import Dependencies
 from app.env import SETTINGS
 
@@ -21,6 +26,48 @@ event_router = APIRouter(tags=["Events"], prefix=f"{SETTINGS.path_prefix}/v1/eve
 authorizer = jwt_authorizer
 
 
+@event_router.get(
+    "/stream",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+)
+async def stream_events(
+    entity_type: EntityTypeEnum | None = Query(None, description="Only the events of this entity type"),
+    node_id: uuid.UUID | None = Query(None, description="Only the events of this entity"),
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+    event_service: EventService = Depends(Dependencies.event_service),
+    client: AuthorizedClient = Depends(authorizer),
+):
+    if not client.is_super_user():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    """
+    Pushes the new events as Server-Sent Events, resuming after the Last-Event-ID header when given.
+    """
+    if last_event_id is not None and not is_stream_id(last_event_id):
+        raise ValidationError(
+            description=f"Invalid Last-Event-ID: {last_event_id}.",
+            detail={"last_event_id": last_event_id},
+        )
+
+    async def server_sent_events():
+        async for change in event_service.stream_events(
+            entity_type=entity_type, node_id=node_id, last_event_id=last_event_id
+        ):
+            if change is None:
+                yield ": keep-alive\n\n"
+                continue
+
+            change_id, event_model = change
+            data = FullEventOutDTO.parse_obj(event_model).model_dump_json(by_alias=True)
+            yield f"id: {change_id}\nevent: {event_model.event_type.value}\ndata: {data}\n\n"
+
+    return StreamingResponse(
+        server_sent_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @event_router.get(
     "/{target_event_id}",
     status_code=status.HTTP_200_OK,
@@ -48,6 +95,7 @@ async def get_event(
     status_code=status.HTTP_200_OK,
     response_model=EventDeletionOutDTO,
     response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
 )
 async def delete_event(
     target_event_id: Annotated[uuid.UUID, Path(title="The ID of the event to delete")],
@@ -73,6 +121,7 @@ async def delete_event(
 )
 async def find_events(
     skip: int = Query(0, ge=0, description="Number of items to skip"),
+    cursor: str | None = Query(None, description="Cursor of the page to retrieve, as returned in nextCursor"),
     limit: int = Query(
         SETTINGS.pagination_limit_default,
         ge=0,
@@ -85,6 +134,10 @@ async def find_events(
     ),
     filters: EventFilterInDTO | None = Body(None, description="Field to filter"),
     with_deleted: bool | None = Query(False, description="Include deleted events"),
+    count_mode: CountModeEnum = Query(
+        CountModeEnum.NONE,
+        description="Total to return: none, exact (counted) or estimated (from the planner statistics)",
+    ),
     event_service: EventService = Depends(Dependencies.event_service),
     client: AuthorizedClient = Depends(authorizer),
 ):
@@ -95,16 +148,26 @@ async def find_events(
     """
     if filters:
         filters = filters.model_dump(exclude_none=True)
-    events = await event_service.find_events(
-        skip=skip,
-        limit=limit,
-        sort_field=sort_field,
-        sort_method=sort_method,
-        with_deleted=with_deleted,
-        filters=filters,
+    events, total = await asyncio.gather(
+        event_service.find_events(
+            skip=skip,
+            cursor=cursor,
+            limit=limit,
+            sort_field=sort_field,
+            sort_method=sort_method,
+            with_deleted=with_deleted,
+            filters=filters,
+        ),
+        event_service.count_events(
+            count_mode=count_mode,
+            with_deleted=with_deleted,
+            filters=filters,
+        ),
     )
     response_dto = EventListOutDTO(
         count=len(events),
+        total=total,
+        next_cursor=next_cursor(events, sort_field, limit),
         events=FullEventOutDTO.parse_obj(events),
     )
 
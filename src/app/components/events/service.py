@@ -1,4 +1,8 @@
+import json
+import time
 import uuid
+from collections.abc import AsyncIterator
+from datetime import date, datetime, timezone
 from typing import List
 
 from matter_exceptions.exceptions.fastapi import ServerError
@@ -9,13 +13,30 @@ from matter_observability.metrics import (
 from matter_persistence.sql.exceptions import DatabaseError
 from matter_persistence.sql.utils import SortMethodModel
 
+from app.common.enums.enums import CountModeEnum, EntityTypeEnum, EventTypeEnum
+from app.components.events.change_stream import Change, ChangeStream
 from app.components.events.dal import EventDAL
+from app.components.events.event_writer import EventWriter
 from app.components.events.models.event import EventModel
+from app.components.events.partitions import expired_partitions, upcoming_months
+from app.components.utils.count_cache import CountCache
+from app.components.utils.pagination import decode_cursor
+
+# the history is read from the (node_id, created DESC, id DESC) index, in its order
+HISTORY_SORT_FIELD = "created"
 
 
 class EventService:
-    def __init__(self, dal: EventDAL):
+    def __init__(
+        self,
+        dal: EventDAL,
+        event_writer: EventWriter | None = None,
+        change_stream: ChangeStream | None = None,
+    ):
         self._dal = dal
+        self._event_writer = event_writer
+        self._change_stream = change_stream
+        self._count_cache = CountCache()
 
     @count_occurrence(label="events.get_event")
     @measure_processing_time(label="events.get_event")
@@ -35,7 +56,9 @@ class EventService:
         sort_method: SortMethodModel | None = None,
         with_deleted: bool = False,
         filters: dict | None = None,
+        cursor: str | None = None,
     ) -> List[EventModel]:
+        after = decode_cursor(cursor, sort_field) if cursor else None
         return await self._dal.find_events(
             skip=skip,
             limit=limit,
@@ -43,6 +66,98 @@ class EventService:
             sort_method=sort_method,
             with_deleted=with_deleted,
             filters=filters,
+            after=after,
+        )
+
+    @count_occurrence(label="events.find_node_history")
+    @measure_processing_time(label="events.find_node_history")
+    async def find_node_history(
+        self,
+        entity_type: EntityTypeEnum,
+        node_id: uuid.UUID,
+        limit: int = None,
+        cursor: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> List[EventModel]:
+        """
+        Returns the events of a node, newest first, from the page after the cursor when one is given.
+        """
+        filters = {"entity_type": entity_type, "node_id": node_id}
+        if created_from is not None:
+            filters["created_from"] = created_from
+        if created_to is not None:
+            filters["created_to"] = created_to
+
+        return await self._dal.find_events(
+            limit=limit,
+            sort_field=HISTORY_SORT_FIELD,
+            sort_method=SortMethodModel.DESC,
+            with_deleted=False,
+            filters=filters,
+            after=decode_cursor(cursor, HISTORY_SORT_FIELD) if cursor else None,
+        )
+
+    async def stream_events(
+        self,
+        entity_type: EntityTypeEnum | None = None,
+        node_id: uuid.UUID | None = None,
+        last_event_id: str | None = None,
+    ) -> AsyncIterator[tuple[str, EventModel] | None]:
+        """
+        Yields the new events with their change stream id, and None when a keep-alive is due.
+
+        A keep-alive is also due when the changes of the pod were all filtered out for heartbeat_interval seconds, so
+        the subscribers of a quiet node on a busy stream are not closed as idle.
+        """
+        last_yielded = time.monotonic()
+        async for change in self._change_stream.changes(last_event_id=last_event_id):
+            if change is None or self._is_filtered_out(change, entity_type, node_id):
+                if change is None or time.monotonic() - last_yielded >= self._change_stream.heartbeat_interval:
+                    last_yielded = time.monotonic()
+                    yield None
+                continue
+
+            change_id, message = change
+            last_yielded = time.monotonic()
+            yield (
+                change_id,
+                EventModel(
+                    id=uuid.UUID(message["event_id"]),
+                    event_type=EventTypeEnum(message["event_type"]),
+                    entity_type=EntityTypeEnum(message["entity_type"]),
+                    node_id=uuid.UUID(message["node_id"]),
+                    user_id=uuid.UUID(message["user_id"]) if message["user_id"] else None,
+                    new_data=json.loads(message["new_data"]),
+                    created=datetime.fromisoformat(message["created"]),
+                ),
+            )
+
+    @staticmethod
+    def _is_filtered_out(change: Change, entity_type: EntityTypeEnum | None, node_id: uuid.UUID | None) -> bool:
+        _, message = change
+        return (entity_type is not None and message["entity_type"] != entity_type.value) or (
+            node_id is not None and message["node_id"] != str(node_id)
+        )
+
+    @count_occurrence(label="events.count_events")
+    @measure_processing_time(label="events.count_events")
+    async def count_events(
+        self,
+        count_mode: CountModeEnum = CountModeEnum.NONE,
+        with_deleted: bool = False,
+        filters: dict | None = None,
+    ) -> int | None:
+        if count_mode == CountModeEnum.NONE:
+            return None
+
+        return await self._count_cache.get_or_count(
+            key={"count_mode": count_mode, "with_deleted": with_deleted, "filters": filters},
+            count=lambda: self._dal.count_events(
+                with_deleted=with_deleted,
+                filters=filters,
+                estimated=count_mode == CountModeEnum.ESTIMATED,
+            ),
         )
 
     @count_occurrence(label="events.create_event")
@@ -51,6 +166,10 @@ class EventService:
         self,
         event_model: EventModel,
     ) -> EventModel:
+        if self._event_writer is not None:
+            await self._event_writer.enqueue([event_model])
+            return event_model
+
         try:
             created_event_model = await self._dal.create_event(event_model)
         except DatabaseError as ex:
@@ -58,6 +177,26 @@ class EventService:
 
         return created_event_model
 
+    @count_occurrence(label="events.create_events")
+    @measure_processing_time(label="events.create_events")
+    async def create_events(
+        self,
+        event_models: List[EventModel],
+    ) -> List[EventModel]:
+        if not event_models:
+            return []
+
+        if self._event_writer is not None:
+            await self._event_writer.enqueue(event_models)
+            return event_models
+
+        try:
+            created_event_models = await self._dal.create_events(event_models)
+        except DatabaseError as ex:
+            raise ServerError(description=ex.description, detail=ex.detail)
+
+        return created_event_models
+
     @count_occurrence(label="events.delete_event")
     @measure_processing_time(label="events.delete_event")
     async def delete_event(
@@ -65,3 +204,25 @@ class EventService:
         event_id: uuid.UUID,
     ) -> EventModel:
         return await self._dal.delete_event(event_id, soft_delete=True)
+
+    async def manage_partitions(
+        self,
+        months_ahead: int,
+        retention_months: int | None = None,
+        drop: bool = False,
+        today: date | None = None,
+    ) -> tuple[List[str], List[str]]:
+        """
+        Creates the partitions of the current month and the months_ahead following ones, and detaches, or drops, the
+        partitions older than retention_months months. Returns the names of the created and the detached partitions.
+        """
+        today = today or datetime.now(tz=timezone.utc).date()
+        created_partitions = await self._dal.create_event_partitions(upcoming_months(today, months_ahead))
+        if retention_months is None:
+            return created_partitions, []
+
+        detached_partitions = expired_partitions(await self._dal.find_event_partitions(), today, retention_months)
+        for name in detached_partitions:
+            await self._dal.detach_event_partition(name, drop=drop)
+
+        return created_partitions, detached_partitions
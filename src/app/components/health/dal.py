@@ -2,6 +2,8 @@ from matter_persistence.redis.manager import CacheManager
 from matter_persistence.sql.manager import DatabaseManager
 from matter_persistence.sql.utils import is_database_alive
 
+from app.components.utils.replicated_database_manager import ReplicatedDatabaseManager
+
 
 class HealthDAL:
     """
@@ -21,6 +23,9 @@ class HealthDAL:
         async def is_cache_alive(self) -> bool
             - Checks if the cache is alive by calling the is_cache_alive function of the cache client.
 
+        def get_replica_lag(self) -> float | None
+            - Returns the last measured lag of the read replica, None without a replica or when it is unreachable.
+
     """
 
     def __init__(
@@ -40,3 +45,10 @@ class HealthDAL:
         self,
     ) -> bool:
         return await self._cache_manager.is_cache_alive()
+
+    def get_replica_lag(
+        self,
+    ) -> float | None:
+        if not isinstance(self._database_manager, ReplicatedDatabaseManager):
+            return None
+        return self._database_manager.replica_lag
@@ -18,3 +18,8 @@ class HealthDeepStatusOutDTO(FoundationModel, HealthStatusOutDTO):
         ...,
         description="Health Check Cache Response",
     )
+    replica_lag: float | None = Field(
+        None,
+        alias="replicaLag",
+        description="Seconds the read replica is behind the primary, null without a replica or when it is unreachable",
+    )
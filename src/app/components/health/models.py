@@ -5,3 +5,4 @@ class HealthStatusModel(BaseModel):
     database: bool
     cache: bool
     health: bool
+    replica_lag: float | None = None
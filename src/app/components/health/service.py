@@ -38,4 +38,5 @@ class HealthService:
             database=database_alive,
             cache=cache_alive,
             health=database_alive and cache_alive,
+            replica_lag=self._dal.get_replica_lag(),
         )
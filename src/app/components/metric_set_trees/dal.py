@@ -3,43 +3,72 @@ from typing import List
 from uuid import UUID
 
 from matter_persistence.sql.exceptions import DatabaseRecordNotFoundError
-from matter_persistence.sql.manager import DatabaseManager
 from matter_persistence.sql.utils import SortMethodModel, commit, find, get
-from sqlalchemy import select
+from sqlalchemy import Select, any_, bindparam, delete, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import with_expression
 
+from app.common.enums.enums import EntityTypeEnum
 from app.components.metric_set_trees.models.metric_set_tree import MetricSetTreeModel
 from app.components.metric_set_trees.models.metric_set_trees_update import MetricSetTreeUpdateModel
+from app.components.utils.bulk_update_sql import bulk_update_statement
+from app.components.utils.core_read import find_rows, get_row, plain_columns
+from app.components.utils.count_sql import count
+from app.components.utils.meta_data_sql import meta_data_filter, meta_data_names_expression
+from app.components.utils.pagination import Cursor, chain_filters, is_cursor_sort, keyset_pagination
+from app.components.utils.replicated_database_manager import ReplicatedDatabaseManager
+from app.components.utils.sparse_fields import Fields, load_fields
 
 
 class MetricSetTreeDAL:
     def __init__(
         self,
-        database_manager: DatabaseManager,
+        database_manager: ReplicatedDatabaseManager,
     ):
         self._database_manager = database_manager
 
     async def get_metric_set_tree(
         self,
         metric_set_tree_id: UUID,
+        fields: Fields | None = None,
+        core_read_path: bool = False,
     ) -> MetricSetTreeModel:
-        statement = select(MetricSetTreeModel).where(MetricSetTreeModel.id == metric_set_tree_id)
-
-        async with self._database_manager.session() as session:
-            metric_set_tree_model = await get(
-                session=session,
-                statement=statement,
+        if core_read_path:
+            statement = select(*plain_columns(MetricSetTreeModel, fields)).where(
+                MetricSetTreeModel.id == metric_set_tree_id
             )
+        else:
+            statement = select(MetricSetTreeModel).where(MetricSetTreeModel.id == metric_set_tree_id)
+            if fields:
+                statement = load_fields(MetricSetTreeModel, fields)(statement)
 
-            if metric_set_tree_model is None:
-                raise DatabaseRecordNotFoundError(
-                    description=f"MetricSetTreeModel with MetricSetTree Id '{metric_set_tree_id}' not found.",
-                    detail={
-                        "metric_set_tree_id": metric_set_tree_id,
-                    },
+        async with self._database_manager.read_session() as session:
+            if core_read_path:
+                metric_set_tree_model = await get_row(session=session, statement=statement)
+            else:
+                metric_set_tree_model = await get(
+                    session=session,
+                    statement=statement,
                 )
 
+            if metric_set_tree_model is None:
+                raise self._not_found_error(metric_set_tree_id)
+
             return metric_set_tree_model
 
+    async def get_metric_set_trees(
+        self,
+        metric_set_tree_ids: List[UUID],
+    ) -> List[MetricSetTreeModel]:
+        statement = select(MetricSetTreeModel).where(
+            MetricSetTreeModel.id
+            == any_(bindparam("metric_set_tree_ids", metric_set_tree_ids, type_=ARRAY(PG_UUID(as_uuid=True))))
+        )
+
+        async with self._database_manager.read_session() as session:
+            return (await session.execute(statement)).scalars().all()
+
     async def find_metric_set_trees(
         self,
         skip: int = 0,
@@ -48,8 +77,47 @@ class MetricSetTreeDAL:
         sort_method: SortMethodModel = None,
         with_deleted: bool = True,
         filters: dict | None = None,
+        resolve_meta_data_names: bool = False,
+        after: Cursor | None = None,
+        meta_data_filters: dict | None = None,
+        fields: Fields | None = None,
+        core_read_path: bool = False,
     ) -> List[MetricSetTreeModel]:
-        async with self._database_manager.session() as session:
+        if fields and sort_field and is_cursor_sort(sort_field):
+            # the cursor of the next page is built from the sort field
+            fields = (*fields, sort_field)
+        custom_filter = meta_data_filter(MetricSetTreeModel, meta_data_filters) if meta_data_filters else None
+        if is_cursor_sort(sort_field):
+            # keyset pagination takes over the ordering, with the id breaking ties
+            custom_filter = chain_filters(
+                custom_filter, keyset_pagination(MetricSetTreeModel, sort_field, sort_method, after)
+            )
+            sort_field = None
+
+        if core_read_path:
+            async with self._database_manager.read_session() as session:
+                return await find_rows(
+                    session=session,
+                    db_model=MetricSetTreeModel,
+                    skip=skip,
+                    limit=limit,
+                    sort_field=sort_field,
+                    sort_method=sort_method,
+                    with_deleted=with_deleted,
+                    filters=filters,
+                    custom_filter=custom_filter,
+                    fields=fields,
+                    meta_data_names=meta_data_names_expression(MetricSetTreeModel, EntityTypeEnum.METRIC_SET_TREE)
+                    if resolve_meta_data_names
+                    else None,
+                )
+
+        custom_filter = chain_filters(
+            custom_filter,
+            self._with_meta_data_names if resolve_meta_data_names else None,
+            load_fields(MetricSetTreeModel, fields) if fields else None,
+        )
+        async with self._database_manager.read_session() as session:
             return await find(
                 session=session,
                 db_model=MetricSetTreeModel,
@@ -59,6 +127,26 @@ class MetricSetTreeDAL:
                 sort_method=sort_method,
                 with_deleted=with_deleted,
                 filters=filters,
+                custom_filter=custom_filter,
+            )
+
+    async def count_metric_set_trees(
+        self,
+        with_deleted: bool = True,
+        filters: dict | None = None,
+        meta_data_filters: dict | None = None,
+        estimated: bool = False,
+    ) -> int:
+        custom_filter = meta_data_filter(MetricSetTreeModel, meta_data_filters) if meta_data_filters else None
+
+        async with self._database_manager.read_session() as session:
+            return await count(
+                session=session,
+                db_model=MetricSetTreeModel,
+                with_deleted=with_deleted,
+                filters=filters,
+                custom_filter=custom_filter,
+                estimated=estimated,
             )
 
     async def create_metric_set_tree(self, metric_set_tree_model: MetricSetTreeModel) -> MetricSetTreeModel:
@@ -68,45 +156,103 @@ class MetricSetTreeDAL:
 
         return metric_set_tree_model
 
+    async def create_metric_set_trees(
+        self, metric_set_tree_models: List[MetricSetTreeModel]
+    ) -> List[MetricSetTreeModel]:
+        async with self._database_manager.session() as session:
+            # the rows are flushed together, as batched multi-row inserts in a single transaction
+            session.add_all(metric_set_tree_models)
+            await commit(session)
+
+        return metric_set_tree_models
+
     async def update_metric_set_tree(
         self,
         metric_set_tree_id: UUID,
         metric_set_tree_update_model: MetricSetTreeUpdateModel,
     ) -> MetricSetTreeModel:
-        metric_set_tree_model = await self.get_metric_set_tree(metric_set_tree_id)
+        values = {
+            k: v
+            for k, v in metric_set_tree_update_model.model_dump().items()
+            if k not in ["created", "deleted", "updated"] and hasattr(MetricSetTreeModel, k) and v is not None
+        }  # deleted is handled by the delete method
+        statement = (
+            update(MetricSetTreeModel)
+            .where(MetricSetTreeModel.id == metric_set_tree_id, MetricSetTreeModel.deleted.is_(None))
+            .values(**values, updated=datetime.now(tz=timezone.utc))
+            .returning(MetricSetTreeModel)
+        )
 
         async with self._database_manager.session() as session:
-            metric_set_tree_model = await session.merge(metric_set_tree_model)
-            for k, v in metric_set_tree_update_model.model_dump().items():
-                if k not in [
-                    "created",
-                    "deleted",
-                    "updated",
-                ]:  # updated & created are handled by sqlalchemy; deleted is handled by user
-                    if hasattr(metric_set_tree_model, k) and v is not None:
-                        setattr(metric_set_tree_model, k, v)
-
+            metric_set_tree_model = (await session.execute(statement)).scalar_one_or_none()
             await commit(session)
 
+        if metric_set_tree_model is None:
+            raise self._not_found_error(metric_set_tree_id)
+
         return metric_set_tree_model
 
+    async def update_metric_set_trees(
+        self,
+        metric_set_tree_update_models: dict[UUID, MetricSetTreeUpdateModel],
+    ) -> List[MetricSetTreeModel]:
+        if not metric_set_tree_update_models:
+            return []
+
+        statement = bulk_update_statement(MetricSetTreeModel, metric_set_tree_update_models)
+
+        async with self._database_manager.session() as session:
+            metric_set_tree_models = (await session.execute(statement)).scalars().all()
+            await commit(session)
+
+        return metric_set_tree_models
+
     async def delete_metric_set_tree(
         self,
         metric_set_tree_id: UUID,
         soft_delete: bool = True,
     ) -> MetricSetTreeModel:
-        metric_set_tree_model = await self.get_metric_set_tree(metric_set_tree_id)
+        deleted = datetime.now(tz=timezone.utc)
+        if soft_delete:
+            statement = (
+                update(MetricSetTreeModel)
+                .where(MetricSetTreeModel.id == metric_set_tree_id, MetricSetTreeModel.deleted.is_(None))
+                .values(deleted=deleted, updated=deleted)
+                .returning(MetricSetTreeModel)
+            )
+        else:
+            statement = (
+                delete(MetricSetTreeModel)
+                .where(MetricSetTreeModel.id == metric_set_tree_id)
+                .returning(MetricSetTreeModel)
+            )
 
         async with self._database_manager.session() as session:
-            metric_set_tree_model = await session.merge(metric_set_tree_model)
-            if soft_delete:
-                metric_set_tree_model.deleted = datetime.now(tz=timezone.utc)
-            else:
-                await session.delete(metric_set_tree_model)
-
+            metric_set_tree_model = (await session.execute(statement)).scalar_one_or_none()
             await commit(session)
 
-            if metric_set_tree_model.deleted is None:
-                metric_set_tree_model.deleted = datetime.now(tz=timezone.utc)
+        if metric_set_tree_model is None:
+            raise self._not_found_error(metric_set_tree_id)
+
+        if metric_set_tree_model.deleted is None:
+            metric_set_tree_model.deleted = deleted
 
         return metric_set_tree_model
+
+    @staticmethod
+    def _with_meta_data_names(statement: Select) -> Select:
+        return statement.options(
+            with_expression(
+                MetricSetTreeModel.meta_data_names,
+                meta_data_names_expression(MetricSetTreeModel, EntityTypeEnum.METRIC_SET_TREE),
+            )
+        )
+
+    @staticmethod
+    def _not_found_error(metric_set_tree_id: UUID) -> DatabaseRecordNotFoundError:
+        return DatabaseRecordNotFoundError(
+            description=f"MetricSetTreeModel with MetricSetTree Id '{metric_set_tree_id}' not found.",
+            detail={
+                "metric_set_tree_id": metric_set_tree_id,
+            },
+        )
@@ -30,6 +30,15 @@ class MetricSetTreeUpdateInDTO(MetricSetTreeInDTO):
     meta_data: dict | None = Field(None, alias="metaData")
 
 
+class MetricSetTreeSearchInDTO(MetricSetTreeUpdateInDTO):
+    meta_data_filters: dict | None = Field(None, alias="metaDataFilters")
+
+
+class MetricSetTreePatchInDTO(BaseModel):
+    id: uuid.UUID = Field(..., alias="id")
+    changes: MetricSetTreeUpdateInDTO = Field(..., alias="changes")
+
+
 class MetricSetTreeOutDTO(FoundationModel):
     id: uuid.UUID
 
@@ -50,5 +59,13 @@ class MetricSetTreeDeletionOutDTO(MetricSetTreeOutDTO):
 
 
 class MetricSetTreeListOutDTO(FoundationModel):
+    count: int
+    total: int | None = Field(None, description="Total number of matching items, given with a count_mode")
+    next_cursor: str | None = Field(None, alias="nextCursor")
+    metric_set_trees: List[FullMetricSetTreeOutDTO]
+
+
+class MetricSetTreeBatchOutDTO(FoundationModel):
     count: int
     metric_set_trees: List[FullMetricSetTreeOutDTO]
+    missing_ids: List[uuid.UUID] = Field(..., alias="missingIds")
@@ -1,7 +1,7 @@
 from matter_persistence.sql.base import CustomBase
-from sqlalchemy import UUID, Column, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import UUID, Column, Enum, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import query_expression, relationship
 
 from app.common.enums.enums import NodeTypeEnum
 
@@ -18,7 +18,17 @@ class MetricSetTreeModel(CustomBase):
     node_reference_id = Column(String(100), nullable=True)
     node_special = Column(String(100), nullable=True)
     meta_data = Column(JSONB, nullable=True)
+    meta_data_names = query_expression()  # meta_data keyed by property name, loaded only on request
 
     # Relationships
     metrics = relationship("MetricModel", back_populates="parent_section")
     metric_set = relationship("MetricSetModel", back_populates="metric_set_trees")
+
+    __table_args__ = (
+        Index(
+            "ix_metric_set_trees_meta_data",
+            "meta_data",
+            postgresql_using="gin",
+            postgresql_ops={"meta_data": "jsonb_path_ops"},
+        ),
+    )
@@ -1,8 +1,7 @@
-import asyncio
 import uuid
 from typing import List
 
-from matter_exceptions.exceptions.fastapi import ServerError
+from matter_exceptions.exceptions.fastapi import NotFoundError, ServerError, ValidationError
 from matter_observability.metrics import (
     count_occurrence,
     measure_processing_time,
@@ -10,27 +9,63 @@ from matter_observability.metrics import (
 from matter_persistence.sql.exceptions import DatabaseError
 from matter_persistence.sql.utils import SortMethodModel
 
-from app.common.enums.enums import EntityTypeEnum
+from app.common.enums.enums import CountModeEnum, EntityTypeEnum
 from app.components.metric_set_trees.dal import MetricSetTreeDAL
 from app.components.metric_set_trees.models.metric_set_tree import MetricSetTreeModel
 from app.components.metric_set_trees.models.metric_set_trees_update import MetricSetTreeUpdateModel
+from app.components.utils.core_read import is_core_read_path
+from app.components.utils.count_cache import CountCache
 from app.components.utils.meta_data_service import MetaDataService
+from app.components.utils.pagination import decode_cursor
+from app.components.utils.sparse_fields import Fields
 
 
 class MetricSetTreeService:
     def __init__(self, dal: MetricSetTreeDAL, meta_data_service: MetaDataService):
         self._dal = dal
         self._meta_data_service = meta_data_service
+        self._count_cache = CountCache()
 
     @count_occurrence(label="metric_set_trees.get_metric_set_tree")
     @measure_processing_time(label="metric_set_trees.get_metric_set_tree")
     async def get_metric_set_tree(
         self,
         metric_set_tree_id: uuid.UUID,
+        fields: Fields | None = None,
+        core_read_path: bool | None = None,
     ) -> MetricSetTreeModel:
-        metric_set_tree = await self._dal.get_metric_set_tree(metric_set_tree_id=metric_set_tree_id)
+        if core_read_path is None:
+            core_read_path = is_core_read_path(entity_type=EntityTypeEnum.METRIC_SET_TREE)
+
+        metric_set_tree = await self._dal.get_metric_set_tree(
+            metric_set_tree_id=metric_set_tree_id, fields=fields, core_read_path=core_read_path
+        )
+        if fields is not None and "meta_data" not in fields:
+            return metric_set_tree
+
         return await self._convert_metadata_out(metric_set_tree=metric_set_tree)
 
+    @count_occurrence(label="metric_set_trees.get_metric_set_trees")
+    @measure_processing_time(label="metric_set_trees.get_metric_set_trees")
+    async def get_metric_set_trees(
+        self,
+        metric_set_tree_ids: List[uuid.UUID],
+    ) -> List[MetricSetTreeModel]:
+        metric_set_trees = await self._dal.get_metric_set_trees(
+            metric_set_tree_ids=list(dict.fromkeys(metric_set_tree_ids))
+        )
+        await self._meta_data_service.convert_many_ids_to_names(
+            entity_type=EntityTypeEnum.METRIC_SET_TREE, rows=metric_set_trees
+        )
+
+        # rows come back in the order of the requested ids, missing ids are left out
+        metric_set_trees_by_id = {metric_set_tree.id: metric_set_tree for metric_set_tree in metric_set_trees}
+        return [
+            metric_set_trees_by_id[metric_set_tree_id]
+            for metric_set_tree_id in dict.fromkeys(metric_set_tree_ids)
+            if metric_set_tree_id in metric_set_trees_by_id
+        ]
+
     @count_occurrence(label="metric_set_trees.find_metric_set_trees")
     @measure_processing_time(label="metric_set_trees.find_metric_set_trees")
     async def find_metric_set_trees(
@@ -41,7 +76,27 @@ class MetricSetTreeService:
         sort_method: SortMethodModel | None = None,
         with_deleted: bool = False,
         filters: dict | None = None,
+        cursor: str | None = None,
+        resolve_meta_data_in_sql: bool | None = None,
+        meta_data_filters: dict | None = None,
+        fields: Fields | None = None,
+        core_read_path: bool | None = None,
     ) -> List[MetricSetTreeModel]:
+        after = decode_cursor(cursor, sort_field) if cursor else None
+        if meta_data_filters:
+            meta_data_filters = await self._meta_data_service.convert_filter_names_to_ids(
+                entity_type=EntityTypeEnum.METRIC_SET_TREE, meta_data_filters=meta_data_filters
+            )
+
+        # without metaData in the fields, the metadata is neither loaded nor converted
+        resolves_meta_data = fields is None or "meta_data" in fields
+        if resolve_meta_data_in_sql is None:
+            resolve_meta_data_in_sql = self._meta_data_service.is_resolved_in_sql(
+                entity_type=EntityTypeEnum.METRIC_SET_TREE
+            )
+        if core_read_path is None:
+            core_read_path = is_core_read_path(entity_type=EntityTypeEnum.METRIC_SET_TREE)
+
         metric_set_trees = await self._dal.find_metric_set_trees(
             skip=skip,
             limit=limit,
@@ -49,9 +104,53 @@ class MetricSetTreeService:
             sort_method=sort_method,
             with_deleted=with_deleted,
             filters=filters,
+            resolve_meta_data_names=resolves_meta_data and resolve_meta_data_in_sql,
+            after=after,
+            meta_data_filters=meta_data_filters,
+            fields=fields,
+            core_read_path=core_read_path,
         )
-        return await asyncio.gather(
-            *[self._convert_metadata_out(metric_set_tree=metric_set_tree) for metric_set_tree in metric_set_trees]
+
+        if not resolves_meta_data:
+            return metric_set_trees
+
+        if resolve_meta_data_in_sql:
+            return self._meta_data_service.take_names_resolved_in_sql(rows=metric_set_trees)
+
+        return await self._meta_data_service.convert_many_ids_to_names(
+            entity_type=EntityTypeEnum.METRIC_SET_TREE, rows=metric_set_trees
+        )
+
+    @count_occurrence(label="metric_set_trees.count_metric_set_trees")
+    @measure_processing_time(label="metric_set_trees.count_metric_set_trees")
+    async def count_metric_set_trees(
+        self,
+        count_mode: CountModeEnum = CountModeEnum.NONE,
+        with_deleted: bool = False,
+        filters: dict | None = None,
+        meta_data_filters: dict | None = None,
+    ) -> int | None:
+        if count_mode == CountModeEnum.NONE:
+            return None
+
+        if meta_data_filters:
+            meta_data_filters = await self._meta_data_service.convert_filter_names_to_ids(
+                entity_type=EntityTypeEnum.METRIC_SET_TREE, meta_data_filters=meta_data_filters
+            )
+
+        return await self._count_cache.get_or_count(
+            key={
+                "count_mode": count_mode,
+                "with_deleted": with_deleted,
+                "filters": filters,
+                "meta_data_filters": meta_data_filters,
+            },
+            count=lambda: self._dal.count_metric_set_trees(
+                with_deleted=with_deleted,
+                filters=filters,
+                meta_data_filters=meta_data_filters,
+                estimated=count_mode == CountModeEnum.ESTIMATED,
+            ),
         )
 
     @count_occurrence(label="metric_set_trees.create_metric_set_tree")
@@ -73,6 +172,35 @@ class MetricSetTreeService:
 
         return await self._convert_metadata_out(metric_set_tree=created_metric_set_tree_model)
 
+    @count_occurrence(label="metric_set_trees.create_metric_set_trees")
+    @measure_processing_time(label="metric_set_trees.create_metric_set_trees")
+    async def create_metric_set_trees(
+        self,
+        metric_set_tree_models: List[MetricSetTreeModel],
+    ) -> List[MetricSetTreeModel | ValidationError]:
+        results = await self._meta_data_service.convert_many_names_to_ids(
+            entity_type=EntityTypeEnum.METRIC_SET_TREE,
+            meta_data_list=[metric_set_tree_model.meta_data or {} for metric_set_tree_model in metric_set_tree_models],
+        )
+
+        valid_metric_set_tree_models = []
+        for index, (metric_set_tree_model, result) in enumerate(zip(metric_set_tree_models, results)):
+            if not isinstance(result, ValidationError):
+                metric_set_tree_model.meta_data = result
+                valid_metric_set_tree_models.append(metric_set_tree_model)
+                results[index] = metric_set_tree_model
+
+        try:
+            await self._dal.create_metric_set_trees(metric_set_tree_models=valid_metric_set_tree_models)
+        except DatabaseError as ex:
+            raise ServerError(description=ex.description, detail=ex.detail)
+
+        await self._meta_data_service.convert_many_ids_to_names(
+            entity_type=EntityTypeEnum.METRIC_SET_TREE, rows=valid_metric_set_tree_models
+        )
+
+        return results
+
     @count_occurrence(label="metric_set_trees.update_metric_set_tree")
     @measure_processing_time(label="metric_set_trees.update_metric_set_tree")
     async def update_metric_set_tree(
@@ -81,9 +209,10 @@ class MetricSetTreeService:
         metric_set_tree_update_model: MetricSetTreeUpdateModel,
     ) -> MetricSetTreeModel:
         try:
-            metric_set_tree_update_model.meta_data = await self._convert_metadata_names_to_ids(
-                meta_data=metric_set_tree_update_model.meta_data
-            )
+            if metric_set_tree_update_model.meta_data is not None:
+                metric_set_tree_update_model.meta_data = await self._convert_metadata_names_to_ids(
+                    meta_data=metric_set_tree_update_model.meta_data
+                )
 
             updated_metric_set_tree = await self._dal.update_metric_set_tree(
                 metric_set_tree_id=metric_set_tree_id, metric_set_tree_update_model=metric_set_tree_update_model
@@ -93,6 +222,62 @@ class MetricSetTreeService:
 
         return await self._convert_metadata_out(metric_set_tree=updated_metric_set_tree)
 
+    @count_occurrence(label="metric_set_trees.update_metric_set_trees")
+    @measure_processing_time(label="metric_set_trees.update_metric_set_trees")
+    async def update_metric_set_trees(
+        self,
+        metric_set_tree_update_models: List[tuple[uuid.UUID, MetricSetTreeUpdateModel]],
+    ) -> List[MetricSetTreeModel | NotFoundError | ValidationError]:
+        metric_set_tree_ids = [metric_set_tree_id for metric_set_tree_id, _ in metric_set_tree_update_models]
+        if len(set(metric_set_tree_ids)) != len(metric_set_tree_ids):
+            raise ValidationError(
+                description="Every metric_set_tree can only be patched once per request.",
+                detail={"metric_set_tree_ids": metric_set_tree_ids},
+            )
+
+        results: List = [None] * len(metric_set_tree_update_models)
+        with_meta_data = [
+            index
+            for index, (_, update_model) in enumerate(metric_set_tree_update_models)
+            if update_model.meta_data is not None
+        ]
+        converted_meta_data = await self._meta_data_service.convert_many_names_to_ids(
+            entity_type=EntityTypeEnum.METRIC_SET_TREE,
+            meta_data_list=[metric_set_tree_update_models[index][1].meta_data for index in with_meta_data],
+        )
+        for index, meta_data in zip(with_meta_data, converted_meta_data):
+            if isinstance(meta_data, ValidationError):
+                results[index] = meta_data
+            else:
+                metric_set_tree_update_models[index][1].meta_data = meta_data
+
+        try:
+            updated_metric_set_trees = await self._dal.update_metric_set_trees(
+                metric_set_tree_update_models={
+                    metric_set_tree_id: update_model
+                    for (metric_set_tree_id, update_model), result in zip(metric_set_tree_update_models, results)
+                    if result is None
+                }
+            )
+        except DatabaseError as ex:
+            raise ServerError(description=ex.description, detail=ex.detail)
+
+        await self._meta_data_service.convert_many_ids_to_names(
+            entity_type=EntityTypeEnum.METRIC_SET_TREE, rows=updated_metric_set_trees
+        )
+
+        updated_metric_set_trees_by_id = {
+            metric_set_tree.id: metric_set_tree for metric_set_tree in updated_metric_set_trees
+        }
+        for index, metric_set_tree_id in enumerate(metric_set_tree_ids):
+            if results[index] is None:
+                results[index] = updated_metric_set_trees_by_id.get(metric_set_tree_id) or NotFoundError(
+                    description=f"MetricSetTreeModel with Id '{metric_set_tree_id}' not found.",
+                    detail={"metric_set_tree_id": metric_set_tree_id},
+                )
+
+        return results
+
     @count_occurrence(label="metric_set_trees.delete_metric_set_tree")
     @measure_processing_time(label="metric_set_trees.delete_metric_set_tree")
     async def delete_metric_set_tree(
@@ -120,8 +305,6 @@ class MetricSetTreeService:
         )
 
     async def _convert_metadata_names_to_ids(self, meta_data: dict) -> dict:
-        if meta_data is None:
-            return {}
         return await self._meta_data_service.convert_metadata_names_to_ids(
-            entity_type=EntityTypeEnum.METRIC_SET_TREE, meta_data=meta_data
+            entity_type=EntityTypeEnum.METRIC_SET_TREE, meta_data=meta_data or {}
         )
@@ -22,6 +22,15 @@ class MetricSetUpdateInDTO(MetricSetInDTO):
     meta_data: dict | None = Field(None, alias="metaData")
 
 
+class MetricSetSearchInDTO(MetricSetUpdateInDTO):
+    meta_data_filters: dict | None = Field(None, alias="metaDataFilters")
+
+
+class MetricSetPatchInDTO(BaseModel):
+    id: uuid.UUID = Field(..., alias="id")
+    changes: MetricSetUpdateInDTO = Field(..., alias="changes")
+
+
 class MetricSetOutDTO(FoundationModel):
     id: uuid.UUID
 
@@ -38,5 +47,13 @@ class MetricSetDeletionOutDTO(MetricSetOutDTO):
 
 
 class MetricSetListOutDTO(FoundationModel):
+    count: int
+    total: int | None = Field(None, description="Total number of matching items, given with a count_mode")
+    next_cursor: str | None = Field(None, alias="nextCursor")
+    metric_sets: List[FullMetricSetOutDTO]
+
+
+class MetricSetBatchOutDTO(FoundationModel):
     count: int
     metric_sets: List[FullMetricSetOutDTO]
+    missing_ids: List[uuid.UUID] = Field(..., alias="missingIds")
@@ -1,7 +1,7 @@
 from matter_persistence.sql.base import CustomBase
-from sqlalchemy import Column, Enum, String
+from sqlalchemy import Column, Enum, Index, String
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import query_expression, relationship
 
 from app.common.enums.enums import PlacementEnum, StatusEnum
 
@@ -13,6 +13,16 @@ class MetricSetModel(CustomBase):
     short_name = Column(String(100), nullable=False)
     placement = Column(Enum(PlacementEnum), nullable=False)
     meta_data = Column(JSONB, nullable=True)
+    meta_data_names = query_expression()  # meta_data keyed by property name, loaded only on request
 
     metrics = relationship("MetricModel", back_populates="metric_set")
     metric_set_trees = relationship("MetricSetTreeModel", back_populates="metric_set")
+
+    __table_args__ = (
+        Index(
+            "ix_metric_sets_meta_data",
+            "meta_data",
+            postgresql_using="gin",
+            postgresql_ops={"meta_data": "jsonb_path_ops"},
+        ),
+    )
@@ -1,5 +1,7 @@
+import asyncio
 import uuid
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, List
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, status
 from fastapi.responses import JSONResponse
@@ -8,20 +10,28 @@ from pydantic_core import from_json
 
 from app.auth import jwt_authorizer
 from app.auth.models import AuthorizedClient
-from app.common.enums.enums import EntityTypeEnum, EventTypeEnum
+from app.common.enums.enums import CountModeEnum, EntityTypeEnum, EventTypeEnum
+from app.components.events.dtos import EventListOutDTO
+from app.components.events.history import history_response
 from app.components.events.models.event import EventModel
 from app.components.events.service import EventService
 from app.components.metric_sets.dtos import (
     FullMetricSetOutDTO,
+    MetricSetBatchOutDTO,
     MetricSetDeletionOutDTO,
     MetricSetInDTO,
     MetricSetListOutDTO,
     MetricSetOutDTO,
+    MetricSetPatchInDTO,
+    MetricSetSearchInDTO,
     MetricSetUpdateInDTO,
 )
 from app.components.metric_sets.models.metric_set import MetricSetModel
 from app.components.metric_sets.models.metric_set_update import MetricSetUpdateModel
 from app.components.metric_sets.service import MetricSetService
+from app.components.utils.dtos import BatchGetInDTO, BulkItemOutDTO, BulkOutDTO
+from app.components.utils.pagination import next_cursor
+from app.components.utils.sparse_fields import parse_fields, sparse_dto, sparse_list_dto, sparse_response
 from app.dependencies import Dependencies
 from app.env import SETTINGS
 
@@ -34,6 +44,7 @@ authorizer = jwt_authorizer
     status_code=status.HTTP_201_CREATED,
     response_model=MetricSetOutDTO,
     response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
 )
 async def create_metric_set(
     metric_set_in_dto: MetricSetInDTO,
@@ -65,6 +76,82 @@ async def create_metric_set(
     return response_dto
 
 
+@metric_set_router.post(
+    "/bulk",
+    status_code=status.HTTP_201_CREATED,
+    response_model=BulkOutDTO,
+    response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
+)
+async def create_metric_sets(
+    metric_set_in_dtos: Annotated[List[MetricSetInDTO], Body(max_length=SETTINGS.bulk_max_items)],
+    metric_set_service: MetricSetService = Depends(Dependencies.metric_set_service),
+    event_service: EventService = Depends(Dependencies.event_service),
+    client: AuthorizedClient = Depends(authorizer),
+):
+    if not client.is_super_user():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    """
+    Creates the given metric_sets in one transaction, skipping the ones with invalid metadata.
+    """
+    results = await metric_set_service.create_metric_sets(
+        metric_set_models=[MetricSetModel.parse_obj(metric_set_in_dto) for metric_set_in_dto in metric_set_in_dtos],
+    )
+    created = [
+        (metric_set_in_dto, result)
+        for metric_set_in_dto, result in zip(metric_set_in_dtos, results)
+        if isinstance(result, MetricSetModel)
+    ]
+    response_dto = BulkOutDTO(
+        count=len(created),
+        items=BulkItemOutDTO.parse_results(results),
+    )
+
+    await event_service.create_events(
+        [
+            EventModel(
+                event_type=EventTypeEnum.CREATED,
+                entity_type=EntityTypeEnum.METRIC_SET,
+                node_id=created_metric_set_model.id,
+                user_id=client.user_id,
+                new_data=from_json(metric_set_in_dto.model_dump_json()),
+            )
+            for metric_set_in_dto, created_metric_set_model in created
+        ]
+    )
+
+    return response_dto
+
+
+@metric_set_router.post(
+    "/batch-get",
+    status_code=status.HTTP_200_OK,
+    response_model=MetricSetBatchOutDTO,
+    response_class=JSONResponse,
+)
+async def get_metric_sets(
+    batch_get_in_dto: BatchGetInDTO,
+    metric_set_service: MetricSetService = Depends(Dependencies.metric_set_service),
+    client: AuthorizedClient = Depends(authorizer),
+):
+    if not client.is_super_user():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    """
+    Fetches the details of the metric_sets with the given ids, in the order of the ids.
+    """
+    metric_set_models = await metric_set_service.get_metric_sets(metric_set_ids=batch_get_in_dto.ids)
+    found_ids = {metric_set_model.id for metric_set_model in metric_set_models}
+    response_dto = MetricSetBatchOutDTO(
+        count=len(metric_set_models),
+        metric_sets=FullMetricSetOutDTO.parse_obj(metric_set_models),
+        missing_ids=[
+            metric_set_id for metric_set_id in dict.fromkeys(batch_get_in_dto.ids) if metric_set_id not in found_ids
+        ],
+    )
+
+    return response_dto
+
+
 @metric_set_router.get(
     "/{target_metric_set_id}",
     status_code=status.HTTP_200_OK,
@@ -73,6 +160,9 @@ async def create_metric_set(
 )
 async def get_metric_set(
     target_metric_set_id: Annotated[uuid.UUID, Path(title="The ID of the metric_set to retrieve")],
+    fields: str | None = Query(
+        None, description="Comma separated fields to return, like id,name,status. All the fields by default"
+    ),
     metric_set_service: MetricSetService = Depends(Dependencies.metric_set_service),
     client: AuthorizedClient = Depends(authorizer),
 ):
@@ -81,10 +171,47 @@ async def get_metric_set(
     """
     Fetches the details of a metric_set.
     """
-    metric_set_model = await metric_set_service.get_metric_set(metric_set_id=target_metric_set_id)
-    response_dto = FullMetricSetOutDTO.parse_obj(metric_set_model)
+    field_names = parse_fields(fields, FullMetricSetOutDTO)
+    metric_set_model = await metric_set_service.get_metric_set(metric_set_id=target_metric_set_id, fields=field_names)
+    response_dto = sparse_dto(FullMetricSetOutDTO, field_names).parse_obj(metric_set_model)
 
-    return response_dto
+    return sparse_response(response_dto, field_names)
+
+
+@metric_set_router.get(
+    "/{target_metric_set_id}/history",
+    status_code=status.HTTP_200_OK,
+    response_model=EventListOutDTO,
+    response_class=JSONResponse,
+)
+async def get_metric_set_history(
+    target_metric_set_id: Annotated[uuid.UUID, Path(title="The ID of the metric set to retrieve the history of")],
+    cursor: str | None = Query(None, description="Cursor of the page to retrieve, as returned in nextCursor"),
+    limit: int = Query(
+        SETTINGS.pagination_limit_default,
+        ge=0,
+        le=SETTINGS.pagination_limit_max,
+        description="Number of items to retrieve",
+    ),
+    created_from: datetime | None = Query(None, description="Events created at or after it"),
+    created_to: datetime | None = Query(None, description="Events created before it"),
+    event_service: EventService = Depends(Dependencies.event_service),
+    client: AuthorizedClient = Depends(authorizer),
+):
+    if not client.is_super_user():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    """
+    Returns the events of a metric set, newest first.
+    """
+    return await history_response(
+        event_service,
+        entity_type=EntityTypeEnum.METRIC_SET,
+        node_id=target_metric_set_id,
+        cursor=cursor,
+        limit=limit,
+        created_from=created_from,
+        created_to=created_to,
+    )
 
 
 @metric_set_router.put(
@@ -92,6 +219,7 @@ async def get_metric_set(
     status_code=status.HTTP_200_OK,
     response_model=MetricSetOutDTO,
     response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
 )
 async def update_metric_set(
     target_metric_set_id: Annotated[uuid.UUID, Path(title="The ID of the metric_set to update")],
@@ -125,11 +253,65 @@ async def update_metric_set(
     return response_dto
 
 
+@metric_set_router.patch(
+    "/bulk",
+    status_code=status.HTTP_200_OK,
+    response_model=BulkOutDTO,
+    response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
+)
+async def update_metric_sets(
+    metric_set_patch_in_dtos: Annotated[List[MetricSetPatchInDTO], Body(max_length=SETTINGS.bulk_max_items)],
+    metric_set_service: MetricSetService = Depends(Dependencies.metric_set_service),
+    event_service: EventService = Depends(Dependencies.event_service),
+    client: AuthorizedClient = Depends(authorizer),
+):
+    if not client.is_super_user():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    """
+    Applies the given changes to every metric_set in one statement, skipping the ones with invalid metadata.
+    """
+    results = await metric_set_service.update_metric_sets(
+        metric_set_update_models=[
+            (
+                metric_set_patch_in_dto.id,
+                MetricSetUpdateModel.model_validate(metric_set_patch_in_dto.changes.model_dump(exclude_none=True)),
+            )
+            for metric_set_patch_in_dto in metric_set_patch_in_dtos
+        ],
+    )
+    updated = [
+        (metric_set_patch_in_dto, result)
+        for metric_set_patch_in_dto, result in zip(metric_set_patch_in_dtos, results)
+        if isinstance(result, MetricSetModel)
+    ]
+    response_dto = BulkOutDTO(
+        count=len(updated),
+        items=BulkItemOutDTO.parse_results(results),
+    )
+
+    await event_service.create_events(
+        [
+            EventModel(
+                event_type=EventTypeEnum.UPDATED,
+                entity_type=EntityTypeEnum.METRIC_SET,
+                node_id=updated_metric_set_model.id,
+                user_id=client.user_id,
+                new_data=from_json(metric_set_patch_in_dto.changes.model_dump_json(exclude_none=True)),
+            )
+            for metric_set_patch_in_dto, updated_metric_set_model in updated
+        ]
+    )
+
+    return response_dto
+
+
 @metric_set_router.delete(
     "/{target_metric_set_id}",
     status_code=status.HTTP_200_OK,
     response_model=MetricSetDeletionOutDTO,
     response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
 )
 async def delete_metric_set(
     target_metric_set_id: Annotated[uuid.UUID, Path(title="The ID of the metric_set to delete")],
@@ -165,6 +347,7 @@ async def delete_metric_set(
 )
 async def find_metric_sets(
     skip: int = Query(0, ge=0, description="Number of items to skip"),
+    cursor: str | None = Query(None, description="Cursor of the page to retrieve, as returned in nextCursor"),
     limit: int = Query(
         SETTINGS.pagination_limit_default,
         ge=0,
@@ -175,8 +358,15 @@ async def find_metric_sets(
     sort_method: SortMethodModel = Query(
         SortMethodModel.ASC, title="Sort method", description="Sort method: asc or desc"
     ),
-    filters: MetricSetUpdateInDTO | None = Body(None, description="Field to filter"),
+    filters: MetricSetSearchInDTO | None = Body(None, description="Fields and metadata to filter"),
     with_deleted: bool | None = Query(False, description="Include deleted metric_sets"),
+    count_mode: CountModeEnum = Query(
+        CountModeEnum.NONE,
+        description="Total to return: none, exact (counted) or estimated (from the planner statistics)",
+    ),
+    fields: str | None = Query(
+        None, description="Comma separated fields to return, like id,name,status. All the fields by default"
+    ),
     metric_set_service: MetricSetService = Depends(Dependencies.metric_set_service),
     client: AuthorizedClient = Depends(authorizer),
 ):
@@ -185,19 +375,35 @@ async def find_metric_sets(
     """
     Return a list of metric_sets, based on given parameters.
     """
+    field_names = parse_fields(fields, FullMetricSetOutDTO)
+    meta_data_filters = None
     if filters:
-        filters = filters.model_dump(exclude_none=True)
-    metric_sets = await metric_set_service.find_metric_sets(
-        skip=skip,
-        limit=limit,
-        sort_field=sort_field,
-        sort_method=sort_method,
-        with_deleted=with_deleted,
-        filters=filters,
+        meta_data_filters = filters.meta_data_filters
+        filters = filters.model_dump(exclude_none=True, exclude={"meta_data_filters"})
+    metric_sets, total = await asyncio.gather(
+        metric_set_service.find_metric_sets(
+            skip=skip,
+            cursor=cursor,
+            limit=limit,
+            sort_field=sort_field,
+            sort_method=sort_method,
+            with_deleted=with_deleted,
+            filters=filters,
+            meta_data_filters=meta_data_filters,
+            fields=field_names,
+        ),
+        metric_set_service.count_metric_sets(
+            count_mode=count_mode,
+            with_deleted=with_deleted,
+            filters=filters,
+            meta_data_filters=meta_data_filters,
+        ),
     )
-    response_dto = MetricSetListOutDTO(
+    response_dto = sparse_list_dto(MetricSetListOutDTO, "metric_sets", FullMetricSetOutDTO, field_names)(
         count=len(metric_sets),
-        metric_sets=FullMetricSetOutDTO.parse_obj(metric_sets),
+        total=total,
+        next_cursor=next_cursor(metric_sets, sort_field, limit),
+        metric_sets=sparse_dto(FullMetricSetOutDTO, field_names).parse_obj(metric_sets),
     )
 
-    return response_dto
+    return sparse_response(response_dto, field_names)
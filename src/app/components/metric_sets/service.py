@@ -1,8 +1,7 @@
-import asyncio
 import uuid
 from typing import List
 
-from matter_exceptions.exceptions.fastapi import ServerError
+from matter_exceptions.exceptions.fastapi import NotFoundError, ServerError, ValidationError
 from matter_observability.metrics import (
     count_occurrence,
     measure_processing_time,
@@ -10,27 +9,59 @@ from matter_observability.metrics import (
 from matter_persistence.sql.exceptions import DatabaseError
 from matter_persistence.sql.utils import SortMethodModel
 
-from app.common.enums.enums import EntityTypeEnum
+from app.common.enums.enums import CountModeEnum, EntityTypeEnum
 from app.components.metric_sets.dal import MetricSetDAL
 from app.components.metric_sets.models.metric_set import MetricSetModel
 from app.components.metric_sets.models.metric_set_update import MetricSetUpdateModel
+from app.components.utils.core_read import is_core_read_path
+from app.components.utils.count_cache import CountCache
 from app.components.utils.meta_data_service import MetaDataService
+from app.components.utils.pagination import decode_cursor
+from app.components.utils.sparse_fields import Fields
 
 
 class MetricSetService:
     def __init__(self, dal: MetricSetDAL, meta_data_service: MetaDataService):
         self._dal = dal
         self._meta_data_service = meta_data_service
+        self._count_cache = CountCache()
 
     @count_occurrence(label="metric_sets.get_metric_set")
     @measure_processing_time(label="metric_sets.get_metric_set")
     async def get_metric_set(
         self,
         metric_set_id: uuid.UUID,
+        fields: Fields | None = None,
+        core_read_path: bool | None = None,
     ) -> MetricSetModel:
-        metric_set = await self._dal.get_metric_set(metric_set_id=metric_set_id)
+        if core_read_path is None:
+            core_read_path = is_core_read_path(entity_type=EntityTypeEnum.METRIC_SET)
+
+        metric_set = await self._dal.get_metric_set(
+            metric_set_id=metric_set_id, fields=fields, core_read_path=core_read_path
+        )
+        if fields is not None and "meta_data" not in fields:
+            return metric_set
+
         return await self._convert_metadata_out(metric_set=metric_set)
 
+    @count_occurrence(label="metric_sets.get_metric_sets")
+    @measure_processing_time(label="metric_sets.get_metric_sets")
+    async def get_metric_sets(
+        self,
+        metric_set_ids: List[uuid.UUID],
+    ) -> List[MetricSetModel]:
+        metric_sets = await self._dal.get_metric_sets(metric_set_ids=list(dict.fromkeys(metric_set_ids)))
+        await self._meta_data_service.convert_many_ids_to_names(entity_type=EntityTypeEnum.METRIC_SET, rows=metric_sets)
+
+        # rows come back in the order of the requested ids, missing ids are left out
+        metric_sets_by_id = {metric_set.id: metric_set for metric_set in metric_sets}
+        return [
+            metric_sets_by_id[metric_set_id]
+            for metric_set_id in dict.fromkeys(metric_set_ids)
+            if metric_set_id in metric_sets_by_id
+        ]
+
     @count_occurrence(label="metric_sets.find_metric_sets")
     @measure_processing_time(label="metric_sets.find_metric_sets")
     async def find_metric_sets(
@@ -41,7 +72,25 @@ class MetricSetService:
         sort_method: SortMethodModel | None = None,
         with_deleted: bool = False,
         filters: dict | None = None,
+        cursor: str | None = None,
+        resolve_meta_data_in_sql: bool | None = None,
+        meta_data_filters: dict | None = None,
+        fields: Fields | None = None,
+        core_read_path: bool | None = None,
     ) -> List[MetricSetModel]:
+        after = decode_cursor(cursor, sort_field) if cursor else None
+        if meta_data_filters:
+            meta_data_filters = await self._meta_data_service.convert_filter_names_to_ids(
+                entity_type=EntityTypeEnum.METRIC_SET, meta_data_filters=meta_data_filters
+            )
+
+        # without metaData in the fields, the metadata is neither loaded nor converted
+        resolves_meta_data = fields is None or "meta_data" in fields
+        if resolve_meta_data_in_sql is None:
+            resolve_meta_data_in_sql = self._meta_data_service.is_resolved_in_sql(entity_type=EntityTypeEnum.METRIC_SET)
+        if core_read_path is None:
+            core_read_path = is_core_read_path(entity_type=EntityTypeEnum.METRIC_SET)
+
         metric_sets = await self._dal.find_metric_sets(
             skip=skip,
             limit=limit,
@@ -49,9 +98,54 @@ class MetricSetService:
             sort_method=sort_method,
             with_deleted=with_deleted,
             filters=filters,
+            resolve_meta_data_names=resolves_meta_data and resolve_meta_data_in_sql,
+            after=after,
+            meta_data_filters=meta_data_filters,
+            fields=fields,
+            core_read_path=core_read_path,
         )
 
-        return await asyncio.gather(*[self._convert_metadata_out(metric_set=metric_set) for metric_set in metric_sets])
+        if not resolves_meta_data:
+            return metric_sets
+
+        if resolve_meta_data_in_sql:
+            return self._meta_data_service.take_names_resolved_in_sql(rows=metric_sets)
+
+        return await self._meta_data_service.convert_many_ids_to_names(
+            entity_type=EntityTypeEnum.METRIC_SET, rows=metric_sets
+        )
+
+    @count_occurrence(label="metric_sets.count_metric_sets")
+    @measure_processing_time(label="metric_sets.count_metric_sets")
+    async def count_metric_sets(
+        self,
+        count_mode: CountModeEnum = CountModeEnum.NONE,
+        with_deleted: bool = False,
+        filters: dict | None = None,
+        meta_data_filters: dict | None = None,
+    ) -> int | None:
+        if count_mode == CountModeEnum.NONE:
+            return None
+
+        if meta_data_filters:
+            meta_data_filters = await self._meta_data_service.convert_filter_names_to_ids(
+                entity_type=EntityTypeEnum.METRIC_SET, meta_data_filters=meta_data_filters
+            )
+
+        return await self._count_cache.get_or_count(
+            key={
+                "count_mode": count_mode,
+                "with_deleted": with_deleted,
+                "filters": filters,
+                "meta_data_filters": meta_data_filters,
+            },
+            count=lambda: self._dal.count_metric_sets(
+                with_deleted=with_deleted,
+                filters=filters,
+                meta_data_filters=meta_data_filters,
+                estimated=count_mode == CountModeEnum.ESTIMATED,
+            ),
+        )
 
     @count_occurrence(label="metric_sets.create_metric_set")
     @measure_processing_time(label="metric_sets.create_metric_set")
@@ -68,6 +162,35 @@ class MetricSetService:
 
         return await self._convert_metadata_out(metric_set=created_metric_set_model)
 
+    @count_occurrence(label="metric_sets.create_metric_sets")
+    @measure_processing_time(label="metric_sets.create_metric_sets")
+    async def create_metric_sets(
+        self,
+        metric_set_models: List[MetricSetModel],
+    ) -> List[MetricSetModel | ValidationError]:
+        results = await self._meta_data_service.convert_many_names_to_ids(
+            entity_type=EntityTypeEnum.METRIC_SET,
+            meta_data_list=[metric_set_model.meta_data or {} for metric_set_model in metric_set_models],
+        )
+
+        valid_metric_set_models = []
+        for index, (metric_set_model, result) in enumerate(zip(metric_set_models, results)):
+            if not isinstance(result, ValidationError):
+                metric_set_model.meta_data = result
+                valid_metric_set_models.append(metric_set_model)
+                results[index] = metric_set_model
+
+        try:
+            await self._dal.create_metric_sets(metric_set_models=valid_metric_set_models)
+        except DatabaseError as ex:
+            raise ServerError(description=ex.description, detail=ex.detail)
+
+        await self._meta_data_service.convert_many_ids_to_names(
+            entity_type=EntityTypeEnum.METRIC_SET, rows=valid_metric_set_models
+        )
+
+        return results
+
     @count_occurrence(label="metric_sets.update_metric_set")
     @measure_processing_time(label="metric_sets.update_metric_set")
     async def update_metric_set(
@@ -76,9 +199,10 @@ class MetricSetService:
         metric_set_update_model: MetricSetUpdateModel,
     ) -> MetricSetModel:
         try:
-            metric_set_update_model.meta_data = await self._convert_metadata_names_to_ids(
-                meta_data=metric_set_update_model.meta_data
-            )
+            if metric_set_update_model.meta_data is not None:
+                metric_set_update_model.meta_data = await self._convert_metadata_names_to_ids(
+                    meta_data=metric_set_update_model.meta_data
+                )
 
             updated_metric_set = await self._dal.update_metric_set(
                 metric_set_id=metric_set_id, metric_set_update_model=metric_set_update_model
@@ -88,6 +212,60 @@ class MetricSetService:
 
         return await self._convert_metadata_out(metric_set=updated_metric_set)
 
+    @count_occurrence(label="metric_sets.update_metric_sets")
+    @measure_processing_time(label="metric_sets.update_metric_sets")
+    async def update_metric_sets(
+        self,
+        metric_set_update_models: List[tuple[uuid.UUID, MetricSetUpdateModel]],
+    ) -> List[MetricSetModel | NotFoundError | ValidationError]:
+        metric_set_ids = [metric_set_id for metric_set_id, _ in metric_set_update_models]
+        if len(set(metric_set_ids)) != len(metric_set_ids):
+            raise ValidationError(
+                description="Every metric_set can only be patched once per request.",
+                detail={"metric_set_ids": metric_set_ids},
+            )
+
+        results: List = [None] * len(metric_set_update_models)
+        with_meta_data = [
+            index
+            for index, (_, update_model) in enumerate(metric_set_update_models)
+            if update_model.meta_data is not None
+        ]
+        converted_meta_data = await self._meta_data_service.convert_many_names_to_ids(
+            entity_type=EntityTypeEnum.METRIC_SET,
+            meta_data_list=[metric_set_update_models[index][1].meta_data for index in with_meta_data],
+        )
+        for index, meta_data in zip(with_meta_data, converted_meta_data):
+            if isinstance(meta_data, ValidationError):
+                results[index] = meta_data
+            else:
+                metric_set_update_models[index][1].meta_data = meta_data
+
+        try:
+            updated_metric_sets = await self._dal.update_metric_sets(
+                metric_set_update_models={
+                    metric_set_id: update_model
+                    for (metric_set_id, update_model), result in zip(metric_set_update_models, results)
+                    if result is None
+                }
+            )
+        except DatabaseError as ex:
+            raise ServerError(description=ex.description, detail=ex.detail)
+
+        await self._meta_data_service.convert_many_ids_to_names(
+            entity_type=EntityTypeEnum.METRIC_SET, rows=updated_metric_sets
+        )
+
+        updated_metric_sets_by_id = {metric_set.id: metric_set for metric_set in updated_metric_sets}
+        for index, metric_set_id in enumerate(metric_set_ids):
+            if results[index] is None:
+                results[index] = updated_metric_sets_by_id.get(metric_set_id) or NotFoundError(
+                    description=f"MetricSetModel with Id '{metric_set_id}' not found.",
+                    detail={"metric_set_id": metric_set_id},
+                )
+
+        return results
+
     @count_occurrence(label="metric_sets.delete_metric_set")
     @measure_processing_time(label="metric_sets.delete_metric_set")
     async def delete_metric_set(
@@ -113,8 +291,6 @@ class MetricSetService:
         )
 
     async def _convert_metadata_names_to_ids(self, meta_data: dict) -> dict:
-        if meta_data is None:
-            return {}
         return await self._meta_data_service.convert_metadata_names_to_ids(
-            entity_type=EntityTypeEnum.METRIC_SET, meta_data=meta_data
+            entity_type=EntityTypeEnum.METRIC_SET, meta_data=meta_data or {}
         )
@@ -3,43 +3,70 @@ from typing import List
 from uuid import UUID
 
 from matter_persistence.sql.exceptions import DatabaseRecordNotFoundError
-from matter_persistence.sql.manager import DatabaseManager
 from matter_persistence.sql.utils import SortMethodModel, commit, find, get
-from sqlalchemy import select
+from sqlalchemy import Select, any_, bindparam, delete, func, insert, literal, null, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import with_expression
 
+from app.common.enums.enums import EntityTypeEnum
+from app.components.events.models.event import EventModel
 from app.components.metrics.models.metric import MetricModel
 from app.components.metrics.models.metric_update import MetricUpdateModel
+from app.components.utils.bulk_update_sql import bulk_update_statement
+from app.components.utils.core_read import find_rows, get_row, plain_columns
+from app.components.utils.count_sql import count
+from app.components.utils.meta_data_sql import meta_data_filter, meta_data_names_expression
+from app.components.utils.pagination import Cursor, chain_filters, is_cursor_sort, keyset_pagination
+from app.components.utils.replicated_database_manager import ReplicatedDatabaseManager
+from app.components.utils.sparse_fields import Fields, load_fields
 
 
 class MetricDAL:
     def __init__(
         self,
-        database_manager: DatabaseManager,
+        database_manager: ReplicatedDatabaseManager,
     ):
         self._database_manager = database_manager
 
     async def get_metric(
         self,
         metric_id: UUID,
+        fields: Fields | None = None,
+        core_read_path: bool = False,
     ) -> MetricModel:
-        statement = select(MetricModel).where(MetricModel.id == metric_id)
+        if core_read_path:
+            statement = select(*plain_columns(MetricModel, fields)).where(MetricModel.id == metric_id)
+        else:
+            statement = select(MetricModel).where(MetricModel.id == metric_id)
+            if fields:
+                statement = load_fields(MetricModel, fields)(statement)
 
-        async with self._database_manager.session() as session:
-            metric_model = await get(
-                session=session,
-                statement=statement,
-            )
+        async with self._database_manager.read_session() as session:
+            if core_read_path:
+                metric_model = await get_row(session=session, statement=statement)
+            else:
+                metric_model = await get(
+                    session=session,
+                    statement=statement,
+                )
 
             if metric_model is None:
-                raise DatabaseRecordNotFoundError(
-                    description=f"MetricModel with Metric Set Id '{metric_id}' not found.",
-                    detail={
-                        "metric_id": metric_id,
-                    },
-                )
+                raise self._not_found_error(metric_id)
 
             return metric_model
 
+    async def get_metrics(
+        self,
+        metric_ids: List[UUID],
+    ) -> List[MetricModel]:
+        statement = select(MetricModel).where(
+            MetricModel.id == any_(bindparam("metric_ids", metric_ids, type_=ARRAY(PG_UUID(as_uuid=True))))
+        )
+
+        async with self._database_manager.read_session() as session:
+            return (await session.execute(statement)).scalars().all()
+
     async def find_metrics(
         self,
         skip: int = 0,
@@ -48,8 +75,45 @@ class MetricDAL:
         sort_method: SortMethodModel = None,
         with_deleted: bool = True,
         filters: dict | None = None,
+        resolve_meta_data_names: bool = False,
+        after: Cursor | None = None,
+        meta_data_filters: dict | None = None,
+        fields: Fields | None = None,
+        core_read_path: bool = False,
     ) -> List[MetricModel]:
-        async with self._database_manager.session() as session:
+        if fields and sort_field and is_cursor_sort(sort_field):
+            # the cursor of the next page is built from the sort field
+            fields = (*fields, sort_field)
+        custom_filter = meta_data_filter(MetricModel, meta_data_filters) if meta_data_filters else None
+        if is_cursor_sort(sort_field):
+            # keyset pagination takes over the ordering, with the id breaking ties
+            custom_filter = chain_filters(custom_filter, keyset_pagination(MetricModel, sort_field, sort_method, after))
+            sort_field = None
+
+        if core_read_path:
+            async with self._database_manager.read_session() as session:
+                return await find_rows(
+                    session=session,
+                    db_model=MetricModel,
+                    skip=skip,
+                    limit=limit,
+                    sort_field=sort_field,
+                    sort_method=sort_method,
+                    with_deleted=with_deleted,
+                    filters=filters,
+                    custom_filter=custom_filter,
+                    fields=fields,
+                    meta_data_names=meta_data_names_expression(MetricModel, EntityTypeEnum.METRIC)
+                    if resolve_meta_data_names
+                    else None,
+                )
+
+        custom_filter = chain_filters(
+            custom_filter,
+            self._with_meta_data_names if resolve_meta_data_names else None,
+            load_fields(MetricModel, fields) if fields else None,
+        )
+        async with self._database_manager.read_session() as session:
             return await find(
                 session=session,
                 db_model=MetricModel,
@@ -59,6 +123,26 @@ class MetricDAL:
                 sort_method=sort_method,
                 with_deleted=with_deleted,
                 filters=filters,
+                custom_filter=custom_filter,
+            )
+
+    async def count_metrics(
+        self,
+        with_deleted: bool = True,
+        filters: dict | None = None,
+        meta_data_filters: dict | None = None,
+        estimated: bool = False,
+    ) -> int:
+        custom_filter = meta_data_filter(MetricModel, meta_data_filters) if meta_data_filters else None
+
+        async with self._database_manager.read_session() as session:
+            return await count(
+                session=session,
+                db_model=MetricModel,
+                with_deleted=with_deleted,
+                filters=filters,
+                custom_filter=custom_filter,
+                estimated=estimated,
             )
 
     async def create_metric(self, metric_model: MetricModel) -> MetricModel:
@@ -68,45 +152,154 @@ class MetricDAL:
 
         return metric_model
 
+    async def create_metrics(self, metric_models: List[MetricModel]) -> List[MetricModel]:
+        async with self._database_manager.session() as session:
+            # the rows are flushed together, as batched multi-row inserts in a single transaction
+            session.add_all(metric_models)
+            await commit(session)
+
+        return metric_models
+
     async def update_metric(
         self,
         metric_id: UUID,
         metric_update_model: MetricUpdateModel,
     ) -> MetricModel:
-        metric_model = await self.get_metric(metric_id)
+        values = {
+            k: v
+            for k, v in metric_update_model.model_dump().items()
+            if k not in ["created", "deleted", "updated"] and hasattr(MetricModel, k) and v is not None
+        }  # deleted is handled by the delete method
+        statement = (
+            update(MetricModel)
+            .where(MetricModel.id == metric_id, MetricModel.deleted.is_(None))
+            .values(**values, updated=datetime.now(tz=timezone.utc))
+            .returning(MetricModel)
+        )
 
         async with self._database_manager.session() as session:
-            metric_model = await session.merge(metric_model)
-            for k, v in metric_update_model.model_dump().items():
-                if k not in [
-                    "created",
-                    "deleted",
-                    "updated",
-                ]:
-                    if hasattr(metric_model, k) and v is not None:
-                        setattr(metric_model, k, v)
-
+            metric_model = (await session.execute(statement)).scalar_one_or_none()
             await commit(session)
 
+        if metric_model is None:
+            raise self._not_found_error(metric_id)
+
         return metric_model
 
+    async def update_metrics(
+        self,
+        metric_update_models: dict[UUID, MetricUpdateModel],
+    ) -> List[MetricModel]:
+        if not metric_update_models:
+            return []
+
+        statement = bulk_update_statement(MetricModel, metric_update_models)
+
+        async with self._database_manager.session() as session:
+            metric_models = (await session.execute(statement)).scalars().all()
+            await commit(session)
+
+        return metric_models
+
+    async def update_metrics_where(
+        self,
+        filters: dict,
+        null_fields: List[str],
+        metric_update_model: MetricUpdateModel,
+        event_model: EventModel,
+        dry_run: bool = False,
+    ) -> List[UUID]:
+        criteria = [
+            MetricModel.deleted.is_(None),
+            *[getattr(MetricModel, k) == v for k, v in filters.items()],
+            *[getattr(MetricModel, k).is_(None) for k in null_fields],
+        ]
+
+        if dry_run:
+            async with self._database_manager.session() as session:
+                return (await session.execute(select(MetricModel.id).where(*criteria))).scalars().all()
+
+        now = datetime.now(tz=timezone.utc)
+        values = {
+            k: v
+            for k, v in metric_update_model.model_dump().items()
+            if k not in ["created", "deleted", "updated"] and hasattr(MetricModel, k) and v is not None
+        }
+        updated_metrics = (
+            update(MetricModel)
+            .where(*criteria)
+            .values(**values, updated=now)
+            .returning(MetricModel.id)
+            .cte("updated_metrics")
+        )
+        # the event of every updated metric is copied from the given one, in the same statement as the update
+        events = EventModel.__table__.c
+        statement = (
+            insert(EventModel)
+            .from_select(
+                ["id", "created", "updated", "event_type", "entity_type", "node_id", "user_id", "new_data"],
+                select(
+                    func.gen_random_uuid(),
+                    literal(now, events.created.type),
+                    literal(now, events.updated.type),
+                    literal(event_model.event_type, events.event_type.type),
+                    literal(event_model.entity_type, events.entity_type.type),
+                    updated_metrics.c.id,
+                    literal(event_model.user_id, events.user_id.type),
+                    literal(event_model.new_data, events.new_data.type) if event_model.new_data is not None else null(),
+                ),
+            )
+            .returning(EventModel.node_id)
+        )
+
+        async with self._database_manager.session() as session:
+            metric_ids = (await session.execute(statement)).scalars().all()
+            await commit(session)
+
+        return metric_ids
+
     async def delete_metric(
         self,
         metric_id: UUID,
         soft_delete: bool = True,
     ) -> MetricModel:
-        metric_model = await self.get_metric(metric_id)
+        deleted = datetime.now(tz=timezone.utc)
+        if soft_delete:
+            statement = (
+                update(MetricModel)
+                .where(MetricModel.id == metric_id, MetricModel.deleted.is_(None))
+                .values(deleted=deleted, updated=deleted)
+                .returning(MetricModel)
+            )
+        else:
+            statement = delete(MetricModel).where(MetricModel.id == metric_id).returning(MetricModel)
 
         async with self._database_manager.session() as session:
-            metric_model = await session.merge(metric_model)
-            if soft_delete:
-                metric_model.deleted = datetime.now(tz=timezone.utc)
-            else:
-                await session.delete(metric_model)
-
+            metric_model = (await session.execute(statement)).scalar_one_or_none()
             await commit(session)
 
-            if metric_model.deleted is None:
-                metric_model.deleted = datetime.now(tz=timezone.utc)
+        if metric_model is None:
+            raise self._not_found_error(metric_id)
+
+        if metric_model.deleted is None:
+            metric_model.deleted = deleted
 
         return metric_model
+
+    @staticmethod
+    def _with_meta_data_names(statement: Select) -> Select:
+        return statement.options(
+            with_expression(
+                MetricModel.meta_data_names,
+                meta_data_names_expression(MetricModel, EntityTypeEnum.METRIC),
+            )
+        )
+
+    @staticmethod
+    def _not_found_error(metric_id: UUID) -> DatabaseRecordNotFoundError:
+        return DatabaseRecordNotFoundError(
+            description=f"MetricModel with Metric Set Id '{metric_id}' not found.",
+            detail={
+                "metric_id": metric_id,
+            },
+        )
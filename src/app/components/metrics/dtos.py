@@ -3,7 +3,7 @@ from datetime import datetime, timezone
 from typing import List
 
 from matter_persistence.foundation_model import FoundationModel
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from app.common.enums.enums import StatusEnum
 
@@ -32,6 +32,30 @@ class MetricUpdateInDTO(MetricInDTO):
     meta_data: dict | None = Field(None, alias="metaData")
 
 
+class MetricSearchInDTO(MetricUpdateInDTO):
+    meta_data_filters: dict | None = Field(None, alias="metaDataFilters")
+
+
+class MetricPatchInDTO(BaseModel):
+    id: uuid.UUID = Field(..., alias="id")
+    changes: MetricUpdateInDTO = Field(..., alias="changes")
+
+
+class MetricMassUpdateInDTO(BaseModel):
+    filters: MetricUpdateInDTO = Field(..., alias="filters")
+    null_filters: List[str] = Field([], alias="nullFilters")
+    changes: MetricUpdateInDTO = Field(..., alias="changes")
+
+    @field_validator("null_filters")
+    def validate_null_filters(cls, value):
+        # the null filters name the fields like the filters do, so they are given as aliases
+        field_names = {field.alias: name for name, field in MetricUpdateInDTO.model_fields.items()}
+        invalid_fields = [alias for alias in value if alias not in field_names]
+        if invalid_fields:
+            raise ValueError(f"Null filters must be metric fields, got: {invalid_fields}.")
+        return [field_names[alias] for alias in value]
+
+
 class MetricOutDTO(FoundationModel):
     id: uuid.UUID
 
@@ -54,4 +78,18 @@ class MetricDeletionOutDTO(MetricOutDTO):
 
 class MetricListOutDTO(FoundationModel):
     count: int
+    total: int | None = Field(None, description="Total number of matching items, given with a count_mode")
+    next_cursor: str | None = Field(None, alias="nextCursor")
     metrics: List[FullMetricOutDTO]
+
+
+class MetricBatchOutDTO(FoundationModel):
+    count: int
+    metrics: List[FullMetricOutDTO]
+    missing_ids: List[uuid.UUID] = Field(..., alias="missingIds")
+
+
+class MetricMassUpdateOutDTO(FoundationModel):
+    count: int
+    ids: List[uuid.UUID]
+    dry_run: bool = Field(..., alias="dryRun")
@@ -1,7 +1,7 @@
 from matter_persistence.sql.base import CustomBase
 from sqlalchemy import UUID, Column, Enum, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import query_expression, relationship
 
 from app.common.enums.enums import StatusEnum
 
@@ -19,6 +19,7 @@ class MetricModel(CustomBase):
     name = Column(String(100), nullable=False)
     name_suffix = Column(String(50), nullable=True)
     meta_data = Column(JSONB, nullable=True)
+    meta_data_names = query_expression()  # meta_data keyed by property name, loaded only on request
 
     metric_set = relationship("MetricSetModel", back_populates="metrics")
     parent_section = relationship("MetricSetTreeModel", back_populates="metrics")
@@ -27,4 +28,9 @@ class MetricModel(CustomBase):
     )
     data_metric = relationship("DataMetricModel", back_populates="metrics")
 
-    __table_args__ = (Index("ix_metric_metric_set_id_status", "metric_set_id", "status"),)
+    __table_args__ = (
+        Index("ix_metric_metric_set_id_status", "metric_set_id", "status"),
+        Index(
+            "ix_metrics_meta_data", "meta_data", postgresql_using="gin", postgresql_ops={"meta_data": "jsonb_path_ops"}
+        ),
+    )
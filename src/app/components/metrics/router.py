@@ -1,5 +1,7 @@
+import asyncio
 import uuid
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, List
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, status
 from fastapi.responses import JSONResponse
@@ -8,20 +10,30 @@ from pydantic_core import from_json
 
 from app.auth import jwt_authorizer
 from app.auth.models import AuthorizedClient
-from app.common.enums.enums import EntityTypeEnum, EventTypeEnum
+from app.common.enums.enums import CountModeEnum, EntityTypeEnum, EventTypeEnum
+from app.components.events.dtos import EventListOutDTO
+from app.components.events.history import history_response
 from app.components.events.models.event import EventModel
 from app.components.events.service import EventService
 from app.components.metrics.dtos import (
     FullMetricOutDTO,
+    MetricBatchOutDTO,
     MetricDeletionOutDTO,
     MetricInDTO,
     MetricListOutDTO,
+    MetricMassUpdateInDTO,
+    MetricMassUpdateOutDTO,
     MetricOutDTO,
+    MetricPatchInDTO,
+    MetricSearchInDTO,
     MetricUpdateInDTO,
 )
 from app.components.metrics.models.metric import MetricModel
 from app.components.metrics.models.metric_update import MetricUpdateModel
 from app.components.metrics.service import MetricService
+from app.components.utils.dtos import BatchGetInDTO, BulkItemOutDTO, BulkOutDTO
+from app.components.utils.pagination import next_cursor
+from app.components.utils.sparse_fields import parse_fields, sparse_dto, sparse_list_dto, sparse_response
 from app.dependencies import Dependencies
 from app.env import SETTINGS
 
@@ -34,6 +46,7 @@ authorizer = jwt_authorizer
     status_code=status.HTTP_201_CREATED,
     response_model=MetricOutDTO,
     response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
 )
 async def create_metric(
     metric_in_dto: MetricInDTO,
@@ -65,6 +78,80 @@ async def create_metric(
     return response_dto
 
 
+@metric_router.post(
+    "/bulk",
+    status_code=status.HTTP_201_CREATED,
+    response_model=BulkOutDTO,
+    response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
+)
+async def create_metrics(
+    metric_in_dtos: Annotated[List[MetricInDTO], Body(max_length=SETTINGS.bulk_max_items)],
+    metric_service: MetricService = Depends(Dependencies.metric_service),
+    event_service: EventService = Depends(Dependencies.event_service),
+    client: AuthorizedClient = Depends(authorizer),
+):
+    if not client.is_super_user():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    """
+    Creates the given metrics in one transaction, skipping the ones with invalid metadata.
+    """
+    results = await metric_service.create_metrics(
+        metric_models=[MetricModel.parse_obj(metric_in_dto) for metric_in_dto in metric_in_dtos],
+    )
+    created = [
+        (metric_in_dto, result)
+        for metric_in_dto, result in zip(metric_in_dtos, results)
+        if isinstance(result, MetricModel)
+    ]
+    response_dto = BulkOutDTO(
+        count=len(created),
+        items=BulkItemOutDTO.parse_results(results),
+    )
+
+    await event_service.create_events(
+        [
+            EventModel(
+                event_type=EventTypeEnum.CREATED,
+                entity_type=EntityTypeEnum.METRIC,
+                node_id=created_metric_model.id,
+                user_id=client.user_id,
+                new_data=from_json(metric_in_dto.model_dump_json()),
+            )
+            for metric_in_dto, created_metric_model in created
+        ]
+    )
+
+    return response_dto
+
+
+@metric_router.post(
+    "/batch-get",
+    status_code=status.HTTP_200_OK,
+    response_model=MetricBatchOutDTO,
+    response_class=JSONResponse,
+)
+async def get_metrics(
+    batch_get_in_dto: BatchGetInDTO,
+    metric_service: MetricService = Depends(Dependencies.metric_service),
+    client: AuthorizedClient = Depends(authorizer),
+):
+    if not client.is_super_user():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    """
+    Fetches the details of the metrics with the given ids, in the order of the ids.
+    """
+    metric_models = await metric_service.get_metrics(metric_ids=batch_get_in_dto.ids)
+    found_ids = {metric_model.id for metric_model in metric_models}
+    response_dto = MetricBatchOutDTO(
+        count=len(metric_models),
+        metrics=FullMetricOutDTO.parse_obj(metric_models),
+        missing_ids=[metric_id for metric_id in dict.fromkeys(batch_get_in_dto.ids) if metric_id not in found_ids],
+    )
+
+    return response_dto
+
+
 @metric_router.get(
     "/{target_metric_id}",
     status_code=status.HTTP_200_OK,
@@ -73,6 +160,9 @@ async def create_metric(
 )
 async def get_metric(
     target_metric_id: Annotated[uuid.UUID, Path(title="The ID of the metric to retrieve")],
+    fields: str | None = Query(
+        None, description="Comma separated fields to return, like id,name,status. All the fields by default"
+    ),
     metric_service: MetricService = Depends(Dependencies.metric_service),
     client: AuthorizedClient = Depends(authorizer),
 ):
@@ -81,10 +171,47 @@ async def get_metric(
     """
     Fetches the details of a metric.
     """
-    metric_model = await metric_service.get_metric(metric_id=target_metric_id)
-    response_dto = FullMetricOutDTO.parse_obj(metric_model)
+    field_names = parse_fields(fields, FullMetricOutDTO)
+    metric_model = await metric_service.get_metric(metric_id=target_metric_id, fields=field_names)
+    response_dto = sparse_dto(FullMetricOutDTO, field_names).parse_obj(metric_model)
 
-    return response_dto
+    return sparse_response(response_dto, field_names)
+
+
+@metric_router.get(
+    "/{target_metric_id}/history",
+    status_code=status.HTTP_200_OK,
+    response_model=EventListOutDTO,
+    response_class=JSONResponse,
+)
+async def get_metric_history(
+    target_metric_id: Annotated[uuid.UUID, Path(title="The ID of the metric to retrieve the history of")],
+    cursor: str | None = Query(None, description="Cursor of the page to retrieve, as returned in nextCursor"),
+    limit: int = Query(
+        SETTINGS.pagination_limit_default,
+        ge=0,
+        le=SETTINGS.pagination_limit_max,
+        description="Number of items to retrieve",
+    ),
+    created_from: datetime | None = Query(None, description="Events created at or after it"),
+    created_to: datetime | None = Query(None, description="Events created before it"),
+    event_service: EventService = Depends(Dependencies.event_service),
+    client: AuthorizedClient = Depends(authorizer),
+):
+    if not client.is_super_user():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    """
+    Returns the events of a metric, newest first.
+    """
+    return await history_response(
+        event_service,
+        entity_type=EntityTypeEnum.METRIC,
+        node_id=target_metric_id,
+        cursor=cursor,
+        limit=limit,
+        created_from=created_from,
+        created_to=created_to,
+    )
 
 
 @metric_router.put(
@@ -92,6 +219,7 @@ async def get_metric(
     status_code=status.HTTP_200_OK,
     response_model=MetricOutDTO,
     response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
 )
 async def update_metric(
     target_metric_id: Annotated[uuid.UUID, Path(title="The ID of the metric to update")],
@@ -125,11 +253,105 @@ async def update_metric(
     return response_dto
 
 
+@metric_router.patch(
+    "/bulk",
+    status_code=status.HTTP_200_OK,
+    response_model=BulkOutDTO,
+    response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
+)
+async def update_metrics(
+    metric_patch_in_dtos: Annotated[List[MetricPatchInDTO], Body(max_length=SETTINGS.bulk_max_items)],
+    metric_service: MetricService = Depends(Dependencies.metric_service),
+    event_service: EventService = Depends(Dependencies.event_service),
+    client: AuthorizedClient = Depends(authorizer),
+):
+    if not client.is_super_user():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    """
+    Applies the given changes to every metric in one statement, skipping the ones with invalid metadata.
+    """
+    results = await metric_service.update_metrics(
+        metric_update_models=[
+            (
+                metric_patch_in_dto.id,
+                MetricUpdateModel.model_validate(metric_patch_in_dto.changes.model_dump(exclude_none=True)),
+            )
+            for metric_patch_in_dto in metric_patch_in_dtos
+        ],
+    )
+    updated = [
+        (metric_patch_in_dto, result)
+        for metric_patch_in_dto, result in zip(metric_patch_in_dtos, results)
+        if isinstance(result, MetricModel)
+    ]
+    response_dto = BulkOutDTO(
+        count=len(updated),
+        items=BulkItemOutDTO.parse_results(results),
+    )
+
+    await event_service.create_events(
+        [
+            EventModel(
+                event_type=EventTypeEnum.UPDATED,
+                entity_type=EntityTypeEnum.METRIC,
+                node_id=updated_metric_model.id,
+                user_id=client.user_id,
+                new_data=from_json(metric_patch_in_dto.changes.model_dump_json(exclude_none=True)),
+            )
+            for metric_patch_in_dto, updated_metric_model in updated
+        ]
+    )
+
+    return response_dto
+
+
+@metric_router.patch(
+    "/where",
+    status_code=status.HTTP_200_OK,
+    response_model=MetricMassUpdateOutDTO,
+    response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
+)
+async def update_metrics_where(
+    metric_mass_update_in_dto: MetricMassUpdateInDTO,
+    dry_run: bool = Query(False, description="Only return the metrics that would be updated"),
+    metric_service: MetricService = Depends(Dependencies.metric_service),
+    client: AuthorizedClient = Depends(authorizer),
+):
+    if not client.is_super_user():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    """
+    Applies the given changes to every metric matching the filters, in one statement together with its events.
+    """
+    changes = metric_mass_update_in_dto.changes
+    metric_ids = await metric_service.update_metrics_where(
+        filters=metric_mass_update_in_dto.filters.model_dump(exclude_none=True),
+        null_fields=metric_mass_update_in_dto.null_filters,
+        metric_update_model=MetricUpdateModel.model_validate(changes.model_dump(exclude_none=True)),
+        event_model=EventModel(
+            event_type=EventTypeEnum.UPDATED,
+            entity_type=EntityTypeEnum.METRIC,
+            user_id=client.user_id,
+            new_data=from_json(changes.model_dump_json(exclude_none=True)),
+        ),
+        dry_run=dry_run,
+    )
+    response_dto = MetricMassUpdateOutDTO(
+        count=len(metric_ids),
+        ids=metric_ids,
+        dry_run=dry_run,
+    )
+
+    return response_dto
+
+
 @metric_router.delete(
     "/{target_metric_id}",
     status_code=status.HTTP_200_OK,
     response_model=MetricDeletionOutDTO,
     response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
 )
 async def delete_metric(
     target_metric_id: Annotated[uuid.UUID, Path(title="The ID of the metric to delete")],
@@ -165,6 +387,7 @@ async def delete_metric(
 )
 async def find_metrics(
     skip: int = Query(0, ge=0, description="Number of items to skip"),
+    cursor: str | None = Query(None, description="Cursor of the page to retrieve, as returned in nextCursor"),
     limit: int = Query(
         SETTINGS.pagination_limit_default,
         ge=0,
@@ -175,8 +398,15 @@ async def find_metrics(
     sort_method: SortMethodModel = Query(
         SortMethodModel.ASC, title="Sort method", description="Sort method: asc or desc"
     ),
-    filters: MetricUpdateInDTO | None = Body(None, description="Field to filter"),
+    filters: MetricSearchInDTO | None = Body(None, description="Fields and metadata to filter"),
     with_deleted: bool | None = Query(False, description="Include deleted metrics"),
+    count_mode: CountModeEnum = Query(
+        CountModeEnum.NONE,
+        description="Total to return: none, exact (counted) or estimated (from the planner statistics)",
+    ),
+    fields: str | None = Query(
+        None, description="Comma separated fields to return, like id,name,status. All the fields by default"
+    ),
     metric_service: MetricService = Depends(Dependencies.metric_service),
     client: AuthorizedClient = Depends(authorizer),
 ):
@@ -185,19 +415,35 @@ async def find_metrics(
     """
     Return a list of metrics, based on given parameters.
     """
+    field_names = parse_fields(fields, FullMetricOutDTO)
+    meta_data_filters = None
     if filters:
-        filters = filters.model_dump(exclude_none=True)
-    metrics = await metric_service.find_metrics(
-        skip=skip,
-        limit=limit,
-        sort_field=sort_field,
-        sort_method=sort_method,
-        with_deleted=with_deleted,
-        filters=filters,
+        meta_data_filters = filters.meta_data_filters
+        filters = filters.model_dump(exclude_none=True, exclude={"meta_data_filters"})
+    metrics, total = await asyncio.gather(
+        metric_service.find_metrics(
+            skip=skip,
+            cursor=cursor,
+            limit=limit,
+            sort_field=sort_field,
+            sort_method=sort_method,
+            with_deleted=with_deleted,
+            filters=filters,
+            meta_data_filters=meta_data_filters,
+            fields=field_names,
+        ),
+        metric_service.count_metrics(
+            count_mode=count_mode,
+            with_deleted=with_deleted,
+            filters=filters,
+            meta_data_filters=meta_data_filters,
+        ),
     )
-    response_dto = MetricListOutDTO(
+    response_dto = sparse_list_dto(MetricListOutDTO, "metrics", FullMetricOutDTO, field_names)(
         count=len(metrics),
-        metrics=FullMetricOutDTO.parse_obj(metrics),
+        total=total,
+        next_cursor=next_cursor(metrics, sort_field, limit),
+        metrics=sparse_dto(FullMetricOutDTO, field_names).parse_obj(metrics),
     )
 
-    return response_dto
+    return sparse_response(response_dto, field_names)
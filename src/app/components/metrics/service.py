@@ -1,8 +1,7 @@
-import asyncio
 import uuid
 from typing import List
 
-from matter_exceptions.exceptions.fastapi import ServerError
+from matter_exceptions.exceptions.fastapi import NotFoundError, ServerError, ValidationError
 from matter_observability.metrics import (
     count_occurrence,
     measure_processing_time,
@@ -10,27 +9,54 @@ from matter_observability.metrics import (
 from matter_persistence.sql.exceptions import DatabaseError
 from matter_persistence.sql.utils import SortMethodModel
 
-from app.common.enums.enums import EntityTypeEnum
+from app.common.enums.enums import CountModeEnum, EntityTypeEnum
+from app.components.events.models.event import EventModel
 from app.components.metrics.dal import MetricDAL
 from app.components.metrics.models.metric import MetricModel
 from app.components.metrics.models.metric_update import MetricUpdateModel
+from app.components.utils.core_read import is_core_read_path
+from app.components.utils.count_cache import CountCache
 from app.components.utils.meta_data_service import MetaDataService
+from app.components.utils.pagination import decode_cursor
+from app.components.utils.sparse_fields import Fields
 
 
 class MetricService:
     def __init__(self, dal: MetricDAL, meta_data_service: MetaDataService):
         self._dal = dal
         self._meta_data_service = meta_data_service
+        self._count_cache = CountCache()
 
     @count_occurrence(label="metrics.get_metric")
     @measure_processing_time(label="metrics.get_metric")
     async def get_metric(
         self,
         metric_id: uuid.UUID,
+        fields: Fields | None = None,
+        core_read_path: bool | None = None,
     ) -> MetricModel:
-        metric = await self._dal.get_metric(metric_id=metric_id)
+        if core_read_path is None:
+            core_read_path = is_core_read_path(entity_type=EntityTypeEnum.METRIC)
+
+        metric = await self._dal.get_metric(metric_id=metric_id, fields=fields, core_read_path=core_read_path)
+        if fields is not None and "meta_data" not in fields:
+            return metric
+
         return await self._convert_metadata_out(metric=metric)
 
+    @count_occurrence(label="metrics.get_metrics")
+    @measure_processing_time(label="metrics.get_metrics")
+    async def get_metrics(
+        self,
+        metric_ids: List[uuid.UUID],
+    ) -> List[MetricModel]:
+        metrics = await self._dal.get_metrics(metric_ids=list(dict.fromkeys(metric_ids)))
+        await self._meta_data_service.convert_many_ids_to_names(entity_type=EntityTypeEnum.METRIC, rows=metrics)
+
+        # rows come back in the order of the requested ids, missing ids are left out
+        metrics_by_id = {metric.id: metric for metric in metrics}
+        return [metrics_by_id[metric_id] for metric_id in dict.fromkeys(metric_ids) if metric_id in metrics_by_id]
+
     @count_occurrence(label="metrics.find_metrics")
     @measure_processing_time(label="metrics.find_metrics")
     async def find_metrics(
@@ -41,7 +67,25 @@ class MetricService:
         sort_method: SortMethodModel | None = None,
         with_deleted: bool = False,
         filters: dict | None = None,
+        cursor: str | None = None,
+        resolve_meta_data_in_sql: bool | None = None,
+        meta_data_filters: dict | None = None,
+        fields: Fields | None = None,
+        core_read_path: bool | None = None,
     ) -> List[MetricModel]:
+        after = decode_cursor(cursor, sort_field) if cursor else None
+        if meta_data_filters:
+            meta_data_filters = await self._meta_data_service.convert_filter_names_to_ids(
+                entity_type=EntityTypeEnum.METRIC, meta_data_filters=meta_data_filters
+            )
+
+        # without metaData in the fields, the metadata is neither loaded nor converted
+        resolves_meta_data = fields is None or "meta_data" in fields
+        if resolve_meta_data_in_sql is None:
+            resolve_meta_data_in_sql = self._meta_data_service.is_resolved_in_sql(entity_type=EntityTypeEnum.METRIC)
+        if core_read_path is None:
+            core_read_path = is_core_read_path(entity_type=EntityTypeEnum.METRIC)
+
         metrics = await self._dal.find_metrics(
             skip=skip,
             limit=limit,
@@ -49,9 +93,52 @@ class MetricService:
             sort_method=sort_method,
             with_deleted=with_deleted,
             filters=filters,
+            resolve_meta_data_names=resolves_meta_data and resolve_meta_data_in_sql,
+            after=after,
+            meta_data_filters=meta_data_filters,
+            fields=fields,
+            core_read_path=core_read_path,
         )
 
-        return await asyncio.gather(*[self._convert_metadata_out(metric) for metric in metrics])
+        if not resolves_meta_data:
+            return metrics
+
+        if resolve_meta_data_in_sql:
+            return self._meta_data_service.take_names_resolved_in_sql(rows=metrics)
+
+        return await self._meta_data_service.convert_many_ids_to_names(entity_type=EntityTypeEnum.METRIC, rows=metrics)
+
+    @count_occurrence(label="metrics.count_metrics")
+    @measure_processing_time(label="metrics.count_metrics")
+    async def count_metrics(
+        self,
+        count_mode: CountModeEnum = CountModeEnum.NONE,
+        with_deleted: bool = False,
+        filters: dict | None = None,
+        meta_data_filters: dict | None = None,
+    ) -> int | None:
+        if count_mode == CountModeEnum.NONE:
+            return None
+
+        if meta_data_filters:
+            meta_data_filters = await self._meta_data_service.convert_filter_names_to_ids(
+                entity_type=EntityTypeEnum.METRIC, meta_data_filters=meta_data_filters
+            )
+
+        return await self._count_cache.get_or_count(
+            key={
+                "count_mode": count_mode,
+                "with_deleted": with_deleted,
+                "filters": filters,
+                "meta_data_filters": meta_data_filters,
+            },
+            count=lambda: self._dal.count_metrics(
+                with_deleted=with_deleted,
+                filters=filters,
+                meta_data_filters=meta_data_filters,
+                estimated=count_mode == CountModeEnum.ESTIMATED,
+            ),
+        )
 
     @count_occurrence(label="metrics.create_metric")
     @measure_processing_time(label="metrics.create_metric")
@@ -68,6 +155,35 @@ class MetricService:
 
         return await self._convert_metadata_out(metric=created_metric_model)
 
+    @count_occurrence(label="metrics.create_metrics")
+    @measure_processing_time(label="metrics.create_metrics")
+    async def create_metrics(
+        self,
+        metric_models: List[MetricModel],
+    ) -> List[MetricModel | ValidationError]:
+        results = await self._meta_data_service.convert_many_names_to_ids(
+            entity_type=EntityTypeEnum.METRIC,
+            meta_data_list=[metric_model.meta_data or {} for metric_model in metric_models],
+        )
+
+        valid_metric_models = []
+        for index, (metric_model, result) in enumerate(zip(metric_models, results)):
+            if not isinstance(result, ValidationError):
+                metric_model.meta_data = result
+                valid_metric_models.append(metric_model)
+                results[index] = metric_model
+
+        try:
+            await self._dal.create_metrics(metric_models=valid_metric_models)
+        except DatabaseError as ex:
+            raise ServerError(description=ex.description, detail=ex.detail)
+
+        await self._meta_data_service.convert_many_ids_to_names(
+            entity_type=EntityTypeEnum.METRIC, rows=valid_metric_models
+        )
+
+        return results
+
     @count_occurrence(label="metrics.update_metric")
     @measure_processing_time(label="metrics.update_metric")
     async def update_metric(
@@ -76,15 +192,105 @@ class MetricService:
         metric_update_model: MetricUpdateModel,
     ) -> MetricModel:
         try:
-            metric_update_model.meta_data = await self._convert_metadata_names_to_ids(
-                meta_data=metric_update_model.meta_data
-            )
+            if metric_update_model.meta_data is not None:
+                metric_update_model.meta_data = await self._convert_metadata_names_to_ids(
+                    meta_data=metric_update_model.meta_data
+                )
 
             updated_metric = await self._dal.update_metric(metric_id=metric_id, metric_update_model=metric_update_model)
         except DatabaseError as ex:
             raise ServerError(description=ex.description, detail=ex.detail)
         return await self._convert_metadata_out(metric=updated_metric)
 
+    @count_occurrence(label="metrics.update_metrics")
+    @measure_processing_time(label="metrics.update_metrics")
+    async def update_metrics(
+        self,
+        metric_update_models: List[tuple[uuid.UUID, MetricUpdateModel]],
+    ) -> List[MetricModel | NotFoundError | ValidationError]:
+        metric_ids = [metric_id for metric_id, _ in metric_update_models]
+        if len(set(metric_ids)) != len(metric_ids):
+            raise ValidationError(
+                description="Every metric can only be patched once per request.",
+                detail={"metric_ids": metric_ids},
+            )
+
+        results: List = [None] * len(metric_update_models)
+        with_meta_data = [
+            index for index, (_, update_model) in enumerate(metric_update_models) if update_model.meta_data is not None
+        ]
+        converted_meta_data = await self._meta_data_service.convert_many_names_to_ids(
+            entity_type=EntityTypeEnum.METRIC,
+            meta_data_list=[metric_update_models[index][1].meta_data for index in with_meta_data],
+        )
+        for index, meta_data in zip(with_meta_data, converted_meta_data):
+            if isinstance(meta_data, ValidationError):
+                results[index] = meta_data
+            else:
+                metric_update_models[index][1].meta_data = meta_data
+
+        try:
+            updated_metrics = await self._dal.update_metrics(
+                metric_update_models={
+                    metric_id: update_model
+                    for (metric_id, update_model), result in zip(metric_update_models, results)
+                    if result is None
+                }
+            )
+        except DatabaseError as ex:
+            raise ServerError(description=ex.description, detail=ex.detail)
+
+        await self._meta_data_service.convert_many_ids_to_names(entity_type=EntityTypeEnum.METRIC, rows=updated_metrics)
+
+        updated_metrics_by_id = {metric.id: metric for metric in updated_metrics}
+        for index, metric_id in enumerate(metric_ids):
+            if results[index] is None:
+                results[index] = updated_metrics_by_id.get(metric_id) or NotFoundError(
+                    description=f"MetricModel with Id '{metric_id}' not found.",
+                    detail={"metric_id": metric_id},
+                )
+
+        return results
+
+    @count_occurrence(label="metrics.update_metrics_where")
+    @measure_processing_time(label="metrics.update_metrics_where")
+    async def update_metrics_where(
+        self,
+        filters: dict,
+        metric_update_model: MetricUpdateModel,
+        event_model: EventModel,
+        null_fields: List[str] | None = None,
+        dry_run: bool = False,
+    ) -> List[uuid.UUID]:
+        null_fields = null_fields or []
+        if not filters and not null_fields:
+            raise ValidationError(
+                description="Cannot update metrics without filters.",
+                detail={"filters": filters, "null_fields": null_fields},
+            )
+        # without changes, the matching metrics would only get a new updated timestamp and an empty UPDATE event each
+        if not metric_update_model.model_dump(exclude_none=True):
+            raise ValidationError(
+                description="Cannot update metrics without changes.",
+                detail={"filters": filters, "null_fields": null_fields},
+            )
+
+        try:
+            if metric_update_model.meta_data is not None:
+                metric_update_model.meta_data = await self._convert_metadata_names_to_ids(
+                    meta_data=metric_update_model.meta_data
+                )
+
+            return await self._dal.update_metrics_where(
+                filters=filters,
+                null_fields=null_fields,
+                metric_update_model=metric_update_model,
+                event_model=event_model,
+                dry_run=dry_run,
+            )
+        except DatabaseError as ex:
+            raise ServerError(description=ex.description, detail=ex.detail)
+
     @count_occurrence(label="metrics.delete_metric")
     @measure_processing_time(label="metrics.delete_metric")
     async def delete_metric(
@@ -109,9 +315,6 @@ class MetricService:
         )
 
     async def _convert_metadata_names_to_ids(self, meta_data: dict) -> dict:
-        if meta_data is None:
-            return {}
-
         return await self._meta_data_service.convert_metadata_names_to_ids(
-            entity_type=EntityTypeEnum.METRIC, meta_data=meta_data
+            entity_type=EntityTypeEnum.METRIC, meta_data=meta_data or {}
         )
@@ -3,18 +3,20 @@ from typing import List
 from uuid import UUID
 
 from matter_persistence.sql.exceptions import DatabaseRecordNotFoundError
-from matter_persistence.sql.manager import DatabaseManager
 from matter_persistence.sql.utils import SortMethodModel, commit, find, get
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 
 from app.components.properties.models.property import PropertyModel
 from app.components.properties.models.property_update import PropertyUpdateModel
+from app.components.utils.count_sql import count
+from app.components.utils.pagination import Cursor, chain_filters, is_cursor_sort, keyset_pagination
+from app.components.utils.replicated_database_manager import ReplicatedDatabaseManager
 
 
 class PropertyDAL:
     def __init__(
         self,
-        database_manager: DatabaseManager,
+        database_manager: ReplicatedDatabaseManager,
     ):
         self._database_manager = database_manager
 
@@ -24,19 +26,14 @@ class PropertyDAL:
     ) -> PropertyModel:
         statement = select(PropertyModel).where(PropertyModel.id == property_id)
 
-        async with self._database_manager.session() as session:
+        async with self._database_manager.primary_session() as session:
             property_model = await get(
                 session=session,
                 statement=statement,
             )
 
             if property_model is None:
-                raise DatabaseRecordNotFoundError(
-                    description=f"PropertyModel with Property Id '{property_id}' not found.",
-                    detail={
-                        "property_id": property_id,
-                    },
-                )
+                raise self._not_found_error(property_id)
 
             return property_model
 
@@ -48,8 +45,17 @@ class PropertyDAL:
         sort_method: SortMethodModel = None,
         with_deleted: bool = True,
         filters: dict | None = None,
+        after: Cursor | None = None,
     ) -> List[PropertyModel]:
-        async with self._database_manager.session() as session:
+        custom_filter = None
+        if is_cursor_sort(sort_field):
+            # keyset pagination takes over the ordering, with the id breaking ties
+            custom_filter = chain_filters(
+                custom_filter, keyset_pagination(PropertyModel, sort_field, sort_method, after)
+            )
+            sort_field = None
+
+        async with self._database_manager.primary_session() as session:
             return await find(
                 session=session,
                 db_model=PropertyModel,
@@ -59,6 +65,22 @@ class PropertyDAL:
                 sort_method=sort_method,
                 with_deleted=with_deleted,
                 filters=filters,
+                custom_filter=custom_filter,
+            )
+
+    async def count_properties(
+        self,
+        with_deleted: bool = True,
+        filters: dict | None = None,
+        estimated: bool = False,
+    ) -> int:
+        async with self._database_manager.primary_session() as session:
+            return await count(
+                session=session,
+                db_model=PropertyModel,
+                with_deleted=with_deleted,
+                filters=filters,
+                estimated=estimated,
             )
 
     async def create_property(self, property_model: PropertyModel) -> PropertyModel:
@@ -73,21 +95,25 @@ class PropertyDAL:
         property_id: UUID,
         property_update_model: PropertyUpdateModel,
     ) -> PropertyModel:
-        property_model = await self.get_property(property_id)
+        values = {
+            k: v
+            for k, v in property_update_model.model_dump().items()
+            if k not in ["created", "deleted", "updated"] and hasattr(PropertyModel, k) and v is not None
+        }  # deleted is handled by the delete method
+        statement = (
+            update(PropertyModel)
+            .where(PropertyModel.id == property_id, PropertyModel.deleted.is_(None))
+            .values(**values, updated=datetime.now(tz=timezone.utc))
+            .returning(PropertyModel)
+        )
 
         async with self._database_manager.session() as session:
-            property_model = await session.merge(property_model)
-            for k, v in property_update_model.model_dump().items():
-                if k not in [
-                    "created",
-                    "deleted",
-                    "updated",
-                ]:  # updated & created are handled by sqlalchemy; deleted is handled by user
-                    if hasattr(property_model, k) and v is not None:
-                        setattr(property_model, k, v)
-
+            property_model = (await session.execute(statement)).scalar_one_or_none()
             await commit(session)
 
+        if property_model is None:
+            raise self._not_found_error(property_id)
+
         return property_model
 
     async def delete_property(
@@ -95,18 +121,34 @@ class PropertyDAL:
         property_id: UUID,
         soft_delete: bool = True,
     ) -> PropertyModel:
-        property_model = await self.get_property(property_id)
+        deleted = datetime.now(tz=timezone.utc)
+        if soft_delete:
+            statement = (
+                update(PropertyModel)
+                .where(PropertyModel.id == property_id, PropertyModel.deleted.is_(None))
+                .values(deleted=deleted, updated=deleted)
+                .returning(PropertyModel)
+            )
+        else:
+            statement = delete(PropertyModel).where(PropertyModel.id == property_id).returning(PropertyModel)
 
         async with self._database_manager.session() as session:
-            property_model = await session.merge(property_model)
-            if soft_delete:
-                property_model.deleted = datetime.now(tz=timezone.utc)
-            else:
-                await session.delete(property_model)
-
+            property_model = (await session.execute(statement)).scalar_one_or_none()
             await commit(session)
 
-            if property_model.deleted is None:
-                property_model.deleted = datetime.now(tz=timezone.utc)
+        if property_model is None:
+            raise self._not_found_error(property_id)
+
+        if property_model.deleted is None:
+            property_model.deleted = deleted
 
         return property_model
+
+    @staticmethod
+    def _not_found_error(property_id: UUID) -> DatabaseRecordNotFoundError:
+        return DatabaseRecordNotFoundError(
+            description=f"PropertyModel with Property Id '{property_id}' not found.",
+            detail={
+                "property_id": property_id,
+            },
+        )
@@ -70,4 +70,6 @@ class PropertyDeletionOutDTO(PropertyOutDTO):
 
 class PropertyListOutDTO(FoundationModel):
     count: int
+    total: int | None = Field(None, description="Total number of matching items, given with a count_mode")
+    next_cursor: str | None = Field(None, alias="nextCursor")
     properties: List[FullPropertyOutDTO]
@@ -1,4 +1,6 @@
+import asyncio
 import uuid
+from datetime import datetime
 from typing import Annotated
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, status
@@ -11,9 +13,12 @@ from app.env import SETTINGS
 
 from ...auth import jwt_authorizer
 from ...auth.models import AuthorizedClient
-from ...common.enums.enums import EntityTypeEnum, EventTypeEnum
+from ...common.enums.enums import CountModeEnum, EntityTypeEnum, EventTypeEnum
+from ..events.dtos import EventListOutDTO
+from ..events.history import history_response
 from ..events.models.event import EventModel
 from ..events.service import EventService
+from ..utils.pagination import next_cursor
 from .dtos import (
     FullPropertyOutDTO,
     PropertyDeletionOutDTO,
@@ -35,6 +40,7 @@ authorizer = jwt_authorizer
     status_code=status.HTTP_201_CREATED,
     response_model=PropertyOutDTO,
     response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
 )
 async def create_property(
     property_in_dto: PropertyInDTO,
@@ -88,11 +94,48 @@ async def get_property(
     return response_dto
 
 
+@property_router.get(
+    "/{target_property_id}/history",
+    status_code=status.HTTP_200_OK,
+    response_model=EventListOutDTO,
+    response_class=JSONResponse,
+)
+async def get_property_history(
+    target_property_id: Annotated[uuid.UUID, Path(title="The ID of the property to retrieve the history of")],
+    cursor: str | None = Query(None, description="Cursor of the page to retrieve, as returned in nextCursor"),
+    limit: int = Query(
+        SETTINGS.pagination_limit_default,
+        ge=0,
+        le=SETTINGS.pagination_limit_max,
+        description="Number of items to retrieve",
+    ),
+    created_from: datetime | None = Query(None, description="Events created at or after it"),
+    created_to: datetime | None = Query(None, description="Events created before it"),
+    event_service: EventService = Depends(Dependencies.event_service),
+    client: AuthorizedClient = Depends(authorizer),
+):
+    if not client.is_super_user():
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    """
+    Returns the events of a property, newest first.
+    """
+    return await history_response(
+        event_service,
+        entity_type=EntityTypeEnum.PROPERTY,
+        node_id=target_property_id,
+        cursor=cursor,
+        limit=limit,
+        created_from=created_from,
+        created_to=created_to,
+    )
+
+
 @property_router.put(
     "/{target_property_id}",
     status_code=status.HTTP_200_OK,
     response_model=PropertyOutDTO,
     response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
 )
 async def update_property(
     target_property_id: Annotated[uuid.UUID, Path(title="The ID of the property to update")],
@@ -131,6 +174,7 @@ async def update_property(
     status_code=status.HTTP_200_OK,
     response_model=PropertyDeletionOutDTO,
     response_class=JSONResponse,
+    dependencies=[Depends(Dependencies.unit_of_work)],
 )
 async def delete_property(
     target_property_id: Annotated[uuid.UUID, Path(title="The ID of the property to delete")],
@@ -166,6 +210,7 @@ async def delete_property(
 )
 async def find_properties(
     skip: int = Query(0, ge=0, description="Number of items to skip"),
+    cursor: str | None = Query(None, description="Cursor of the page to retrieve, as returned in nextCursor"),
     limit: int = Query(
         SETTINGS.pagination_limit_default,
         ge=0,
@@ -178,6 +223,10 @@ async def find_properties(
     ),
     filters: PropertyUpdateInDTO | None = Body(None, description="Field to filter"),
     with_deleted: bool | None = Query(False, description="Include deleted properties"),
+    count_mode: CountModeEnum = Query(
+        CountModeEnum.NONE,
+        description="Total to return: none, exact (counted) or estimated (from the planner statistics)",
+    ),
     property_service: PropertyService = Depends(Dependencies.property_service),
     client: AuthorizedClient = Depends(authorizer),
 ):
@@ -188,16 +237,26 @@ async def find_properties(
     """
     if filters:
         filters = filters.model_dump(exclude_none=True)
-    properties = await property_service.find_properties(
-        skip=skip,
-        limit=limit,
-        sort_field=sort_field,
-        sort_method=sort_method,
-        with_deleted=with_deleted,
-        filters=filters,
+    properties, total = await asyncio.gather(
+        property_service.find_properties(
+            skip=skip,
+            cursor=cursor,
+            limit=limit,
+            sort_field=sort_field,
+            sort_method=sort_method,
+            with_deleted=with_deleted,
+            filters=filters,
+        ),
+        property_service.count_properties(
+            count_mode=count_mode,
+            with_deleted=with_deleted,
+            filters=filters,
+        ),
     )
     response_dto = PropertyListOutDTO(
         count=len(properties),
+        total=total,
+        next_cursor=next_cursor(properties, sort_field, limit),
         properties=FullPropertyOutDTO.parse_obj(properties),
     )
 
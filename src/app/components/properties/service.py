@@ -1,5 +1,6 @@
+import functools
+import logging
 import uuid
-
 from typing import List
 
 from matter_exceptions.exceptions.fastapi import ServerError
@@ -7,24 +8,30 @@ from matter_observability.metrics import (
     count_occurrence,
     measure_processing_time,
 )
-from matter_persistence.redis.manager import CacheManager
 from matter_persistence.sql.exceptions import DatabaseError
 from matter_persistence.sql.utils import SortMethodModel
 
-from app.common.enums.enums import EntityTypeEnum
+from app.common.enums.enums import CountModeEnum
 from app.components.properties.dal import PropertyDAL
 from app.components.properties.models.property import PropertyModel
 from app.components.properties.models.property_update import PropertyUpdateModel
+from app.components.utils.count_cache import CountCache
+from app.components.utils.pagination import decode_cursor
+from app.components.utils.property_cache import PropertyCache
+from app.components.utils.replicated_database_manager import ReplicatedDatabaseManager
 
 
 class PropertyService:
     def __init__(
         self,
         dal: PropertyDAL,
-        cache_manager: CacheManager,
+        property_cache: PropertyCache,
+        database_manager: ReplicatedDatabaseManager,
     ):
         self._dal = dal
-        self._cache_manager = cache_manager
+        self._property_cache = property_cache
+        self._database_manager = database_manager
+        self._count_cache = CountCache()
 
     @count_occurrence(label="properties.get_property")
     @measure_processing_time(label="properties.get_property")
@@ -44,7 +51,9 @@ class PropertyService:
         sort_method: SortMethodModel | None = None,
         with_deleted: bool = False,
         filters: dict | None = None,
+        cursor: str | None = None,
     ) -> List[PropertyModel]:
+        after = decode_cursor(cursor, sort_field) if cursor else None
         return await self._dal.find_properties(
             skip=skip,
             limit=limit,
@@ -52,6 +61,27 @@ class PropertyService:
             sort_method=sort_method,
             with_deleted=with_deleted,
             filters=filters,
+            after=after,
+        )
+
+    @count_occurrence(label="properties.count_properties")
+    @measure_processing_time(label="properties.count_properties")
+    async def count_properties(
+        self,
+        count_mode: CountModeEnum = CountModeEnum.NONE,
+        with_deleted: bool = False,
+        filters: dict | None = None,
+    ) -> int | None:
+        if count_mode == CountModeEnum.NONE:
+            return None
+
+        return await self._count_cache.get_or_count(
+            key={"count_mode": count_mode, "with_deleted": with_deleted, "filters": filters},
+            count=lambda: self._dal.count_properties(
+                with_deleted=with_deleted,
+                filters=filters,
+                estimated=count_mode == CountModeEnum.ESTIMATED,
+            ),
         )
 
     @count_occurrence(label="properties.create_property")
@@ -65,10 +95,10 @@ class PropertyService:
         except DatabaseError as ex:
             raise ServerError(description=ex.description, detail=ex.detail)
 
-        try:
-            await self._delete_outdated_cache_values(property_model.entity_type)
-        finally:
-            return created_property_model
+        await self._database_manager.after_commit(
+            functools.partial(self._update_cached_property, created_property_model)
+        )
+        return created_property_model
 
     @count_occurrence(label="properties.update_property")
     @measure_processing_time(label="properties.update_property")
@@ -77,13 +107,13 @@ class PropertyService:
         property_id: uuid.UUID,
         property_update_model: PropertyUpdateModel,
     ) -> PropertyModel:
+        previous_property_model = await self.get_property(property_id)
         result = await self._dal.update_property(property_id, property_update_model)
 
-        try:
-            property_model = await self.get_property(property_id)
-            await self._delete_outdated_cache_values(property_model.entity_type)
-        finally:
-            return result
+        await self._database_manager.after_commit(
+            functools.partial(self._update_cached_property, result, previous_property_model=previous_property_model)
+        )
+        return result
 
     @count_occurrence(label="properties.delete_property")
     @measure_processing_time(label="properties.delete_property")
@@ -93,14 +123,39 @@ class PropertyService:
     ) -> PropertyModel:
         result = await self._dal.delete_property(property_id, soft_delete=True)
 
+        await self._database_manager.after_commit(functools.partial(self._delete_cached_property, result))
+        return result
+
+    async def _update_cached_property(
+        self,
+        property_model: PropertyModel,
+        previous_property_model: PropertyModel | None = None,
+    ):
+        """
+        Runs once the unit of work is committed, so a rolled back write leaves the cache untouched. A failed update of
+        the cache does not fail the committed write.
+        """
+        try:
+            entity_types = {property_model.entity_type}
+            if previous_property_model is not None and (
+                previous_property_model.entity_type != property_model.entity_type
+                or previous_property_model.property_name != property_model.property_name
+            ):
+                await self._property_cache.delete_property(previous_property_model)
+                entity_types.add(previous_property_model.entity_type)
+
+            await self._property_cache.save_property(property_model)
+            for entity_type in entity_types:
+                await self._property_cache.publish_invalidation(entity_type)
+        except Exception:
+            logging.exception(f"Failed to update the cached property {property_model.id}")
+
+    async def _delete_cached_property(self, property_model: PropertyModel):
+        """
+        Runs once the unit of work is committed, as _update_cached_property does.
+        """
         try:
-            property_model = await self.get_property(property_id)
-            await self._delete_outdated_cache_values(property_model.entity_type)
-        finally:
-            return result
-
-    async def _delete_outdated_cache_values(self, entity_type: EntityTypeEnum):
-        cache_key_ids = f"property_{entity_type.value}_ids_to_names"
-        cache_key_names = f"property_{entity_type.value}_names_to_ids"
-        await self._cache_manager.delete_with_key(cache_key_ids)
-        await self._cache_manager.delete_with_key(cache_key_names)
\ No newline at end of file
+            await self._property_cache.delete_property(property_model)
+            await self._property_cache.publish_invalidation(property_model.entity_type)
+        except Exception:
+            logging.exception(f"Failed to delete the cached property {property_model.id}")
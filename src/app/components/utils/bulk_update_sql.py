@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+from uuid import UUID
+
+from matter_persistence.sql.base import CustomBase
+from pydantic import BaseModel
+from sqlalchemy import Update, cast, column, func, null, update, values
+
+# updated & created are handled by the statement; deleted is handled by the delete methods
+_SYSTEM_FIELDS = ("created", "deleted", "updated")
+
+
+def bulk_update_statement(db_model: type[CustomBase], update_models: dict[UUID, BaseModel]) -> Update:
+    """
+    Builds one UPDATE ... FROM (VALUES ...) statement applying a different patch to every row.
+
+    Like the single row update, fields left to None keep their current value and deleted rows are not updated.
+    """
+    table = db_model.__table__
+    patches = {
+        record_id: {k: v for k, v in update_model.model_dump().items() if k not in _SYSTEM_FIELDS and k in table.c}
+        for record_id, update_model in update_models.items()
+    }
+    fields = sorted({k for patch in patches.values() for k, v in patch.items() if v is not None})
+
+    patch_values = values(
+        column("id", table.c.id.type),
+        *[column(field, table.c[field].type) for field in fields],
+        name="patch",
+    ).data(
+        [
+            # an explicit SQL NULL, a None would be bound as a JSON null for the JSONB columns
+            (record_id, *[null() if patch.get(field) is None else patch[field] for field in fields])
+            for record_id, patch in patches.items()
+        ]
+    )
+
+    return (
+        update(db_model)
+        .where(db_model.id == patch_values.c.id, db_model.deleted.is_(None))
+        .values(
+            {
+                **{
+                    field: func.coalesce(cast(patch_values.c[field], table.c[field].type), table.c[field])
+                    for field in fields
+                },
+                "updated": datetime.now(tz=timezone.utc),
+            }
+        )
+        .returning(db_model)
+        .execution_options(synchronize_session=False)
+    )
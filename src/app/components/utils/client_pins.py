@@ -0,0 +1,70 @@
+import time
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from redis import asyncio as aioredis
+
+from app.env import SETTINGS
+
+
+class ClientPins(ABC):
+    """
+    Clients pinned to the primary after a write, so they read their own writes until the replica has them.
+    """
+
+    @abstractmethod
+    async def pin(self, client_id: UUID, window: float):
+        pass
+
+    @abstractmethod
+    async def is_pinned(self, client_id: UUID) -> bool:
+        pass
+
+
+class MemoryClientPins(ClientPins):
+    """
+    Keeps the pins in the memory of the process, for the tests and the single instance runs.
+    """
+
+    def __init__(self):
+        self._pinned_until: dict[UUID, float] = {}
+
+    async def pin(self, client_id: UUID, window: float):
+        now = time.monotonic()
+        self._pinned_until = {
+            pinned_client_id: pinned_until
+            for pinned_client_id, pinned_until in self._pinned_until.items()
+            if pinned_until > now
+        }
+        self._pinned_until[client_id] = now + window
+
+    async def is_pinned(self, client_id: UUID) -> bool:
+        return self._pinned_until.get(client_id, 0) > time.monotonic()
+
+
+class RedisClientPins(ClientPins):
+    """
+    Keeps a pin per client in Redis, expiring with its window, so it is shared by all the instances.
+    """
+
+    def __init__(
+        self,
+        connection_pool: aioredis.ConnectionPool,
+        key_prefix: str = SETTINGS.db_read_your_writes_key_prefix,
+    ):
+        self._connection_pool = connection_pool
+        self._key_prefix = key_prefix
+
+    async def pin(self, client_id: UUID, window: float):
+        if window <= 0:
+            return
+
+        async with aioredis.Redis(connection_pool=self._connection_pool) as connection:
+            await connection.set(self._key(client_id), 1, px=int(window * 1000))
+
+    async def is_pinned(self, client_id: UUID) -> bool:
+        async with aioredis.Redis(connection_pool=self._connection_pool) as connection:
+            return bool(await connection.exists(self._key(client_id)))
+
+    def _key(self, client_id: UUID) -> str:
+        return f"{self._key_prefix}:{client_id}"
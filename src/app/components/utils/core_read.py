@@ -0,0 +1,87 @@
+from collections.abc import Callable
+from types import SimpleNamespace
+from typing import List
+
+from matter_persistence.sql.base import CustomBase
+from matter_persistence.sql.exceptions import DatabaseInvalidSortFieldError
+from matter_persistence.sql.utils import SortMethodModel
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.common.enums.enums import EntityTypeEnum
+from app.components.utils.count_sql import filtered_statement
+from app.components.utils.sparse_fields import Fields
+from app.env import SETTINGS
+
+
+class PlainRow(SimpleNamespace):
+    """
+    A row read by the Core read path.
+
+    It reads like the ORM models, by attribute and through __dict__ for parse_obj, without their instance state,
+    identity map entry and relationship loaders.
+    """
+
+
+def is_core_read_path(entity_type: EntityTypeEnum) -> bool:
+    return entity_type.value in SETTINGS.core_read_path
+
+
+def plain_columns(
+    db_model: type[CustomBase],
+    fields: Fields | None = None,
+    meta_data_names: ColumnElement | None = None,
+) -> List[ColumnElement]:
+    """
+    Returns the table columns to select, narrowed to the fields, with the meta_data_names expression if given.
+    """
+    table = db_model.__table__
+    columns = [table.c[field] for field in fields] if fields else list(table.c)
+    if meta_data_names is not None:
+        columns.append(meta_data_names.label("meta_data_names"))
+
+    return columns
+
+
+async def get_row(session: AsyncSession, statement: Select) -> PlainRow | None:
+    row = (await session.execute(statement)).mappings().first()
+    return PlainRow(**row) if row is not None else None
+
+
+async def find_rows(
+    session: AsyncSession,
+    db_model: type[CustomBase],
+    skip: int = 0,
+    limit: int | None = None,
+    with_deleted: bool = False,
+    filters: dict | None = None,
+    custom_filter: Callable[[Select], Select] | None = None,
+    sort_field: str | None = None,
+    sort_method: SortMethodModel | None = None,
+    fields: Fields | None = None,
+    meta_data_names: ColumnElement | None = None,
+) -> List[PlainRow]:
+    """
+    Core counterpart of find(), with the same filtering, sorting and pagination, returning plain rows.
+    """
+    statement = filtered_statement(
+        db_model, with_deleted, filters, custom_filter, plain_columns(db_model, fields, meta_data_names)
+    )
+
+    if sort_field is not None:
+        try:
+            sort_column = getattr(db_model, sort_field)
+        except AttributeError as exc:
+            raise DatabaseInvalidSortFieldError(
+                description=f"The Sort Field '{sort_field}' you selected doesn't exist: {str(exc)}",
+                detail={"sort_field": sort_field, "exception": exc},
+            )
+        statement = statement.order_by(sort_column if sort_method == SortMethodModel.ASC else sort_column.desc())
+
+    if skip:
+        statement = statement.offset(skip)
+    if limit:
+        statement = statement.limit(limit)
+
+    return [PlainRow(**row) for row in (await session.execute(statement)).mappings()]
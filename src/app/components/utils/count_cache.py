@@ -0,0 +1,45 @@
+import json
+import time
+from collections.abc import Awaitable, Callable
+
+from app.env import SETTINGS
+
+
+class CountCache:
+    """
+    Process-local cache of the search counts, keyed by the normalized filters.
+
+    Counts are kept for a short time only, so a count can lag behind the writes by at most the expiration.
+    """
+
+    def __init__(
+        self,
+        expiration: float = SETTINGS.cache_count_expiration,
+        max_entries: int = SETTINGS.cache_count_max_entries,
+    ):
+        self._expiration = expiration
+        self._max_entries = max_entries
+        self._entries: dict[str, tuple[float, int]] = {}
+
+    async def get_or_count(self, key: dict, count: Callable[[], Awaitable[int]]) -> int:
+        normalized_key = self.normalize_key(key)
+        now = time.monotonic()
+
+        entry = self._entries.get(normalized_key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        value = await count()
+
+        if len(self._entries) >= self._max_entries:
+            self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+            if len(self._entries) >= self._max_entries:
+                self._entries.clear()
+        self._entries[normalized_key] = (time.monotonic() + self._expiration, value)
+
+        return value
+
+    @staticmethod
+    def normalize_key(key: dict) -> str:
+        # sorted keys, and enums and uuids by value, so equal filters given in another order share the entry
+        return json.dumps(key, sort_keys=True, default=lambda value: getattr(value, "value", str(value)))
@@ -0,0 +1,86 @@
+import json
+from collections.abc import Callable
+from typing import List
+
+from matter_persistence.sql.base import CustomBase
+from sqlalchemy import ClauseElement, Executable, Select, bindparam, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.elements import ColumnElement
+
+# -1 until the table was first vacuumed or analyzed
+_RELTUPLES_QUERY = text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table_name AS regclass)").bindparams(
+    bindparam("table_name")
+)
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, keeping its bound parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kwargs) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kwargs)
+
+
+def filtered_statement(
+    db_model: type[CustomBase],
+    with_deleted: bool = False,
+    filters: dict | None = None,
+    custom_filter: Callable[[Select], Select] | None = None,
+    columns: List[ColumnElement] | None = None,
+) -> Select:
+    """
+    Selects the rows find() would return for the same filters, without the sorting and the pagination.
+
+    The rows are ORM entities, or only the given columns.
+    """
+    statement = select(*columns) if columns else select(db_model)
+    for key, value in (filters or {}).items():
+        if hasattr(db_model, key):
+            statement = statement.where(getattr(db_model, key) == value)
+
+    if custom_filter:
+        statement = custom_filter(statement)
+
+    if not with_deleted:
+        statement = statement.where(db_model.deleted.is_(None))
+
+    return statement
+
+
+async def count(
+    session: AsyncSession,
+    db_model: type[CustomBase],
+    with_deleted: bool = False,
+    filters: dict | None = None,
+    custom_filter: Callable[[Select], Select] | None = None,
+    estimated: bool = False,
+) -> int:
+    """
+    Counts the rows find() would return for the same filters.
+
+    The estimated count reads the row count the planner keeps for the table when nothing is filtered, and the row
+    estimate of the query plan otherwise, so it never scans the table.
+    """
+    statement = filtered_statement(db_model, with_deleted, filters, custom_filter)
+
+    if not estimated:
+        statement = statement.with_only_columns(func.count(), maintain_column_froms=True)
+        return (await session.execute(statement)).scalar_one()
+
+    if with_deleted and not filters and custom_filter is None:
+        reltuples = (await session.execute(_RELTUPLES_QUERY, {"table_name": db_model.__tablename__})).scalar_one()
+        if reltuples >= 0:
+            return reltuples
+
+    plan = (await session.execute(Explain(statement))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
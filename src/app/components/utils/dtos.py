@@ -0,0 +1,33 @@
+import uuid
+from typing import List
+
+from matter_exceptions.base_fastapi_exception import BaseFastAPIException
+from matter_persistence.foundation_model import FoundationModel
+from matter_persistence.sql.base import CustomBase
+from pydantic import BaseModel, Field
+
+from app.env import SETTINGS
+
+
+class BulkItemOutDTO(BaseModel):
+    index: int
+    id: uuid.UUID | None = None
+    error: dict | None = None
+
+    @classmethod
+    def parse_results(cls, results: List[CustomBase | BaseFastAPIException]) -> List["BulkItemOutDTO"]:
+        return [
+            cls(index=index, error={"description": result.description, "detail": result.detail})
+            if isinstance(result, BaseFastAPIException)
+            else cls(index=index, id=result.id)
+            for index, result in enumerate(results)
+        ]
+
+
+class BulkOutDTO(FoundationModel):
+    count: int = Field(..., description="Number of created or updated items")
+    items: List[BulkItemOutDTO]
+
+
+class BatchGetInDTO(BaseModel):
+    ids: List[uuid.UUID] = Field(..., min_length=1, max_length=SETTINGS.pagination_limit_max)
@@ -1,22 +1,35 @@
-import json
+import asyncio
+import logging
+import time
+from typing import List
 
 from matter_exceptions.exceptions.fastapi import ValidationError
 from matter_observability.metrics import count_occurrence, measure_processing_time
 from matter_persistence.redis.exceptions import CacheRecordNotFoundError
-from matter_persistence.redis.manager import CacheManager
+from matter_persistence.sql.base import CustomBase
 
 from app.common.enums.enums import EntityTypeEnum
 from app.components.properties.service import PropertyService
+from app.components.utils.meta_data_validator import MetaDataValidator
+from app.components.utils.models import PropertyMapsModel
+from app.components.utils.property_cache import PropertyCache
+from app.env import SETTINGS
 
 
 class MetaDataService:
     def __init__(
         self,
         property_service: PropertyService,
-        cache_manager: CacheManager,
+        property_cache: PropertyCache,
     ):
         self._property_service = property_service
-        self._cache_manager = cache_manager
+        self._property_cache = property_cache
+
+        # process-local copies of the property maps, dropped whenever the property cache reports a newer version
+        self._local_cache: dict[EntityTypeEnum, PropertyMapsModel] = {}
+        self._latest_versions: dict[EntityTypeEnum, int] = {}
+        self._pending_loads: dict[EntityTypeEnum, asyncio.Future] = {}
+        self._property_cache.add_listener(self._invalidate_local_cache)
 
     @count_occurrence(label="utils.validate_metadata")
     @measure_processing_time(label="utils.validate_metadata")
@@ -25,24 +38,50 @@ class MetaDataService:
         entity_type: EntityTypeEnum,
         meta_data: dict,
     ) -> dict:
-        cache_key = f"property_{entity_type.value}_names_to_ids"
-        try:
-            cached_data = await self._cache_manager.get_with_key(cache_key)
-            property_name_to_id = json.loads(cached_data)
-        except CacheRecordNotFoundError:
-            properties = await self._property_service.find_properties(filters={"entity_type": entity_type})
-            property_name_to_id = {prop.property_name: str(prop.id) for prop in properties}
+        validator = (await self._get_property_maps(entity_type)).validator
+
+        converted_meta_data, errors = validator.validate(meta_data)
+        if errors:
+            raise self._validation_error(entity_type, meta_data, errors)
 
-            await self._cache_manager.save_with_key(cache_key, json.dumps(property_name_to_id))
+        return converted_meta_data
 
-        invalid_keys = set(meta_data) - set(property_name_to_id)
-        if invalid_keys:
+    @count_occurrence(label="utils.validate_many_metadata")
+    @measure_processing_time(label="utils.validate_many_metadata")
+    async def convert_many_names_to_ids(
+        self,
+        entity_type: EntityTypeEnum,
+        meta_data_list: List[dict],
+    ) -> List[dict | ValidationError]:
+        """
+        Converts the metadata of a batch of rows, returning the validation error in place of invalid metadata.
+        """
+        validator = (await self._get_property_maps(entity_type)).validator
+
+        results = []
+        for meta_data in meta_data_list:
+            converted_meta_data, errors = validator.validate(meta_data)
+            results.append(self._validation_error(entity_type, meta_data, errors) if errors else converted_meta_data)
+
+        return results
+
+    @count_occurrence(label="utils.validate_metadata_filters")
+    @measure_processing_time(label="utils.validate_metadata_filters")
+    async def convert_filter_names_to_ids(
+        self,
+        entity_type: EntityTypeEnum,
+        meta_data_filters: dict,
+    ) -> dict:
+        validator = (await self._get_property_maps(entity_type)).validator
+
+        converted_meta_data_filters, errors = validator.validate_filters(meta_data_filters)
+        if errors:
             raise ValidationError(
-                description=f"Cannot create {entity_type.value} with meta_data: {meta_data}.",
-                detail={"invalid_keys": list(invalid_keys), "valid_keys": list(property_name_to_id.keys())},
+                description=f"Cannot filter {entity_type.value} with meta_data filters: {meta_data_filters}.",
+                detail=errors,
             )
 
-        return {property_name_to_id[key]: value for key, value in meta_data.items()}
+        return converted_meta_data_filters
 
     @count_occurrence(label="utils.transform_metadata")
     @measure_processing_time(label="utils.transform_metadata")
@@ -51,15 +90,136 @@ class MetaDataService:
         entity_type: EntityTypeEnum,
         meta_data: dict,
     ) -> dict:
-        cache_key = f"property_{entity_type.value}_ids_to_names"
+        if not meta_data:
+            return {}
+
+        property_maps = self._local_cache.get(entity_type)
+        if property_maps is not None and property_maps.expires_at > time.monotonic():
+            property_id_to_name = property_maps.ids_to_names
+        else:
+            # a single row only needs the names of its own keys, so don't pull the whole map into this process
+            try:
+                property_id_to_name = await self._property_cache.get_property_names(entity_type, list(meta_data))
+            except CacheRecordNotFoundError:
+                property_id_to_name = (await self._get_property_maps(entity_type)).ids_to_names
+            else:
+                # the following rows are resolved in the process again once the maps are reloaded
+                self._refresh_in_background(entity_type)
+
+        return {property_id_to_name.get(property_id, property_id): value for property_id, value in meta_data.items()}
+
+    @count_occurrence(label="utils.transform_many_metadata")
+    @measure_processing_time(label="utils.transform_many_metadata")
+    async def convert_many_ids_to_names(
+        self,
+        entity_type: EntityTypeEnum,
+        rows: List[CustomBase],
+    ) -> List[CustomBase]:
+        property_id_to_name = (await self._get_property_maps(entity_type)).ids_to_names
+
+        for row in rows:
+            meta_data = row.meta_data
+            row.meta_data = (
+                {property_id_to_name.get(property_id, property_id): value for property_id, value in meta_data.items()}
+                if meta_data
+                else {}
+            )
+
+        return rows
+
+    @staticmethod
+    def is_resolved_in_sql(entity_type: EntityTypeEnum) -> bool:
+        return entity_type.value in SETTINGS.meta_data_resolved_in_sql
+
+    @staticmethod
+    def take_names_resolved_in_sql(rows: List[CustomBase]) -> List[CustomBase]:
+        # rows loaded with the meta_data_names expression already carry the name-keyed metadata
+        for row in rows:
+            row.meta_data = row.meta_data_names or {}
+
+        return rows
+
+    async def _get_property_maps(self, entity_type: EntityTypeEnum) -> PropertyMapsModel:
+        property_maps = self._local_cache.get(entity_type)
+        if property_maps is not None and property_maps.expires_at > time.monotonic():
+            return property_maps
+
+        return await asyncio.shield(self._start_load(entity_type))
+
+    def _start_load(self, entity_type: EntityTypeEnum) -> asyncio.Future:
+        # single-flight: concurrent misses for the same entity type wait on one load instead of starting their own
+        load = self._pending_loads.get(entity_type)
+        if load is None:
+            load = asyncio.ensure_future(self._load_property_maps(entity_type))
+            self._pending_loads[entity_type] = load
+            load.add_done_callback(lambda _: self._pending_loads.pop(entity_type, None))
+
+        return load
+
+    def _refresh_in_background(self, entity_type: EntityTypeEnum):
+        if entity_type in self._pending_loads:
+            return
+
+        def log_failure(load: asyncio.Future):
+            if not load.cancelled() and load.exception() is not None:
+                logging.warning(
+                    f"Failed to refresh the property maps of {entity_type.value}", exc_info=load.exception()
+                )
 
+        self._start_load(entity_type).add_done_callback(log_failure)
+
+    async def _load_property_maps(self, entity_type: EntityTypeEnum) -> PropertyMapsModel:
+        # the version is read before the maps, so a concurrent invalidation can only make this copy look older
+        version = await self._property_cache.get_version(entity_type)
         try:
-            cached_data = await self._cache_manager.get_with_key(cache_key)
-            property_id_to_name = json.loads(cached_data)
+            names_to_ids, ids_to_names, schema = await self._property_cache.get_property_maps(entity_type)
         except CacheRecordNotFoundError:
+            names_to_ids, ids_to_names, schema = await self._rebuild_cached_property_maps(entity_type)
+
+        property_maps = PropertyMapsModel(
+            version=version,
+            expires_at=time.monotonic() + SETTINGS.cache_property_local_expiration,
+            names_to_ids=names_to_ids,
+            ids_to_names=ids_to_names,
+            validator=MetaDataValidator(names_to_ids=names_to_ids, schema=schema),
+        )
+
+        if version >= self._latest_versions.get(entity_type, 0):
+            self._local_cache[entity_type] = property_maps
+
+        return property_maps
+
+    async def _rebuild_cached_property_maps(self, entity_type: EntityTypeEnum) -> tuple[dict, dict, dict]:
+        async with self._property_cache.write_lock(entity_type):
+            # another pod may have rebuilt the maps while we were waiting for the lock
+            try:
+                return await self._property_cache.get_property_maps(entity_type)
+            except CacheRecordNotFoundError:
+                pass
+
             properties = await self._property_service.find_properties(filters={"entity_type": entity_type})
-            property_id_to_name = {str(prop.id): prop.property_name for prop in properties}
+            names_to_ids = {prop.property_name: str(prop.id) for prop in properties}
+            ids_to_names = {str(prop.id): prop.property_name for prop in properties}
+            schema = {
+                str(prop.id): {"data_type": prop.data_type.value, "is_required": prop.is_required}
+                for prop in properties
+            }
 
-            await self._cache_manager.save_with_key(cache_key, json.dumps(property_id_to_name))
+            await self._property_cache.save_property_maps(entity_type, names_to_ids, ids_to_names, schema)
 
-        return {property_id_to_name.get(property_id, property_id): value for property_id, value in meta_data.items()}
+        return names_to_ids, ids_to_names, schema
+
+    @staticmethod
+    def _validation_error(entity_type: EntityTypeEnum, meta_data: dict, errors: dict) -> ValidationError:
+        return ValidationError(
+            description=f"Cannot create {entity_type.value} with meta_data: {meta_data}.",
+            detail=errors,
+        )
+
+    def _invalidate_local_cache(self, entity_type: EntityTypeEnum, version: int):
+        if version > self._latest_versions.get(entity_type, 0):
+            self._latest_versions[entity_type] = version
+
+        property_maps = self._local_cache.get(entity_type)
+        if property_maps is not None and property_maps.version < version:
+            del self._local_cache[entity_type]
@@ -0,0 +1,71 @@
+from collections.abc import Callable
+
+from matter_persistence.sql.base import CustomBase
+from sqlalchemy import Select, String, and_, cast, func, literal_column, not_, or_, select
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.common.enums.enums import EntityTypeEnum
+from app.components.properties.models.property import PropertyModel
+
+
+def meta_data_names_expression(db_model: type[CustomBase], entity_type: EntityTypeEnum) -> ColumnElement:
+    """
+    Builds a correlated subquery returning the row's meta_data keyed by property name instead of property id.
+
+    Keys without a matching (non-deleted) property are kept as they are, like the cached conversion in Python does.
+    """
+    meta_data_entry = func.jsonb_each(db_model.meta_data).table_valued("key", "value").render_derived("meta_data_entry")
+
+    return (
+        select(
+            func.coalesce(
+                func.jsonb_object_agg(
+                    func.coalesce(PropertyModel.property_name, meta_data_entry.c.key),
+                    meta_data_entry.c.value,
+                ),
+                literal_column("'{}'::jsonb"),
+            )
+        )
+        .select_from(
+            meta_data_entry.outerjoin(
+                PropertyModel,
+                and_(
+                    cast(PropertyModel.id, String) == meta_data_entry.c.key,
+                    PropertyModel.entity_type == entity_type,
+                    PropertyModel.deleted.is_(None),
+                ),
+            )
+        )
+        .scalar_subquery()
+    )
+
+
+def meta_data_filter(db_model: type[CustomBase], meta_data_filters: dict) -> Callable[[Select], Select]:
+    """
+    Filters the statement on meta_data, keyed by property id.
+
+    Plain values are gathered into a single `meta_data @> :doc` containment, a list of values becomes one containment
+    per value and None matches a property that is absent or null. The containments can use the jsonb_path_ops GIN
+    index on meta_data.
+    """
+    contained = {
+        key: value for key, value in meta_data_filters.items() if value is not None and not isinstance(value, list)
+    }
+
+    predicates = [db_model.meta_data.contains(contained)] if contained else []
+    for key, value in meta_data_filters.items():
+        if isinstance(value, list):
+            predicates.append(or_(*[db_model.meta_data.contains({key: item}) for item in value]))
+        elif value is None:
+            predicates.append(
+                or_(
+                    db_model.meta_data.is_(None),
+                    not_(db_model.meta_data.has_key(key)),
+                    db_model.meta_data.contains({key: None}),
+                )
+            )
+
+    def apply(statement: Select) -> Select:
+        return statement.where(*predicates)
+
+    return apply
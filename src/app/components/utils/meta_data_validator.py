@@ -0,0 +1,125 @@
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from app.common.enums.enums import DataTypeEnum
+
+
+def _is_string(value: Any) -> bool:
+    return isinstance(value, str)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+def _is_boolean(value: Any) -> bool:
+    return isinstance(value, bool)
+
+
+def _is_uuid(value: Any) -> bool:
+    if not isinstance(value, str):
+        return False
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
+
+
+_TYPE_CHECKERS: dict[DataTypeEnum, Callable[[Any], bool]] = {
+    DataTypeEnum.STRING: _is_string,
+    DataTypeEnum.NUMBER: _is_number,
+    DataTypeEnum.BOOLEAN: _is_boolean,
+    DataTypeEnum.UUID: _is_uuid,
+}
+
+
+class MetaDataValidator:
+    """
+    Validates and converts the metadata of one entity type in a single pass.
+
+    It is compiled once from the property definitions of the entity type: every property name is resolved upfront
+    to its id and to the type checker of its data type, so validating a payload is a dictionary lookup and a call
+    per key, followed by one set difference for the required properties.
+    """
+
+    def __init__(
+        self,
+        names_to_ids: dict[str, str],
+        schema: dict[str, dict],
+    ):
+        self._fields: dict[str, tuple[str, DataTypeEnum, Callable[[Any], bool]]] = {}
+        required = set()
+        for property_name, property_id in names_to_ids.items():
+            data_type = DataTypeEnum(schema[property_id]["data_type"])
+            self._fields[property_name] = (property_id, data_type, _TYPE_CHECKERS[data_type])
+            if schema[property_id]["is_required"]:
+                required.add(property_name)
+        self._required = frozenset(required)
+
+    def validate(self, meta_data: dict) -> tuple[dict, dict]:
+        """
+        Converts the metadata keys from property names to property ids.
+
+        Returns the converted metadata and a dictionary of errors, which is empty if the metadata is valid.
+        """
+        converted = {}
+        invalid_keys = []
+        invalid_values = {}
+        for key, value in meta_data.items():
+            field = self._fields.get(key)
+            if field is None:
+                invalid_keys.append(key)
+                continue
+
+            property_id, data_type, is_valid = field
+            if value is None:
+                if key in self._required:
+                    invalid_values[key] = data_type.value
+            elif not is_valid(value):
+                invalid_values[key] = data_type.value
+            converted[property_id] = value
+
+        errors = {}
+        if invalid_keys:
+            errors["invalid_keys"] = invalid_keys
+            errors["valid_keys"] = list(self._fields)
+        if invalid_values:
+            errors["invalid_values"] = invalid_values
+        missing_keys = self._required.difference(meta_data)
+        if missing_keys:
+            errors["missing_required_keys"] = sorted(missing_keys)
+
+        return converted, errors
+
+    def validate_filters(self, meta_data_filters: dict) -> tuple[dict, dict]:
+        """
+        Converts the keys of metadata filters from property names to property ids.
+
+        A filter value is either a value the property must have, a list of values it must have one of, or None for
+        a property that is absent or null. Required properties do not have to be filtered on.
+        """
+        converted = {}
+        invalid_keys = []
+        invalid_values = {}
+        for key, value in meta_data_filters.items():
+            field = self._fields.get(key)
+            if field is None:
+                invalid_keys.append(key)
+                continue
+
+            property_id, data_type, is_valid = field
+            values = value if isinstance(value, list) else [value]
+            if not values or not all(item is None or is_valid(item) for item in values):
+                invalid_values[key] = data_type.value
+            converted[property_id] = value
+
+        errors = {}
+        if invalid_keys:
+            errors["invalid_keys"] = invalid_keys
+            errors["valid_keys"] = list(self._fields)
+        if invalid_values:
+            errors["invalid_values"] = invalid_values
+
+        return converted, errors
@@ -0,0 +1,13 @@
+from pydantic import BaseModel, ConfigDict
+
+from app.components.utils.meta_data_validator import MetaDataValidator
+
+
+class PropertyMapsModel(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    version: int
+    expires_at: float
+    names_to_ids: dict[str, str]
+    ids_to_names: dict[str, str]
+    validator: MetaDataValidator
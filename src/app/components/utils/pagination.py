@@ -0,0 +1,97 @@
+import base64
+import binascii
+import json
+import uuid
+from collections.abc import Callable
+from datetime import datetime
+from typing import List
+
+from matter_exceptions.exceptions.fastapi import ValidationError
+from matter_persistence.sql.base import CustomBase
+from matter_persistence.sql.utils import SortMethodModel
+from sqlalchemy import Select, tuple_
+
+# sort fields a cursor can be issued for; None is the default sort, which orders by id only
+CURSOR_SORT_FIELDS = (None, "created", "updated")
+
+Cursor = tuple[datetime | None, uuid.UUID]
+
+
+def is_cursor_sort(sort_field: str | None) -> bool:
+    return sort_field in CURSOR_SORT_FIELDS
+
+
+def encode_cursor(row: CustomBase, sort_field: str | None) -> str:
+    payload = {
+        "sort_field": sort_field,
+        "value": getattr(row, sort_field).isoformat() if sort_field else None,
+        "id": str(row.id),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str, sort_field: str | None) -> Cursor:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        value = datetime.fromisoformat(payload["value"]) if payload["value"] is not None else None
+        row_id = uuid.UUID(payload["id"])
+        cursor_sort_field = payload["sort_field"]
+    except (binascii.Error, json.JSONDecodeError, KeyError, TypeError, ValueError):
+        raise ValidationError(description=f"Invalid cursor: {cursor}.", detail={"cursor": cursor})
+
+    if cursor_sort_field != sort_field:
+        raise ValidationError(
+            description=f"The cursor was issued for the sort field '{cursor_sort_field}', not '{sort_field}'.",
+            detail={"cursor": cursor, "sort_field": sort_field},
+        )
+
+    return value, row_id
+
+
+def next_cursor(rows: List[CustomBase], sort_field: str | None, limit: int | None) -> str | None:
+    """
+    Returns the cursor of the page following the rows, or None if the rows are the last page.
+    """
+    if not is_cursor_sort(sort_field) or not limit or len(rows) < limit:
+        return None
+
+    return encode_cursor(rows[-1], sort_field)
+
+
+def keyset_pagination(
+    db_model: type[CustomBase],
+    sort_field: str | None,
+    sort_method: SortMethodModel | None,
+    after: Cursor | None = None,
+) -> Callable[[Select], Select]:
+    """
+    Orders the statement by (sort_field, id) and, given a cursor, keeps only the rows after it.
+
+    The id breaks ties between rows with the same sort value, so every row has a stable position.
+    """
+    columns = [getattr(db_model, sort_field), db_model.id] if sort_field else [db_model.id]
+    descending = sort_method == SortMethodModel.DESC
+
+    def apply(statement: Select) -> Select:
+        if after is not None:
+            value, row_id = after
+            position = tuple_(*columns) if sort_field else db_model.id
+            bound = tuple_(value, row_id) if sort_field else row_id
+            statement = statement.where(position < bound if descending else position > bound)
+
+        return statement.order_by(*[column.desc() if descending else column for column in columns])
+
+    return apply
+
+
+def chain_filters(*custom_filters: Callable[[Select], Select] | None) -> Callable[[Select], Select] | None:
+    custom_filters = [custom_filter for custom_filter in custom_filters if custom_filter is not None]
+    if not custom_filters:
+        return None
+
+    def apply(statement: Select) -> Select:
+        for custom_filter in custom_filters:
+            statement = custom_filter(statement)
+        return statement
+
+    return apply
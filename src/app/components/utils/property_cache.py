@@ -0,0 +1,222 @@
+import asyncio
+import contextlib
+import json
+import logging
+from collections.abc import AsyncIterator, Callable
+
+from matter_persistence.redis.exceptions import CacheRecordNotFoundError
+from redis import asyncio as aioredis
+from redis.exceptions import LockNotOwnedError
+
+from app.common.enums.enums import EntityTypeEnum
+from app.components.properties.models.property import PropertyModel
+from app.env import SETTINGS
+
+
+class PropertyCache:
+    """
+    Stores the property maps of every entity type in Redis and coordinates them between the pods of the service.
+
+    Each entity type has three Redis hashes - property names to ids, property ids to names and property ids to their
+    schema - plus a marker key telling whether the hashes are fully populated. Single properties are written field
+    by field, so a property change never requires rebuilding the whole map.
+
+    Every entity type also has a version key. Bumping it publishes the new version on a Redis channel, so each
+    pod can drop its process-local copy of the property maps. Listeners are also notified in-process right away.
+    Writes to the hashes are serialized across pods with a Redis lock per entity type.
+    """
+
+    def __init__(
+        self,
+        connection_pool: aioredis.ConnectionPool,
+    ):
+        self._connection_pool = connection_pool
+        self._listeners: list[Callable[[EntityTypeEnum, int], None]] = []
+        self._listener_task: asyncio.Task | None = None
+
+    def add_listener(self, listener: Callable[[EntityTypeEnum, int], None]):
+        self._listeners.append(listener)
+
+    async def start(self):
+        if self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
+    async def get_version(self, entity_type: EntityTypeEnum) -> int:
+        async with aioredis.Redis(connection_pool=self._connection_pool) as connection:
+            version = await connection.get(self._version_key(entity_type))
+
+        return int(version) if version else 0
+
+    async def publish_invalidation(self, entity_type: EntityTypeEnum) -> int:
+        async with aioredis.Redis(connection_pool=self._connection_pool) as connection:
+            version = await connection.incr(self._version_key(entity_type))
+            await connection.publish(
+                SETTINGS.cache_property_invalidation_channel,
+                json.dumps({"entity_type": entity_type.value, "version": version}),
+            )
+
+        self._notify_listeners(entity_type, version)
+        return version
+
+    async def get_property_maps(self, entity_type: EntityTypeEnum) -> tuple[dict, dict, dict]:
+        async with aioredis.Redis(connection_pool=self._connection_pool) as connection:
+            async with connection.pipeline(transaction=True) as pipe:
+                pipe.exists(self._populated_key(entity_type))
+                pipe.hgetall(self._names_to_ids_key(entity_type))
+                pipe.hgetall(self._ids_to_names_key(entity_type))
+                pipe.hgetall(self._schema_key(entity_type))
+                populated, names_to_ids, ids_to_names, schema = await pipe.execute()
+
+        if not populated:
+            raise CacheRecordNotFoundError(
+                description=f"Property maps of {entity_type.value} are not cached.",
+                detail={"entity_type": entity_type.value},
+            )
+
+        return (
+            {name.decode(): property_id.decode() for name, property_id in names_to_ids.items()},
+            {property_id.decode(): name.decode() for property_id, name in ids_to_names.items()},
+            {property_id.decode(): json.loads(definition) for property_id, definition in schema.items()},
+        )
+
+    async def get_property_names(self, entity_type: EntityTypeEnum, property_ids: list[str]) -> dict[str, str]:
+        async with aioredis.Redis(connection_pool=self._connection_pool) as connection:
+            async with connection.pipeline(transaction=True) as pipe:
+                pipe.exists(self._populated_key(entity_type))
+                pipe.hmget(self._ids_to_names_key(entity_type), property_ids)
+                populated, names = await pipe.execute()
+
+        if not populated:
+            raise CacheRecordNotFoundError(
+                description=f"Property maps of {entity_type.value} are not cached.",
+                detail={"entity_type": entity_type.value},
+            )
+
+        return {property_id: name.decode() for property_id, name in zip(property_ids, names) if name is not None}
+
+    async def save_property_maps(
+        self,
+        entity_type: EntityTypeEnum,
+        names_to_ids: dict[str, str],
+        ids_to_names: dict[str, str],
+        schema: dict[str, dict],
+    ):
+        async with aioredis.Redis(connection_pool=self._connection_pool) as connection:
+            async with connection.pipeline(transaction=True) as pipe:
+                pipe.delete(
+                    self._names_to_ids_key(entity_type),
+                    self._ids_to_names_key(entity_type),
+                    self._schema_key(entity_type),
+                )
+                if names_to_ids:
+                    pipe.hset(self._names_to_ids_key(entity_type), mapping=names_to_ids)
+                    pipe.hset(self._ids_to_names_key(entity_type), mapping=ids_to_names)
+                    pipe.hset(
+                        self._schema_key(entity_type),
+                        mapping={property_id: json.dumps(definition) for property_id, definition in schema.items()},
+                    )
+                pipe.set(self._populated_key(entity_type), 1)
+                await pipe.execute()
+
+    async def save_property(self, property_model: PropertyModel):
+        entity_type = property_model.entity_type
+        property_id = str(property_model.id)
+        async with self.write_lock(entity_type):
+            async with aioredis.Redis(connection_pool=self._connection_pool) as connection:
+                async with connection.pipeline(transaction=True) as pipe:
+                    pipe.hset(self._names_to_ids_key(entity_type), property_model.property_name, property_id)
+                    pipe.hset(self._ids_to_names_key(entity_type), property_id, property_model.property_name)
+                    pipe.hset(
+                        self._schema_key(entity_type),
+                        property_id,
+                        json.dumps(
+                            {"data_type": property_model.data_type.value, "is_required": property_model.is_required}
+                        ),
+                    )
+                    await pipe.execute()
+
+    async def delete_property(self, property_model: PropertyModel):
+        entity_type = property_model.entity_type
+        property_id = str(property_model.id)
+        async with self.write_lock(entity_type):
+            async with aioredis.Redis(connection_pool=self._connection_pool) as connection:
+                async with connection.pipeline(transaction=True) as pipe:
+                    pipe.hdel(self._names_to_ids_key(entity_type), property_model.property_name)
+                    pipe.hdel(self._ids_to_names_key(entity_type), property_id)
+                    pipe.hdel(self._schema_key(entity_type), property_id)
+                    await pipe.execute()
+
+    @contextlib.asynccontextmanager
+    async def write_lock(self, entity_type: EntityTypeEnum) -> AsyncIterator[None]:
+        async with aioredis.Redis(connection_pool=self._connection_pool) as connection:
+            lock = connection.lock(
+                f"property_{entity_type.value}_lock",
+                timeout=SETTINGS.cache_lock_expiration,
+                blocking_timeout=SETTINGS.cache_lock_expiration,
+            )
+            acquired = await lock.acquire()
+            if not acquired:
+                logging.warning(f"Writing the {entity_type.value} property cache without holding the lock.")
+
+            try:
+                yield
+            finally:
+                if acquired:
+                    try:
+                        await lock.release()
+                    except LockNotOwnedError:
+                        # the lock expired while the rebuild was still running
+                        pass
+
+    async def _listen(self):
+        while True:
+            try:
+                async with aioredis.Redis(connection_pool=self._connection_pool) as connection:
+                    async with connection.pubsub(ignore_subscribe_messages=True) as pubsub:
+                        await pubsub.subscribe(SETTINGS.cache_property_invalidation_channel)
+
+                        # invalidations published while we were not subscribed would otherwise be lost
+                        for entity_type in EntityTypeEnum:
+                            self._notify_listeners(entity_type, await self.get_version(entity_type))
+
+                        async for message in pubsub.listen():
+                            payload = json.loads(message["data"])
+                            self._notify_listeners(EntityTypeEnum(payload["entity_type"]), payload["version"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception("Property cache invalidation listener failed. Reconnecting...")
+                await asyncio.sleep(1)
+
+    def _notify_listeners(self, entity_type: EntityTypeEnum, version: int):
+        for listener in self._listeners:
+            listener(entity_type, version)
+
+    @staticmethod
+    def _version_key(entity_type: EntityTypeEnum) -> str:
+        return f"property_{entity_type.value}_version"
+
+    @staticmethod
+    def _populated_key(entity_type: EntityTypeEnum) -> str:
+        return f"property_{entity_type.value}_populated"
+
+    @staticmethod
+    def _names_to_ids_key(entity_type: EntityTypeEnum) -> str:
+        return f"property_{entity_type.value}_names_to_ids"
+
+    @staticmethod
+    def _ids_to_names_key(entity_type: EntityTypeEnum) -> str:
+        return f"property_{entity_type.value}_ids_to_names"
+
+    @staticmethod
+    def _schema_key(entity_type: EntityTypeEnum) -> str:
+        return f"property_{entity_type.value}_schema"
@@ -0,0 +1,223 @@
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextvars import ContextVar
+from typing import Any
+from uuid import UUID
+
+from matter_persistence.sql.manager import DatabaseManager
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.auth.context import get_request_client
+from app.components.utils.client_pins import ClientPins, MemoryClientPins
+
+# seconds the replica is behind the primary; 0 when it has replayed everything it received
+_REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+# connection of the unit of work of the current request, None outside of one
+_unit_of_work_connection: ContextVar[AsyncConnection | None] = ContextVar("unit_of_work_connection", default=None)
+# callbacks awaited once the unit of work of the current request is committed
+_unit_of_work_callbacks: ContextVar[list[Callable[[], Awaitable[None]]] | None] = ContextVar(
+    "unit_of_work_callbacks", default=None
+)
+
+
+class ReplicatedDatabaseManager(DatabaseManager):
+    """
+    Database manager sending the reads to a read replica when one is configured.
+
+    session() always opens a session on the primary and pins the requesting client to the primary for
+    pinning_window seconds, so the client reads its own writes. The pins are kept in client_pins, which is shared by
+    the instances when it is backed by Redis. read_session() opens a session on the replica,
+    unless the client is pinned, the replica lag is unknown or the lag is above max_lag seconds. primary_session()
+    is for the reads that must not be stale, it opens a session on the primary without pinning the client.
+
+    Inside unit_of_work(), session() and read_session() open their sessions on the connection of the unit of work
+    and join its transaction. Their commits only flush, the unit of work commits the transaction once on exit.
+    primary_session() keeps its own connection, so it reads committed data only.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        engine_kwargs: dict[str, Any] | None = None,
+        *,
+        replica_host: str | None = None,
+        pinning_window: float = 10,
+        max_lag: float = 5,
+        lag_check_interval: float = 5,
+        client_pins: ClientPins | None = None,
+    ):
+        engine_kwargs = engine_kwargs or {}
+        super().__init__(host, engine_kwargs)
+        self._replica = DatabaseManager(replica_host, engine_kwargs) if replica_host else None
+        self._pinning_window = pinning_window
+        self._max_lag = max_lag
+        self._lag_check_interval = lag_check_interval
+        self._client_pins = client_pins or MemoryClientPins()
+        self._replica_lag: float | None = None
+        self._lag_check_task: asyncio.Task | None = None
+
+    @property
+    def has_replica(self) -> bool:
+        return self._replica is not None
+
+    @property
+    def replica_lag(self) -> float | None:
+        return self._replica_lag
+
+    async def start(self):
+        if self._replica is not None and self._lag_check_task is None:
+            self._lag_check_task = asyncio.create_task(self._check_replica_lag())
+
+    async def stop(self):
+        if self._lag_check_task is not None:
+            self._lag_check_task.cancel()
+            try:
+                await self._lag_check_task
+            except asyncio.CancelledError:
+                pass
+            self._lag_check_task = None
+
+    async def close(self):
+        await self.stop()
+        if self._replica is not None:
+            await self._replica.close()
+        await super().close()
+
+    @contextlib.asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        client_id = self._request_client_id()
+        if client_id is not None and self._replica is not None:
+            await self._pin(client_id)
+
+        connection = _unit_of_work_connection.get()
+        if connection is not None:
+            async with self._joined_session(connection) as session:
+                yield session
+            return
+
+        async with super().session() as session:
+            yield session
+
+    @contextlib.asynccontextmanager
+    async def primary_session(self) -> AsyncIterator[AsyncSession]:
+        async with super().session() as session:
+            yield session
+
+    @contextlib.asynccontextmanager
+    async def read_session(self) -> AsyncIterator[AsyncSession]:
+        connection = _unit_of_work_connection.get()
+        if connection is not None:
+            # the reads of a unit of work see its own writes
+            async with self._joined_session(connection) as session:
+                yield session
+        elif await self._reads_from_replica():
+            async with self._replica.session() as session:
+                yield session
+        else:
+            async with self.primary_session() as session:
+                yield session
+
+    @contextlib.asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[None]:
+        """
+        Shares one connection and one transaction on the primary between all the sessions opened inside, and
+        commits the transaction once on exit. Any exception rolls it back. A nested unit of work joins the outer one.
+        """
+        if _unit_of_work_connection.get() is not None:
+            yield
+            return
+
+        callbacks = []
+        async with self._engine.connect() as connection:
+            transaction = await connection.begin()
+            _unit_of_work_connection.set(connection)
+            _unit_of_work_callbacks.set(callbacks)
+            try:
+                yield
+            except BaseException:
+                if transaction.is_active:
+                    await transaction.rollback()
+                raise
+            finally:
+                # set instead of reset, the exit may run in another context than the entry
+                _unit_of_work_connection.set(None)
+                _unit_of_work_callbacks.set(None)
+
+            await transaction.commit()
+
+        for callback in callbacks:
+            await callback()
+
+    async def after_commit(self, callback: Callable[[], Awaitable[None]]):
+        """
+        Awaits the callback once the unit of work of the request is committed, or right away outside of one.
+        It is not awaited when the unit of work is rolled back.
+        """
+        callbacks = _unit_of_work_callbacks.get()
+        if callbacks is None:
+            await callback()
+        else:
+            callbacks.append(callback)
+
+    async def get_replica_lag(self) -> float:
+        async with self._replica.session() as session:
+            return float((await session.execute(_REPLICA_LAG_QUERY)).scalar_one())
+
+    @contextlib.asynccontextmanager
+    async def _joined_session(self, connection: AsyncConnection) -> AsyncIterator[AsyncSession]:
+        # the session commits without committing the transaction of the connection, and its rollback rolls it back
+        session = self._sessionmaker(bind=connection, join_transaction_mode="rollback_only")
+        try:
+            yield session
+        except BaseException:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def _pin(self, client_id: UUID):
+        try:
+            await self._client_pins.pin(client_id, self._pinning_window)
+        except Exception:
+            # the write goes on, the client may read from the replica before it has the write
+            logging.exception(f"Failed to pin the client {client_id} to the primary")
+
+    async def _reads_from_replica(self) -> bool:
+        if self._replica is None or self._replica_lag is None or self._replica_lag > self._max_lag:
+            return False
+
+        client_id = self._request_client_id()
+        if client_id is None:
+            return True
+
+        try:
+            return not await self._client_pins.is_pinned(client_id)
+        except Exception:
+            logging.exception("Failed to read the client pin, reading from the primary")
+            return False
+
+    async def _check_replica_lag(self):
+        while True:
+            try:
+                self._replica_lag = await self.get_replica_lag()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception("Replica lag check failed, reading from the primary")
+                self._replica_lag = None
+
+            await asyncio.sleep(self._lag_check_interval)
+
+    @staticmethod
+    def _request_client_id() -> UUID | None:
+        try:
+            return get_request_client().user_id
+        except LookupError:
+            return None
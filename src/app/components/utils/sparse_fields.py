@@ -0,0 +1,104 @@
+import functools
+from collections.abc import Callable
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from matter_exceptions.exceptions.fastapi import ValidationError
+from matter_persistence.foundation_model import FoundationModel
+from matter_persistence.sql.base import CustomBase
+from pydantic import Field, create_model
+from sqlalchemy import Select
+from sqlalchemy.orm import load_only
+
+Fields = tuple[str, ...]
+
+# set on every response, they are not columns
+_FOUNDATION_FIELDS = frozenset(FoundationModel.model_fields)
+
+# reduced DTOs kept, the fields are normalized so a set of fields has one DTO whatever their requested order
+_SPARSE_DTO_CACHE_SIZE = 256
+
+
+def parse_fields(fields: str | None, dto: type[FoundationModel]) -> Fields | None:
+    """
+    Translates the comma separated `fields` query parameter, given by alias or by name, into the DTO field names.
+
+    Returns None when all the fields are requested. The id is always part of the fields, first, followed by the others
+    in the order of the DTO.
+    """
+    if not fields:
+        return None
+
+    field_names = {}
+    for name, field_info in dto.model_fields.items():
+        if name not in _FOUNDATION_FIELDS:
+            field_names[name] = name
+            field_names[field_info.alias or name] = name
+
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    invalid_fields = [field for field in requested if field not in field_names]
+    if invalid_fields:
+        raise ValidationError(
+            description=f"Unknown fields: {invalid_fields}.",
+            detail={"invalid_fields": invalid_fields, "valid_fields": sorted(set(field_names.values()))},
+        )
+
+    selected = {field_names[field] for field in requested}
+    return ("id", *[name for name in dto.model_fields if name in selected and name != "id"])
+
+
+def load_fields(db_model: type[CustomBase], fields: Fields) -> Callable[[Select], Select]:
+    """
+    Narrows the SELECT to the columns of the fields.
+
+    The other columns are not loaded and raise on access instead of emitting a query.
+    """
+    option = load_only(*[getattr(db_model, field) for field in fields], raiseload=True)
+
+    def apply(statement: Select) -> Select:
+        return statement.options(option)
+
+    return apply
+
+
+@functools.lru_cache(maxsize=_SPARSE_DTO_CACHE_SIZE)
+def sparse_dto(dto: type[FoundationModel], fields: Fields | None) -> type[FoundationModel]:
+    """
+    Returns the DTO reduced to the fields, or the DTO itself when all the fields are requested.
+    """
+    if fields is None:
+        return dto
+
+    return create_model(
+        f"Sparse{dto.__name__}",
+        __base__=FoundationModel,
+        **{field: (dto.model_fields[field].annotation, dto.model_fields[field]) for field in fields},
+    )
+
+
+@functools.lru_cache(maxsize=_SPARSE_DTO_CACHE_SIZE)
+def sparse_list_dto(
+    list_dto: type[FoundationModel], items_field: str, item_dto: type[FoundationModel], fields: Fields | None
+) -> type[FoundationModel]:
+    """
+    Returns the list DTO with its items reduced to the fields, or the list DTO itself when all the fields are requested.
+    """
+    if fields is None:
+        return list_dto
+
+    return create_model(
+        f"Sparse{list_dto.__name__}",
+        __base__=list_dto,
+        **{
+            items_field: (
+                List[sparse_dto(item_dto, fields)],
+                Field(..., alias=list_dto.model_fields[items_field].alias),
+            )
+        },
+    )
+
+
+def sparse_response(response_dto: FoundationModel, fields: Fields | None) -> FoundationModel | JSONResponse:
+    # the reduced DTOs don't match the response model of the endpoint, so they are serialized here
+    return response_dto if fields is None else JSONResponse(content=jsonable_encoder(response_dto))
@@ -50,6 +50,7 @@ async def _app_lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
     """
     logging.debug("Initiating dependencies...")
     Dependencies.start()
+    await Dependencies.start_background_tasks()
     logging.debug("Done initiating dependencies.")
 
     yield
@@ -1,12 +1,16 @@
 import logging
+from collections.abc import AsyncIterator
 
 from matter_persistence.redis.manager import CacheManager
 from matter_persistence.redis.utils import get_connection_pool
-from matter_persistence.sql.manager import DatabaseManager
 
 from app.components.data_metrics.dal import DataMetricDAL
 from app.components.data_metrics.service import DataMetricService
+from app.components.events.archive import EventArchiver, LocalArchiveStore
+from app.components.events.change_stream import ChangeStream
 from app.components.events.dal import EventDAL
+from app.components.events.event_writer import EventWriter
+from app.components.events.outbox_relay import MemoryOutboxSink, OutboxRelay, RedisStreamOutboxSink
 from app.components.events.service import EventService
 from app.components.health.dal import HealthDAL
 from app.components.health.service import HealthService
@@ -18,7 +22,10 @@ from app.components.metrics.dal import MetricDAL
 from app.components.metrics.service import MetricService
 from app.components.properties.dal import PropertyDAL
 from app.components.properties.service import PropertyService
+from app.components.utils.client_pins import RedisClientPins
 from app.components.utils.meta_data_service import MetaDataService
+from app.components.utils.property_cache import PropertyCache
+from app.components.utils.replicated_database_manager import ReplicatedDatabaseManager
 from app.env import SETTINGS
 
 
@@ -29,6 +36,9 @@ class Dependencies:
     _property_service: PropertyService
     _property_dal: PropertyDAL
 
+    _meta_data_service: MetaDataService
+    _property_cache: PropertyCache
+
     _metric_set_service: MetricSetService
     _metric_set_dal: MetricSetDAL
 
@@ -43,39 +53,70 @@ class Dependencies:
 
     _event_service: EventService
     _event_dal: EventDAL
+    _event_writer: EventWriter | None
+    _outbox_relay: OutboxRelay
+    _change_stream: ChangeStream
 
-    _database_manager: DatabaseManager
+    _database_manager: ReplicatedDatabaseManager
     _cache_manager: CacheManager
 
     @classmethod
     def start(cls):
-        logging.debug("Database manager initialization...")
-        cls._database_manager = DatabaseManager(
-            host=SETTINGS.db_url.replace("postgresql:", "postgresql+asyncpg:"), engine_kwargs={"echo": True}
-        )
-        logging.debug("Database manager initialized")
         logging.debug("Cache manager initialization...")
-        cls._cache_manager = CacheManager(
-            connection_pool=get_connection_pool(
-                host=SETTINGS.cache_endpoint_url,
-                port=SETTINGS.cache_port,
-                password=SETTINGS.redis_password,
-                db=SETTINGS.redis_db,
-            ),
+        connection_pool = get_connection_pool(
+            host=SETTINGS.cache_endpoint_url,
+            port=SETTINGS.cache_port,
+            password=SETTINGS.redis_password,
+            db=SETTINGS.redis_db,
         )
+        cls._cache_manager = CacheManager(connection_pool=connection_pool)
+        cls._property_cache = PropertyCache(connection_pool=connection_pool)
         logging.debug("Cache manager initialized")
+        logging.debug("Database manager initialization...")
+        cls._database_manager = ReplicatedDatabaseManager(
+            host=SETTINGS.db_url.replace("postgresql:", "postgresql+asyncpg:"),
+            replica_host=SETTINGS.db_replica_url.replace("postgresql:", "postgresql+asyncpg:")
+            if SETTINGS.db_replica_url
+            else None,
+            engine_kwargs={"echo": True},
+            pinning_window=SETTINGS.db_read_your_writes_window,
+            max_lag=SETTINGS.db_replica_max_lag,
+            lag_check_interval=SETTINGS.db_replica_lag_check_interval,
+            # shared by the instances, the next request of a client can be served by another one
+            client_pins=RedisClientPins(connection_pool=connection_pool),
+        )
+        logging.debug("Database manager initialized")
         logging.debug("Services and DAL initialization...")
         cls._health_dal = HealthDAL(cache_manager=cls.cache_manager(), database_manager=cls.db_manager())
         cls._health_service = HealthService(dal=cls._health_dal)
 
         cls._event_dal = EventDAL(database_manager=cls.db_manager())
-        cls._event_service = EventService(dal=cls._event_dal)
+        cls._event_writer = (
+            EventWriter(dal=cls._event_dal, database_manager=cls.db_manager())
+            if SETTINGS.event_writer_enabled
+            else None
+        )
+        cls._change_stream = ChangeStream(connection_pool=connection_pool)
+        cls._event_service = EventService(
+            dal=cls._event_dal, event_writer=cls._event_writer, change_stream=cls._change_stream
+        )
+        cls._outbox_relay = OutboxRelay(
+            dal=cls._event_dal,
+            sink=RedisStreamOutboxSink(connection_pool=connection_pool)
+            if SETTINGS.outbox_sink == "redis"
+            else MemoryOutboxSink(),
+        )
 
         cls._property_dal = PropertyDAL(database_manager=cls.db_manager())
-        cls._property_service = PropertyService(dal=cls._property_dal, cache_manager=cls.cache_manager())
+        cls._property_service = PropertyService(
+            dal=cls._property_dal,
+            property_cache=cls._property_cache,
+            database_manager=cls.db_manager(),
+        )
 
         cls._meta_data_service = MetaDataService(
-            property_service=cls._property_service, cache_manager=cls._cache_manager
+            property_service=cls._property_service,
+            property_cache=cls._property_cache,
         )
 
         cls._metric_set_dal = MetricSetDAL(database_manager=cls.db_manager())
@@ -93,11 +134,34 @@ class Dependencies:
         cls._metric_service = MetricService(dal=cls._metric_dal, meta_data_service=cls._meta_data_service)
         logging.info("Services and DAL initialized")
 
+    @classmethod
+    async def start_background_tasks(cls):
+        await cls._property_cache.start()
+        await cls._database_manager.start()
+        await cls._outbox_relay.start()
+        await cls._change_stream.start()
+        if cls._event_writer is not None:
+            await cls._event_writer.start()
+
     @classmethod
     async def stop(cls):
+        # the queued events are drained before the database connections are closed
+        if cls._event_writer is not None:
+            await cls._event_writer.stop()
+        await cls._outbox_relay.stop()
+        await cls._change_stream.stop()
+        await cls._property_cache.stop()
         await cls._cache_manager.close_connection_pool()
         await cls._database_manager.close()
 
+    @classmethod
+    async def unit_of_work(cls) -> AsyncIterator[None]:
+        """
+        Request-scoped unit of work: the writes of the request and their events are committed once, together.
+        """
+        async with cls._database_manager.unit_of_work():
+            yield
+
     @classmethod
     def health_service(cls) -> HealthService:
         return cls._health_service
@@ -126,10 +190,18 @@ class Dependencies:
     def event_service(cls) -> EventService:
         return cls._event_service
 
+    @classmethod
+    def event_archiver(
+        cls,
+        directory: str = SETTINGS.event_archive_directory,
+        batch_size: int = SETTINGS.event_archive_batch_size,
+    ) -> EventArchiver:
+        return EventArchiver(dal=cls._event_dal, store=LocalArchiveStore(directory=directory), batch_size=batch_size)
+
     @classmethod
     def cache_manager(cls) -> CacheManager:
         return cls._cache_manager
 
     @classmethod
-    def db_manager(cls) -> DatabaseManager:
+    def db_manager(cls) -> ReplicatedDatabaseManager:
         return cls._database_manager
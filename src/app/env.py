@@ -20,10 +20,45 @@ class Settings(BaseSettings):
     pg_connpoolsize: int = 10
     migrations_folder: str = "migrations"
 
+    # Read replica, the get and find paths read from it when set
+    db_replica_url: str | None = None
+    db_replica_max_lag: float = 5  # seconds, above it the reads go to the primary
+    db_replica_lag_check_interval: float = 5
+    db_read_your_writes_window: float = 10  # seconds a client reads from the primary after a write
+    db_read_your_writes_key_prefix: str = "read_your_writes"  # Redis keys of the clients pinned to the primary
+
+    # Events, written in batches in the background when enabled instead of in the request transaction
+    event_writer_enabled: bool = False
+    event_writer_max_queue_size: int = 10000  # enqueuing waits for room above it
+    event_writer_batch_size: int = 500
+    event_writer_flush_interval: float = 0.05  # seconds a batch waits for more events
+    event_writer_retry_backoff: float = 0.1  # seconds before retrying a failed batch, doubled on each retry
+    event_writer_max_retry_backoff: float = 30
+    event_writer_stop_max_retries: int = 3  # retries of a failed batch while stopping, it is dropped after them
+
+    # Change stream, the events are relayed from the outbox table to the sink
+    outbox_sink: Literal["memory", "redis"] = "redis"
+    outbox_stream: str = "entity_changes"
+    outbox_stream_max_length: int = 1_000_000  # approximate, the older changes are trimmed
+    outbox_batch_size: int = 500
+    outbox_poll_interval: float = 0.2  # seconds between polls once the outbox is drained
+
+    # Live events endpoint, fed from the change stream
+    event_stream_subscriber_queue_size: int = 1000  # a subscriber falling further behind is disconnected
+    event_stream_heartbeat_interval: float = 15  # seconds between keep-alive comments without changes
+
+    # Event archival, the events older than the retention are archived to files and deleted
+    event_retention_days: int = 365
+    event_archive_directory: str = "event_archive"
+    event_archive_batch_size: int = 10000
+
     # Pagination
     pagination_limit_max: int = 1000
     pagination_limit_default: int = 100
 
+    # Bulk endpoints, the items of a request are written in one transaction
+    bulk_max_items: int = 1000
+
     # Cache
     cache_endpoint_url: str = "metric-metadata-redis.redis"
     redis_password: str
@@ -36,6 +71,15 @@ class Settings(BaseSettings):
     cache_error_expiration: int = 60 * 15
     cache_lock_expiration: int = 10
     cache_flag_expiration: int = 60 * 10
+    cache_property_local_expiration: int = 60
+    cache_property_invalidation_channel: str = "property_cache_invalidation"
+    cache_count_expiration: int = 30  # search counts, kept per instance
+    cache_count_max_entries: int = 1024
+
+    # Entity types whose search endpoints resolve the metadata property names in SQL instead of the property cache
+    meta_data_resolved_in_sql: list[str] = []
+    # Entity types whose get and search endpoints read plain rows with Core statements instead of ORM entities
+    core_read_path: list[str] = []
 
     # Observability
     sentry_dsn: str
@@ -24,9 +24,11 @@ from app.components.properties.dal import PropertyDAL
 from app.components.properties.models.property import PropertyModel
 from app.components.properties.service import PropertyService
 from app.components.utils.meta_data_service import MetaDataService
+from app.components.utils.property_cache import PropertyCache
+from app.components.utils.replicated_database_manager import ReplicatedDatabaseManager
 from matter_persistence.redis.manager import CacheManager
 from matter_persistence.redis.utils import get_connection_pool
-from matter_persistence.sql.manager import DatabaseManager
+from redis import asyncio as aioredis
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncConnection
 from testcontainers.core.container import DockerContainer
@@ -66,24 +68,32 @@ def aws_localstack_container() -> Generator[DockerContainer, None, None]:
 
 
 @pytest.fixture
-def database_manager(postgres_container: PostgresContainer) -> DatabaseManager:
-    return DatabaseManager(
+def database_manager(postgres_container: PostgresContainer) -> ReplicatedDatabaseManager:
+    return ReplicatedDatabaseManager(
         postgres_container.get_connection_url(driver="asyncpg"),
-        {"echo": True},
+        engine_kwargs={"echo": True},
     )
 
 
 @pytest.fixture
-def cache_manager(redis_container: RedisContainer) -> CacheManager:
-    return CacheManager(
-        connection_pool=get_connection_pool(
-            host=redis_container.get_container_host_ip(), port=redis_container.get_exposed_port(6379), db=0
-        )
+def redis_connection_pool(redis_container: RedisContainer) -> aioredis.ConnectionPool:
+    return get_connection_pool(
+        host=redis_container.get_container_host_ip(), port=redis_container.get_exposed_port(6379), db=0
     )
 
 
+@pytest.fixture
+def cache_manager(redis_connection_pool: aioredis.ConnectionPool) -> CacheManager:
+    return CacheManager(connection_pool=redis_connection_pool)
+
+
+@pytest.fixture
+def property_cache(redis_connection_pool: aioredis.ConnectionPool) -> PropertyCache:
+    return PropertyCache(connection_pool=redis_connection_pool)
+
+
 @pytest_asyncio.fixture
-async def initialize_db(database_manager: DatabaseManager) -> AsyncGenerator[None, None]:
+async def initialize_db(database_manager: ReplicatedDatabaseManager) -> AsyncGenerator[None, None]:
     def run_upgrade(connection, cfg):
         cfg.attributes["connection"] = connection
         command.upgrade(cfg, "head")
@@ -102,13 +112,13 @@ async def initialize_db(database_manager: DatabaseManager) -> AsyncGenerator[Non
 
 
 @pytest.fixture
-def property_dal(database_manager: DatabaseManager, initialize_db: None):
+def property_dal(database_manager: ReplicatedDatabaseManager, initialize_db: None):
     return PropertyDAL(database_manager=database_manager)
 
 
 @pytest.fixture
-def property_service(property_dal, cache_manager):
-    return PropertyService(dal=property_dal, cache_manager=cache_manager)
+def property_service(property_dal, property_cache, database_manager):
+    return PropertyService(dal=property_dal, property_cache=property_cache, database_manager=database_manager)
 
 
 @pytest.fixture
@@ -122,12 +132,12 @@ def property_example():
 
 
 @pytest.fixture
-def meta_data_service(property_service, cache_manager):
-    return MetaDataService(property_service=property_service, cache_manager=cache_manager)
+def meta_data_service(property_service, property_cache):
+    return MetaDataService(property_service=property_service, property_cache=property_cache)
 
 
 @pytest.fixture
-def metric_set_tree_dal(database_manager: DatabaseManager, initialize_db: None):
+def metric_set_tree_dal(database_manager: ReplicatedDatabaseManager, initialize_db: None):
     return MetricSetTreeDAL(database_manager=database_manager)
 
 
@@ -148,7 +158,7 @@ def metric_set_tree_example():
 
 
 @pytest.fixture
-def metric_set_dal(database_manager: DatabaseManager, initialize_db: None):
+def metric_set_dal(database_manager: ReplicatedDatabaseManager, initialize_db: None):
     return MetricSetDAL(database_manager=database_manager)
 
 
@@ -182,7 +192,7 @@ def metric_service(metric_dal, meta_data_service):
 
 
 @pytest.fixture
-def metric_dal(database_manager: DatabaseManager, initialize_db: None):
+def metric_dal(database_manager: ReplicatedDatabaseManager, initialize_db: None):
     return MetricDAL(database_manager=database_manager)
 
 
@@ -202,7 +212,7 @@ def data_metric_service(data_metric_dal, meta_data_service):
 
 
 @pytest.fixture
-def data_metric_dal(database_manager: DatabaseManager, initialize_db: None):
+def data_metric_dal(database_manager: ReplicatedDatabaseManager, initialize_db: None):
     return DataMetricDAL(database_manager=database_manager)
 
 
@@ -217,7 +227,7 @@ def event_service(event_dal):
 
 
 @pytest.fixture
-def event_dal(database_manager: DatabaseManager, initialize_db: None):
+def event_dal(database_manager: ReplicatedDatabaseManager, initialize_db: None):
     return EventDAL(database_manager=database_manager)
 
 
@@ -1,8 +1,12 @@
+from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
 import pytest
+from app.common.enums.enums import EventTypeEnum
+from app.components.events.archive import EventArchiver, LocalArchiveStore
 from app.components.events.dal import EventDAL
 from app.components.events.models.event import EventModel
+from app.components.events.outbox_relay import MemoryOutboxSink, OutboxRelay
 from matter_persistence.sql.exceptions import DatabaseRecordNotFoundError
 
 
@@ -100,3 +104,40 @@ async def test_delete_event_permanent_integration(event_dal: EventDAL, event_exa
     # Assert: Verify the event no longer exists
     with pytest.raises(DatabaseRecordNotFoundError):
         await event_dal.get_event(created_event.id)
+
+
+# Integration test for streaming and deleting the events before a cutoff
+@pytest.mark.asyncio
+async def test_stream_and_delete_events_before_integration(event_dal: EventDAL, event_example: EventModel):
+    # Arrange: Create an event, and set the cutoff after it
+    created_event = await event_dal.create_event(event_example)
+    before = datetime.now(tz=timezone.utc) + timedelta(seconds=1)
+
+    # Act: Stream the events before the cutoff, then delete them
+    batches = [batch async for batch in event_dal.stream_events_before(before=before, batch_size=1)]
+    deleted = await event_dal.delete_events_before(before=before, batch_size=1)
+
+    # Assert: The event is streamed and deleted
+    assert [[event.id for event in batch] for batch in batches] == [[created_event.id]]
+    assert deleted == 1
+    with pytest.raises(DatabaseRecordNotFoundError):
+        await event_dal.get_event(created_event.id)
+
+
+# Integration test for compacting the archived events without publishing the snapshots
+@pytest.mark.asyncio
+async def test_compaction_keeps_the_outbox_empty_integration(event_dal: EventDAL, event_example: EventModel, tmp_path):
+    # Arrange: Create an UPDATE event, and relay its outbox entry
+    event_example.event_type = EventTypeEnum.UPDATED
+    await event_dal.create_event(event_example)
+    outbox_relay = OutboxRelay(dal=event_dal, sink=MemoryOutboxSink(), batch_size=10)
+    await outbox_relay.relay()
+    before = datetime.now(tz=timezone.utc) + timedelta(seconds=1)
+
+    # Act: Archive the event, compacting it into a snapshot
+    archiver = EventArchiver(dal=event_dal, store=LocalArchiveStore(directory=str(tmp_path)), batch_size=10)
+    result = await archiver.archive(before=before, compact=True)
+
+    # Assert: The snapshot is created, without any outbox entry to relay
+    assert result == (1, 1, 1)
+    assert await outbox_relay.relay() == 0
@@ -1,6 +1,12 @@
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
 import pytest
+from app.common.enums.enums import EntityTypeEnum, EventTypeEnum
 from app.components.events.models.event import EventModel
-from app.components.events.service import EventService
+from app.components.events.outbox_relay import MemoryOutboxSink, OutboxRelay
+from app.components.events.service import HISTORY_SORT_FIELD, EventService
+from app.components.utils.pagination import next_cursor
 from matter_exceptions.exceptions.fastapi import ServerError
 
 
@@ -84,3 +90,102 @@ async def test_create_event_database_error_integration(event_service: EventServi
     # Act + Assert: Ensure a ServerError is raised
     with pytest.raises(ServerError):
         await event_service.create_event(event_example)
+
+
+# Integration test for relaying the events to the change stream
+@pytest.mark.asyncio
+async def test_relay_outbox_integration(event_service: EventService, event_dal, event_example: EventModel):
+    # Arrange: Create an event, the outbox entry is written in its transaction
+    created_event = await event_service.create_event(event_example)
+    sink = MemoryOutboxSink()
+    outbox_relay = OutboxRelay(dal=event_dal, sink=sink, batch_size=10)
+
+    # Act: Relay the outbox twice
+    relayed = await outbox_relay.relay()
+    relayed_again = await outbox_relay.relay()
+
+    # Assert: The event is published once and removed from the outbox
+    assert (relayed, relayed_again) == (1, 0)
+    assert [message["event_id"] for message in sink.messages] == [str(created_event.id)]
+    assert sink.messages[0]["entity_type"] == event_example.entity_type.value
+
+
+# Integration test for finding the events of a time range, in the partitions of its months
+@pytest.mark.asyncio
+async def test_find_events_created_range_integration(event_service: EventService, event_example: EventModel):
+    # Arrange: Create an event now
+    created_event = await event_service.create_event(event_example)
+    now = datetime.now(tz=timezone.utc)
+
+    # Act: Search the hour around it, then the previous day
+    events = await event_service.find_events(
+        filters={"created_from": now - timedelta(hours=1), "created_to": now + timedelta(hours=1)}
+    )
+    previous_day_events = await event_service.find_events(
+        filters={"created_from": now - timedelta(days=2), "created_to": now - timedelta(days=1)}
+    )
+
+    # Assert: Only the range including the event finds it
+    assert [event.id for event in events] == [created_event.id]
+    assert previous_day_events == []
+
+
+# Integration test for creating the upcoming partitions of the events
+@pytest.mark.asyncio
+async def test_manage_partitions_integration(event_service: EventService, event_dal):
+    # Act: Create the partitions of the next year, twice
+    created, _ = await event_service.manage_partitions(months_ahead=12)
+    created_again, detached = await event_service.manage_partitions(months_ahead=12)
+
+    # Assert: The migration created the first months, the missing ones are created once
+    partitions = await event_dal.find_event_partitions()
+    assert set(created) <= set(partitions)
+    assert "events_default" in partitions
+    assert (created_again, detached) == ([], [])
+
+
+# Integration test for creating the partition of a month whose events landed in the default partition
+@pytest.mark.asyncio
+async def test_manage_partitions_moves_the_events_out_of_the_default_partition(event_service: EventService, event_dal):
+    # Arrange: Create an event in a month without partition yet
+    created = datetime(2099, 1, 15, tzinfo=timezone.utc)
+    created_event = await event_service.create_event(
+        EventModel(
+            event_type=EventTypeEnum.CREATED, entity_type=EntityTypeEnum.METRIC, node_id=uuid4(), created=created
+        )
+    )
+
+    # Act: Create the partition of its month
+    created_partitions = await event_dal.create_event_partitions([date(2099, 1, 1)])
+
+    # Assert: The partition is created and the event is still found
+    assert created_partitions == ["events_y2099m01"]
+    assert (await event_service.get_event(created_event.id)).created == created
+
+
+# Integration test for reading the history of a node page by page
+@pytest.mark.asyncio
+async def test_find_node_history_integration(event_service: EventService):
+    # Arrange: Create three events of a node, and one of another node
+    node_id = uuid4()
+    created_events = [
+        await event_service.create_event(
+            EventModel(event_type=event_type, entity_type=EntityTypeEnum.METRIC, node_id=node_id)
+        )
+        for event_type in (EventTypeEnum.CREATED, EventTypeEnum.UPDATED, EventTypeEnum.UPDATED)
+    ]
+    await event_service.create_event(
+        EventModel(event_type=EventTypeEnum.CREATED, entity_type=EntityTypeEnum.METRIC, node_id=uuid4())
+    )
+
+    # Act: Read the history two events at a time
+    first_page = await event_service.find_node_history(entity_type=EntityTypeEnum.METRIC, node_id=node_id, limit=2)
+    second_page = await event_service.find_node_history(
+        entity_type=EntityTypeEnum.METRIC,
+        node_id=node_id,
+        limit=2,
+        cursor=next_cursor(first_page, HISTORY_SORT_FIELD, 2),
+    )
+
+    # Assert: The events of the node are read newest first, once
+    assert [event.id for event in first_page + second_page] == [event.id for event in reversed(created_events)]
@@ -0,0 +1,164 @@
+import asyncio
+
+import pytest
+from app.common.enums.enums import EntityTypeEnum
+from app.components.metrics.models.metric import MetricModel
+from app.components.properties.models.property import PropertyModel
+from app.components.properties.models.property_update import PropertyUpdateModel
+from app.components.properties.service import PropertyService
+from app.components.utils.meta_data_service import MetaDataService
+from app.components.utils.property_cache import PropertyCache
+from matter_exceptions.exceptions.fastapi import ValidationError
+
+
+# Integration test for converting metadata without hitting the cache twice
+@pytest.mark.asyncio
+async def test_convert_metadata_uses_local_cache_integration(
+    meta_data_service: MetaDataService,
+    property_service: PropertyService,
+    property_example: PropertyModel,
+    property_cache: PropertyCache,
+    mocker,
+):
+    # Arrange: Create a property and warm up the local cache
+    created_property = await property_service.create_property(property_example)
+    await meta_data_service.convert_metadata_names_to_ids(EntityTypeEnum.METRIC, {})
+    get_property_maps = mocker.spy(property_cache, "get_property_maps")
+    get_property_names = mocker.spy(property_cache, "get_property_names")
+
+    # Act: Convert the metadata in both directions
+    meta_data_ids = await meta_data_service.convert_metadata_names_to_ids(
+        EntityTypeEnum.METRIC, {property_example.property_name: "value"}
+    )
+    meta_data_names = await meta_data_service.convert_metadata_ids_to_names(EntityTypeEnum.METRIC, meta_data_ids)
+
+    # Assert: The conversion is correct and Redis was not queried
+    assert meta_data_ids == {str(created_property.id): "value"}
+    assert meta_data_names == {property_example.property_name: "value"}
+    get_property_maps.assert_not_called()
+    get_property_names.assert_not_called()
+
+
+# Integration test for dropping the local cache after a property change
+@pytest.mark.asyncio
+async def test_property_change_invalidates_local_cache_integration(
+    meta_data_service: MetaDataService,
+    property_service: PropertyService,
+    property_example: PropertyModel,
+):
+    # Arrange: Warm up the local cache before the property exists
+    assert await meta_data_service.convert_metadata_names_to_ids(EntityTypeEnum.METRIC, {}) == {}
+
+    # Act: Create the property
+    created_property = await property_service.create_property(property_example)
+
+    # Assert: The new property is visible right away
+    meta_data_ids = await meta_data_service.convert_metadata_names_to_ids(
+        EntityTypeEnum.METRIC, {property_example.property_name: "value"}
+    )
+    assert meta_data_ids == {str(created_property.id): "value"}
+
+
+# Integration test for converting the metadata of many rows at once
+@pytest.mark.asyncio
+async def test_convert_many_ids_to_names_integration(
+    meta_data_service: MetaDataService,
+    property_service: PropertyService,
+    property_example: PropertyModel,
+    metric_example: MetricModel,
+):
+    # Arrange: Create a property and two rows using it, one of them without metadata
+    created_property = await property_service.create_property(property_example)
+    metric_example.meta_data = {str(created_property.id): "value"}
+    empty_metric = MetricModel(meta_data=None)
+
+    # Act: Convert the metadata of both rows
+    rows = await meta_data_service.convert_many_ids_to_names(EntityTypeEnum.METRIC, [metric_example, empty_metric])
+
+    # Assert: Every row's metadata is keyed by property name
+    assert rows[0].meta_data == {property_example.property_name: "value"}
+    assert rows[1].meta_data == {}
+
+
+# Integration test for coalescing concurrent cache misses into a single rebuild
+@pytest.mark.asyncio
+async def test_concurrent_cache_misses_rebuild_once_integration(
+    meta_data_service: MetaDataService,
+    property_service: PropertyService,
+    property_example: PropertyModel,
+    mocker,
+):
+    # Arrange: Create a property, which leaves the cache cold
+    await property_service.create_property(property_example)
+    find_properties = mocker.spy(property_service, "find_properties")
+
+    # Act: Convert metadata concurrently
+    results = await asyncio.gather(
+        *[
+            meta_data_service.convert_metadata_names_to_ids(
+                EntityTypeEnum.METRIC, {property_example.property_name: "value"}
+            )
+            for _ in range(10)
+        ]
+    )
+
+    # Assert: All conversions succeeded, but the properties were only loaded once
+    assert len({tuple(result.items()) for result in results}) == 1
+    find_properties.assert_called_once()
+
+
+# Integration test for rejecting metadata values of the wrong type
+@pytest.mark.asyncio
+async def test_convert_metadata_rejects_invalid_value_integration(
+    meta_data_service: MetaDataService,
+    property_service: PropertyService,
+    property_example: PropertyModel,
+):
+    # Arrange: Create a string property
+    await property_service.create_property(property_example)
+
+    # Act + Assert: A number is rejected for it
+    with pytest.raises(ValidationError):
+        await meta_data_service.convert_metadata_names_to_ids(
+            EntityTypeEnum.METRIC, {property_example.property_name: 1}
+        )
+
+
+# Integration test for reading only the needed property names from the cache
+@pytest.mark.asyncio
+async def test_convert_metadata_ids_to_names_reads_needed_fields_integration(
+    meta_data_service: MetaDataService,
+    property_service: PropertyService,
+    property_example: PropertyModel,
+    property_cache: PropertyCache,
+):
+    # Arrange: Create a property and populate the cached maps
+    created_property = await property_service.create_property(property_example)
+    await meta_data_service.convert_metadata_names_to_ids(EntityTypeEnum.METRIC, {})
+
+    # Act: Read a single property name straight from the cache
+    property_names = await property_cache.get_property_names(EntityTypeEnum.METRIC, [str(created_property.id)])
+
+    # Assert: Only the requested field is returned
+    assert property_names == {str(created_property.id): property_example.property_name}
+
+
+# Integration test for updating a single cached property on rename
+@pytest.mark.asyncio
+async def test_property_rename_updates_cached_maps_integration(
+    meta_data_service: MetaDataService,
+    property_service: PropertyService,
+    property_example: PropertyModel,
+    property_cache: PropertyCache,
+):
+    # Arrange: Create a property and populate the cached maps
+    created_property = await property_service.create_property(property_example)
+    await meta_data_service.convert_metadata_names_to_ids(EntityTypeEnum.METRIC, {})
+
+    # Act: Rename the property
+    await property_service.update_property(created_property.id, PropertyUpdateModel(property_name="renamed"))
+
+    # Assert: The cached maps contain the new name only
+    names_to_ids, ids_to_names, _ = await property_cache.get_property_maps(EntityTypeEnum.METRIC)
+    assert names_to_ids == {"renamed": str(created_property.id)}
+    assert ids_to_names == {str(created_property.id): "renamed"}
@@ -103,6 +103,22 @@ async def test_update_metric_integration(metric_dal: MetricDAL, metric_example:
     assert fetched_metric.name == "Updated Metric Name"
 
 
+# Integration test for updating a deleted metric
+@pytest.mark.asyncio
+async def test_update_deleted_metric_integration(
+    metric_dal: MetricDAL, metric_example: MetricModel, metric_set_test_entry
+):
+    metric_set = await metric_set_test_entry
+    metric_example.metric_set_id = metric_set.id
+    # Act: Create and soft delete the metric
+    created_metric = await metric_dal.create_metric(metric_example)
+    await metric_dal.delete_metric(created_metric.id, soft_delete=True)
+
+    # Act + Assert: The update matches no row
+    with pytest.raises(DatabaseRecordNotFoundError):
+        await metric_dal.update_metric(created_metric.id, MetricUpdateModel(name="Updated Metric Name"))
+
+
 # Integration test for deleting a metric (soft delete)
 @pytest.mark.asyncio
 async def test_delete_metric_soft_integration(
@@ -141,3 +157,26 @@ async def test_delete_metric_permanent_integration(
     # Assert: Verify the metric no longer exists
     with pytest.raises(DatabaseRecordNotFoundError):
         await metric_dal.get_metric(created_metric.id)
+
+
+# Integration test for deleting an already deleted metric
+@pytest.mark.asyncio
+async def test_delete_deleted_metric_integration(
+    metric_dal: MetricDAL, metric_example: MetricModel, metric_set_test_entry
+):
+    metric_set = await metric_set_test_entry
+    metric_example.metric_set_id = metric_set.id
+    # Act: Create and soft delete the metric
+    created_metric = await metric_dal.create_metric(metric_example)
+    await metric_dal.delete_metric(created_metric.id, soft_delete=True)
+
+    # Act + Assert: A second soft delete matches no row
+    with pytest.raises(DatabaseRecordNotFoundError):
+        await metric_dal.delete_metric(created_metric.id, soft_delete=True)
+
+    # Act: A permanent delete still removes the soft deleted metric
+    await metric_dal.delete_metric(created_metric.id, soft_delete=False)
+
+    # Assert: Verify the metric no longer exists
+    with pytest.raises(DatabaseRecordNotFoundError):
+        await metric_dal.get_metric(created_metric.id)
@@ -1,8 +1,13 @@
+import uuid
+
 import pytest
+from app.common.enums.enums import CountModeEnum, EntityTypeEnum, EventTypeEnum, StatusEnum
+from app.components.events.models.event import EventModel
+from app.components.metrics.dtos import FullMetricOutDTO
 from app.components.metrics.models.metric import MetricModel
 from app.components.metrics.models.metric_update import MetricUpdateModel
 from app.components.metrics.service import MetricService
-from matter_exceptions.exceptions.fastapi import ValidationError
+from matter_exceptions.exceptions.fastapi import NotFoundError, ValidationError
 
 
 # Integration test for creating a metric
@@ -113,3 +118,269 @@ async def test_create_metric_metadata_conversion_integration(
     # Act + Assert: Check that metadata was is rejected
     with pytest.raises(ValidationError):
         await metric_service.create_metric(metric_example)
+
+
+# Integration test for resolving the metadata property names in SQL
+@pytest.mark.asyncio
+async def test_find_metrics_resolve_meta_data_in_sql_integration(
+    metric_service: MetricService,
+    metric_example: MetricModel,
+    metric_set_test_entry,
+    property_service,
+    property_example,
+):
+    metric_set = await metric_set_test_entry
+    metric_example.metric_set_id = metric_set.id
+    await property_service.create_property(property_example)
+    metric_example.meta_data = {"test_property": "value"}
+
+    # Act: Create a metric with metadata
+    await metric_service.create_metric(metric_example)
+
+    # Act: Fetch the metrics through both read paths
+    metrics_python = await metric_service.find_metrics(resolve_meta_data_in_sql=False)
+    metrics_sql = await metric_service.find_metrics(resolve_meta_data_in_sql=True)
+
+    # Assert: Both read paths return the metadata keyed by property name
+    assert metrics_sql[0].meta_data == {"test_property": "value"}
+    assert metrics_sql[0].meta_data == metrics_python[0].meta_data
+
+
+# Integration test for filtering metrics on metadata
+@pytest.mark.asyncio
+async def test_find_metrics_meta_data_filters_integration(
+    metric_service: MetricService,
+    metric_example: MetricModel,
+    metric_set_test_entry,
+    property_service,
+    property_example,
+):
+    metric_set = await metric_set_test_entry
+    metric_example.metric_set_id = metric_set.id
+    await property_service.create_property(property_example)
+    metric_example.meta_data = {"test_property": "value"}
+
+    # Act: Create a metric with metadata
+    created_metric = await metric_service.create_metric(metric_example)
+
+    # Assert: Only the matching filters find the metric
+    assert [m.id for m in await metric_service.find_metrics(meta_data_filters={"test_property": "value"})] == [
+        created_metric.id
+    ]
+    assert [m.id for m in await metric_service.find_metrics(meta_data_filters={"test_property": ["x", "value"]})] == [
+        created_metric.id
+    ]
+    assert await metric_service.find_metrics(meta_data_filters={"test_property": "other"}) == []
+    assert await metric_service.find_metrics(meta_data_filters={"test_property": None}) == []
+
+    # Act + Assert: Unknown properties are rejected
+    with pytest.raises(ValidationError):
+        await metric_service.find_metrics(meta_data_filters={"unknown_property": "value"})
+
+
+# Integration test for counting metrics
+@pytest.mark.asyncio
+async def test_count_metrics_integration(
+    metric_service: MetricService, metric_example: MetricModel, metric_set_test_entry
+):
+    metric_set = await metric_set_test_entry
+    metric_example.metric_set_id = metric_set.id
+    await metric_service.create_metric(metric_example)
+
+    # Act + Assert: Only the count modes return a total
+    assert await metric_service.count_metrics(count_mode=CountModeEnum.NONE) is None
+    assert await metric_service.count_metrics(count_mode=CountModeEnum.EXACT) == 1
+    assert await metric_service.count_metrics(count_mode=CountModeEnum.EXACT, filters={"name": "other"}) == 0
+    assert await metric_service.count_metrics(count_mode=CountModeEnum.ESTIMATED) >= 0
+
+
+# Integration test for reading sparse fieldsets
+@pytest.mark.asyncio
+async def test_get_metric_fields_integration(
+    metric_service: MetricService, metric_example: MetricModel, metric_set_test_entry
+):
+    metric_set = await metric_set_test_entry
+    metric_example.metric_set_id = metric_set.id
+    created_metric = await metric_service.create_metric(metric_example)
+
+    # Act: Fetch only the name, by id and through the search
+    fetched_metric = await metric_service.get_metric(created_metric.id, fields=("id", "name"))
+    found_metrics = await metric_service.find_metrics(fields=("id", "name"), sort_field="created")
+
+    # Assert: Only the requested columns are loaded
+    for metric in (fetched_metric, found_metrics[0]):
+        assert metric.name == metric_example.name
+        assert "meta_data" not in metric.__dict__
+        assert "status" not in metric.__dict__
+
+
+# Integration test for the Core read path
+@pytest.mark.asyncio
+async def test_core_read_path_integration(
+    metric_service: MetricService, metric_example: MetricModel, metric_set_test_entry
+):
+    metric_set = await metric_set_test_entry
+    metric_example.metric_set_id = metric_set.id
+    created_metric = await metric_service.create_metric(metric_example)
+
+    # Act: Read the metric through both read paths
+    orm_metric = await metric_service.get_metric(created_metric.id, core_read_path=False)
+    core_metric = await metric_service.get_metric(created_metric.id, core_read_path=True)
+    orm_metrics = await metric_service.find_metrics(sort_field="created", core_read_path=False)
+    core_metrics = await metric_service.find_metrics(sort_field="created", core_read_path=True)
+
+    # Assert: Both paths produce the same output
+    assert FullMetricOutDTO.parse_obj(core_metric) == FullMetricOutDTO.parse_obj(orm_metric)
+    assert [FullMetricOutDTO.parse_obj(metric) for metric in core_metrics] == [
+        FullMetricOutDTO.parse_obj(metric) for metric in orm_metrics
+    ]
+
+
+# Integration test for committing a metric and its event in one unit of work
+@pytest.mark.asyncio
+async def test_unit_of_work_commits_once_integration(
+    metric_service: MetricService, event_service, database_manager, metric_example: MetricModel, metric_set_test_entry
+):
+    metric_set = await metric_set_test_entry
+    metric_example.metric_set_id = metric_set.id
+
+    # Act: Create the metric and its event, then fail before the unit of work ends
+    with pytest.raises(RuntimeError):
+        async with database_manager.unit_of_work():
+            created_metric = await metric_service.create_metric(metric_example)
+            await event_service.create_event(
+                EventModel(
+                    event_type=EventTypeEnum.CREATED, entity_type=EntityTypeEnum.METRIC, node_id=created_metric.id
+                )
+            )
+            # Assert: The reads of the unit of work see its writes
+            assert (await metric_service.get_metric(created_metric.id)).id == created_metric.id
+            raise RuntimeError()
+
+    # Assert: Neither the metric nor its event were committed
+    assert await metric_service.find_metrics() == []
+    assert await event_service.find_events() == []
+
+    # Act: Create them again in a unit of work that succeeds
+    async with database_manager.unit_of_work():
+        created_metric = await metric_service.create_metric(
+            MetricModel(metric_set_id=metric_set.id, status=metric_example.status, name=metric_example.name)
+        )
+        await event_service.create_event(
+            EventModel(event_type=EventTypeEnum.CREATED, entity_type=EntityTypeEnum.METRIC, node_id=created_metric.id)
+        )
+
+    # Assert: Both were committed
+    assert [metric.id for metric in await metric_service.find_metrics()] == [created_metric.id]
+    assert [event.node_id for event in await event_service.find_events()] == [created_metric.id]
+
+
+# Integration test for creating metrics in bulk
+@pytest.mark.asyncio
+async def test_create_metrics_integration(
+    metric_service: MetricService, metric_example: MetricModel, metric_set_test_entry
+):
+    metric_set = await metric_set_test_entry
+    metric_example.metric_set_id = metric_set.id
+    invalid_metric = MetricModel(
+        metric_set_id=metric_set.id,
+        status=metric_example.status,
+        name="invalid_metric",
+        meta_data={"key": "value"},
+    )
+
+    # Act: Create a valid and an invalid metric in one batch
+    results = await metric_service.create_metrics([metric_example, invalid_metric])
+
+    # Assert: The valid metric is created and the invalid one reports its error
+    assert results[0].name == metric_example.name
+    assert isinstance(results[1], ValidationError)
+
+    # Assert: Only the valid metric exists in the database
+    metrics = await metric_service.find_metrics()
+    assert [metric.id for metric in metrics] == [results[0].id]
+
+
+# Integration test for getting metrics by ids
+@pytest.mark.asyncio
+async def test_get_metrics_integration(
+    metric_service: MetricService, metric_example: MetricModel, metric_set_test_entry
+):
+    metric_set = await metric_set_test_entry
+    metric_example.metric_set_id = metric_set.id
+    first_metric, second_metric = await metric_service.create_metrics(
+        [metric_example, MetricModel(metric_set_id=metric_set.id, status=metric_example.status, name="second_metric")]
+    )
+
+    # Act: Fetch the metrics together with an unknown id, in reverse creation order
+    metrics = await metric_service.get_metrics([second_metric.id, uuid.uuid4(), first_metric.id])
+
+    # Assert: The existing metrics are returned in the requested order
+    assert [metric.id for metric in metrics] == [second_metric.id, first_metric.id]
+
+
+# Integration test for updating metrics in bulk
+@pytest.mark.asyncio
+async def test_update_metrics_integration(
+    metric_service: MetricService, metric_example: MetricModel, metric_set_test_entry
+):
+    metric_set = await metric_set_test_entry
+    metric_example.metric_set_id = metric_set.id
+    (created_metric,) = await metric_service.create_metrics([metric_example])
+    unknown_metric_id = uuid.uuid4()
+
+    # Act: Patch the created metric and an unknown one
+    results = await metric_service.update_metrics(
+        [
+            (created_metric.id, MetricUpdateModel(status=StatusEnum.NOT_USED)),
+            (unknown_metric_id, MetricUpdateModel(status=StatusEnum.NOT_USED)),
+        ]
+    )
+
+    # Assert: Only the changed field of the existing metric is updated
+    assert results[0].status == StatusEnum.NOT_USED
+    assert results[0].name == metric_example.name
+    assert isinstance(results[1], NotFoundError)
+
+    fetched_metric = await metric_service.get_metric(created_metric.id)
+    assert fetched_metric.status == StatusEnum.NOT_USED
+
+
+# Integration test for updating the metrics matching filters
+@pytest.mark.asyncio
+async def test_update_metrics_where_integration(
+    metric_service: MetricService, event_service, metric_example: MetricModel, metric_set_test_entry
+):
+    metric_set = await metric_set_test_entry
+    metric_example.metric_set_id = metric_set.id
+    (created_metric,) = await metric_service.create_metrics([metric_example])
+    event_model = EventModel(
+        event_type=EventTypeEnum.UPDATED, entity_type=EntityTypeEnum.METRIC, new_data={"status": "not_used"}
+    )
+
+    # Act: Count the metrics to update without updating them
+    metric_ids = await metric_service.update_metrics_where(
+        filters={"metric_set_id": metric_set.id},
+        null_fields=["data_metric_id"],
+        metric_update_model=MetricUpdateModel(status=StatusEnum.NOT_USED),
+        event_model=event_model,
+        dry_run=True,
+    )
+
+    # Assert: The metric matches but is left unchanged
+    assert metric_ids == [created_metric.id]
+    assert (await metric_service.get_metric(created_metric.id)).status == StatusEnum.DEPLOYED
+
+    # Act: Update the metrics
+    metric_ids = await metric_service.update_metrics_where(
+        filters={"metric_set_id": metric_set.id},
+        null_fields=["data_metric_id"],
+        metric_update_model=MetricUpdateModel(status=StatusEnum.NOT_USED),
+        event_model=event_model,
+    )
+
+    # Assert: The metric is updated and its event recorded
+    assert metric_ids == [created_metric.id]
+    assert (await metric_service.get_metric(created_metric.id)).status == StatusEnum.NOT_USED
+    events = await event_service.find_events(filters={"node_id": created_metric.id})
+    assert [event.event_type for event in events] == [EventTypeEnum.UPDATED]
@@ -0,0 +1,39 @@
+from uuid import uuid4
+
+from app.components.properties.models.property import PropertyModel
+from app.components.properties.models.property_update import PropertyUpdateModel
+from app.components.utils.bulk_update_sql import bulk_update_statement
+from sqlalchemy.dialects import postgresql
+
+
+def compile_statement(statement):
+    return statement.compile(dialect=postgresql.dialect())
+
+
+def test_bulk_update_statement_updates_every_row_from_values():
+    statement = compile_statement(
+        bulk_update_statement(
+            PropertyModel,
+            {
+                uuid4(): PropertyUpdateModel(property_name="renamed"),
+                uuid4(): PropertyUpdateModel(is_required=True),
+            },
+        )
+    )
+
+    assert "FROM (VALUES" in str(statement)
+    assert "properties.id = patch.id AND properties.deleted IS NULL" in str(statement)
+    assert "property_name=coalesce(CAST(patch.property_name AS VARCHAR(100)), properties.property_name)" in str(
+        statement
+    )
+    assert "is_required=coalesce(CAST(patch.is_required AS BOOLEAN), properties.is_required)" in str(statement)
+
+
+def test_bulk_update_statement_skips_unchanged_fields():
+    statement = compile_statement(
+        bulk_update_statement(PropertyModel, {uuid4(): PropertyUpdateModel(property_description="description")})
+    )
+
+    assert "property_description=coalesce(" in str(statement)
+    assert "property_name=" not in str(statement)
+    assert "data_type=" not in str(statement)
@@ -0,0 +1,123 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from app.common.enums.enums import EntityTypeEnum, StatusEnum
+
+# the related models are imported so the mappers can be configured
+from app.components.data_metrics.models.data_metric import DataMetricModel  # noqa: F401
+from app.components.metric_set_trees.models.metric_set_tree import MetricSetTreeModel  # noqa: F401
+from app.components.metric_sets.models.metric_set import MetricSetModel  # noqa: F401
+from app.components.metrics.dtos import FullMetricOutDTO
+from app.components.metrics.models.metric import MetricModel
+from app.components.utils.core_read import PlainRow, find_rows, get_row, plain_columns
+from app.components.utils.meta_data_sql import meta_data_names_expression
+from matter_persistence.sql.exceptions import DatabaseInvalidSortFieldError
+from matter_persistence.sql.utils import SortMethodModel
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def mappings(self):
+        return self
+
+    def first(self):
+        return self._rows[0] if self._rows else None
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+class FakeSession:
+    """Returns the given rows and records the executed statements."""
+
+    def __init__(self, rows):
+        self._rows = rows
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        return FakeResult(self._rows)
+
+
+def get_metric_row():
+    return {
+        "id": uuid4(),
+        "metric_set_id": uuid4(),
+        "parent_section_id": None,
+        "parent_metric_id": None,
+        "data_metric_id": None,
+        "status": StatusEnum.DEPLOYED,
+        "name": "Metric",
+        "name_suffix": None,
+        "meta_data": {"key": "value"},
+        "created": datetime.now(timezone.utc),
+        "updated": None,
+        "deleted": None,
+    }
+
+
+def test_plain_columns_are_narrowed_to_the_fields():
+    sql = str(select(*plain_columns(MetricModel, ("id", "name"))).compile(dialect=postgresql.dialect()))
+
+    assert sql.startswith("SELECT metrics.id, metrics.name \nFROM metrics")
+
+
+def test_plain_columns_label_the_meta_data_names():
+    columns = plain_columns(MetricModel, meta_data_names=meta_data_names_expression(MetricModel, EntityTypeEnum.METRIC))
+
+    assert [column.name for column in columns][-1] == "meta_data_names"
+    assert len(columns) == len(MetricModel.__table__.c) + 1
+
+
+@pytest.mark.asyncio
+async def test_find_rows_filters_sorts_and_paginates():
+    row = get_metric_row()
+    session = FakeSession([row])
+
+    rows = await find_rows(
+        session=session,
+        db_model=MetricModel,
+        skip=10,
+        limit=5,
+        filters={"name": "Metric", "unknown": 1},
+        sort_field="name",
+        sort_method=SortMethodModel.DESC,
+        fields=("id", "name"),
+    )
+
+    assert rows == [PlainRow(**row)]
+    sql = session.statements[0]
+    assert sql.startswith("SELECT metrics.id, metrics.name \nFROM metrics")
+    assert "metrics.name = " in sql
+    assert "unknown" not in sql
+    assert "metrics.deleted IS NULL" in sql
+    assert "ORDER BY metrics.name DESC" in sql
+    assert "LIMIT " in sql and "OFFSET " in sql
+
+
+@pytest.mark.asyncio
+async def test_find_rows_rejects_unknown_sort_field():
+    with pytest.raises(DatabaseInvalidSortFieldError):
+        await find_rows(session=FakeSession([]), db_model=MetricModel, sort_field="unknown")
+
+
+@pytest.mark.asyncio
+async def test_get_row_returns_none_when_not_found():
+    assert await get_row(session=FakeSession([]), statement=select(*plain_columns(MetricModel))) is None
+
+
+@pytest.mark.asyncio
+async def test_plain_rows_parse_into_the_output_dtos():
+    row = get_metric_row()
+
+    metric = await get_row(session=FakeSession([row]), statement=select(*plain_columns(MetricModel)))
+    dto = FullMetricOutDTO.parse_obj(metric)
+
+    assert dto.id == row["id"]
+    assert dto.name == "Metric"
+    assert dto.meta_data == {"key": "value"}
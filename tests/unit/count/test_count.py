@@ -0,0 +1,106 @@
+import json
+
+import pytest
+from app.common.enums.enums import CountModeEnum
+from app.components.events.models.event import EventModel
+from app.components.utils.count_cache import CountCache
+from app.components.utils.count_sql import Explain, count, filtered_statement
+from sqlalchemy.dialects import postgresql
+
+
+class FakeResult:
+    def __init__(self, value):
+        self._value = value
+
+    def scalar_one(self):
+        return self._value
+
+
+class FakeSession:
+    """Returns the queued results in order and records the executed statements."""
+
+    def __init__(self, *results):
+        self._results = list(results)
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        return FakeResult(self._results.pop(0))
+
+
+@pytest.mark.asyncio
+async def test_count_cache_reuses_counts_for_equal_filters():
+    cache = CountCache(expiration=60, max_entries=10)
+    calls = []
+
+    async def count_rows():
+        calls.append(1)
+        return 42
+
+    first = await cache.get_or_count({"count_mode": CountModeEnum.EXACT, "filters": {"a": 1, "b": 2}}, count_rows)
+    second = await cache.get_or_count({"filters": {"b": 2, "a": 1}, "count_mode": CountModeEnum.EXACT}, count_rows)
+
+    assert first == second == 42
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_count_cache_expires():
+    cache = CountCache(expiration=0, max_entries=10)
+    calls = []
+
+    async def count_rows():
+        calls.append(1)
+        return len(calls)
+
+    assert await cache.get_or_count({"filters": None}, count_rows) == 1
+    assert await cache.get_or_count({"filters": None}, count_rows) == 2
+
+
+def test_filtered_statement_ignores_unknown_fields():
+    sql = str(
+        filtered_statement(EventModel, filters={"node_id": "x", "unknown": 1}).compile(dialect=postgresql.dialect())
+    )
+
+    assert "events.node_id = " in sql
+    assert "unknown" not in sql
+    assert "events.deleted IS NULL" in sql
+
+
+def test_explain_keeps_bound_parameters():
+    compiled = Explain(filtered_statement(EventModel, filters={"node_id": "x"})).compile(dialect=postgresql.dialect())
+
+    assert str(compiled).startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert "x" in compiled.params.values()
+
+
+@pytest.mark.asyncio
+async def test_exact_count():
+    session = FakeSession(3)
+
+    assert await count(session, EventModel, filters={"node_id": "x"}) == 3
+    assert session.statements[0].startswith("SELECT count(*)")
+
+
+@pytest.mark.asyncio
+async def test_estimated_count_of_unfiltered_table_reads_reltuples():
+    session = FakeSession(1000)
+
+    assert await count(session, EventModel, with_deleted=True, estimated=True) == 1000
+    assert "pg_class" in session.statements[0]
+
+
+@pytest.mark.asyncio
+async def test_estimated_count_falls_back_to_plan_without_statistics():
+    session = FakeSession(-1, json.dumps([{"Plan": {"Plan Rows": 12}}]))
+
+    assert await count(session, EventModel, with_deleted=True, estimated=True) == 12
+    assert session.statements[1].startswith("EXPLAIN")
+
+
+@pytest.mark.asyncio
+async def test_estimated_count_of_filtered_rows_reads_plan():
+    session = FakeSession([{"Plan": {"Plan Rows": 5}}])
+
+    assert await count(session, EventModel, filters={"node_id": "x"}, estimated=True) == 5
+    assert len(session.statements) == 1
@@ -0,0 +1,128 @@
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from app.common.enums.enums import EntityTypeEnum, EventTypeEnum
+from app.components.events.archive import ArchiveStore, EventArchiver, LocalArchiveStore, archive_file
+from app.components.events.models.event import EventModel
+
+BEFORE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class MemoryArchiveStore(ArchiveStore):
+    def __init__(self):
+        self.files = {}
+
+    async def write(self, name: str, data: bytes):
+        self.files[name] = data
+
+
+class FakeEventDAL:
+    """Streams the given events in batches and records the writes and the deletion."""
+
+    def __init__(self, event_models):
+        self.event_models = event_models
+        self.created = []
+        self.deleted_before = None
+
+    async def stream_events_before(self, before, batch_size):
+        for start in range(0, len(self.event_models), batch_size):
+            yield self.event_models[start : start + batch_size]
+
+    async def create_snapshot_events(self, event_models):
+        self.created.extend(event_models)
+        return event_models
+
+    async def delete_events_before(self, before, batch_size):
+        self.deleted_before = before
+        return len(self.event_models)
+
+
+def get_event_model(event_type: EventTypeEnum, node_id, new_data: dict | None, minutes: int) -> EventModel:
+    created = BEFORE - timedelta(days=1) + timedelta(minutes=minutes)
+    return EventModel(
+        id=uuid4(),
+        event_type=event_type,
+        entity_type=EntityTypeEnum.METRIC,
+        node_id=node_id,
+        user_id=None,
+        new_data=new_data,
+        created=created,
+        updated=created,
+    )
+
+
+def read_archive(data: bytes) -> list[dict]:
+    return [json.loads(line) for line in gzip.decompress(data).decode().splitlines()]
+
+
+def test_archive_file_is_compressed_json_lines():
+    event_model = get_event_model(EventTypeEnum.UPDATED, uuid4(), {"name": "metric"}, minutes=0)
+
+    records = read_archive(archive_file([event_model]))
+
+    assert records == [
+        {
+            "id": str(event_model.id),
+            "event_type": EventTypeEnum.UPDATED.value,
+            "entity_type": EntityTypeEnum.METRIC.value,
+            "node_id": str(event_model.node_id),
+            "user_id": None,
+            "new_data": {"name": "metric"},
+            "created": event_model.created.isoformat(),
+            "updated": event_model.updated.isoformat(),
+            "deleted": None,
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_local_archive_store_writes_the_file(tmp_path):
+    store = LocalArchiveStore(directory=str(tmp_path / "archive"))
+
+    await store.write("events.jsonl.gz", b"data")
+
+    assert (tmp_path / "archive" / "events.jsonl.gz").read_bytes() == b"data"
+
+
+@pytest.mark.asyncio
+async def test_archive_writes_a_file_per_batch_and_deletes():
+    node_id = uuid4()
+    event_models = [get_event_model(EventTypeEnum.UPDATED, node_id, {"index": index}, index) for index in range(5)]
+    dal = FakeEventDAL(event_models)
+    store = MemoryArchiveStore()
+
+    result = await EventArchiver(dal=dal, store=store, batch_size=2).archive(before=BEFORE)
+
+    assert result == (5, 5, 0)
+    assert sorted(store.files) == [f"events_20260101T000000_{index:06d}.jsonl.gz" for index in range(3)]
+    archived_ids = [record["id"] for data in store.files.values() for record in read_archive(data)]
+    assert sorted(archived_ids) == sorted(str(event_model.id) for event_model in event_models)
+    assert dal.created == []
+    assert dal.deleted_before == BEFORE
+
+
+@pytest.mark.asyncio
+async def test_archive_compacts_the_updates_into_a_snapshot_per_node():
+    updated_node_id, created_node_id, deleted_node_id = uuid4(), uuid4(), uuid4()
+    dal = FakeEventDAL(
+        [
+            get_event_model(EventTypeEnum.CREATED, updated_node_id, {"name": "metric", "unit": "s"}, 0),
+            get_event_model(EventTypeEnum.CREATED, created_node_id, {"name": "other"}, 1),
+            get_event_model(EventTypeEnum.UPDATED, updated_node_id, {"unit": "ms"}, 2),
+            get_event_model(EventTypeEnum.UPDATED, deleted_node_id, {"name": "deleted"}, 3),
+            get_event_model(EventTypeEnum.UPDATED, updated_node_id, {"description": "latency"}, 4),
+            get_event_model(EventTypeEnum.DELETED, deleted_node_id, None, 5),
+        ]
+    )
+
+    result = await EventArchiver(dal=dal, store=MemoryArchiveStore(), batch_size=4).archive(before=BEFORE, compact=True)
+
+    assert result == (6, 6, 1)
+    [snapshot] = dal.created
+    assert snapshot.event_type == EventTypeEnum.UPDATED
+    assert snapshot.node_id == updated_node_id
+    assert snapshot.created == BEFORE
+    assert snapshot.new_data == {"name": "metric", "unit": "ms", "description": "latency"}
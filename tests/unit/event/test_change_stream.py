@@ -0,0 +1,118 @@
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+from app.common.enums.enums import EntityTypeEnum, EventTypeEnum
+from app.components.events.change_stream import ChangeStream, is_stream_id
+from app.components.events.service import EventService
+
+
+def get_change_stream(**kwargs) -> ChangeStream:
+    # the fan-out is tested without a reader, the changes are published directly
+    return ChangeStream(connection_pool=None, **kwargs)
+
+
+def get_message(entity_type=EntityTypeEnum.METRIC, node_id=None) -> dict[str, str]:
+    return {
+        "sequence": "1",
+        "event_id": str(uuid4()),
+        "event_type": EventTypeEnum.UPDATED.value,
+        "entity_type": entity_type.value,
+        "node_id": str(node_id or uuid4()),
+        "user_id": "",
+        "new_data": json.dumps({"name": "metric"}),
+        "created": "2026-01-01T00:00:00+00:00",
+    }
+
+
+async def take(changes, count: int) -> list:
+    return [await anext(changes) for _ in range(count)]
+
+
+def test_is_stream_id():
+    assert is_stream_id("1700000000000-0")
+    assert not is_stream_id("1700000000000")
+    assert not is_stream_id("$")
+
+
+@pytest.mark.asyncio
+async def test_changes_are_fanned_out_to_every_subscriber():
+    change_stream = get_change_stream(heartbeat_interval=60)
+    first, second = change_stream.changes(), change_stream.changes()
+    pending = [asyncio.ensure_future(take(first, 2)), asyncio.ensure_future(take(second, 2))]
+    await asyncio.sleep(0)
+
+    change_stream.publish(("1-0", get_message()))
+    change_stream.publish(("2-0", get_message()))
+
+    for changes in await asyncio.gather(*pending):
+        assert [change_id for change_id, _ in changes] == ["1-0", "2-0"]
+    assert change_stream.subscriber_count == 2
+
+
+@pytest.mark.asyncio
+async def test_yields_none_as_heartbeat():
+    changes = get_change_stream(heartbeat_interval=0.01).changes()
+
+    assert await anext(changes) is None
+    await changes.aclose()
+
+
+@pytest.mark.asyncio
+async def test_a_subscriber_falling_behind_is_disconnected():
+    change_stream = get_change_stream(subscriber_queue_size=1, heartbeat_interval=60)
+    changes = change_stream.changes()
+    pending = asyncio.ensure_future(anext(changes))
+    await asyncio.sleep(0)
+
+    # the second change finds the queue full, the subscriber resumes later from its last change id
+    change_stream.publish(("1-0", get_message()))
+    change_stream.publish(("2-0", get_message()))
+
+    with pytest.raises(StopAsyncIteration):
+        await pending
+    assert change_stream.subscriber_count == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_events_filters_and_builds_events():
+    change_stream = get_change_stream(heartbeat_interval=60)
+    event_service = EventService(dal=None, change_stream=change_stream)
+    node_id = uuid4()
+    events = event_service.stream_events(entity_type=EntityTypeEnum.METRIC, node_id=node_id)
+    pending = asyncio.ensure_future(anext(events))
+    await asyncio.sleep(0)
+
+    change_stream.publish(("1-0", get_message(entity_type=EntityTypeEnum.METRIC_SET, node_id=node_id)))
+    change_stream.publish(("2-0", get_message()))
+    message = get_message(node_id=node_id)
+    change_stream.publish(("3-0", message))
+
+    change_id, event_model = await pending
+    assert change_id == "3-0"
+    assert str(event_model.id) == message["event_id"]
+    assert event_model.node_id == node_id
+    assert event_model.event_type == EventTypeEnum.UPDATED
+    assert event_model.user_id is None
+    assert event_model.new_data == {"name": "metric"}
+
+
+@pytest.mark.asyncio
+async def test_stream_events_yields_a_heartbeat_when_the_changes_are_filtered_out():
+    change_stream = get_change_stream(heartbeat_interval=0.05)
+    event_service = EventService(dal=None, change_stream=change_stream)
+    events = event_service.stream_events(node_id=uuid4())
+    pending = asyncio.ensure_future(anext(events))
+    await asyncio.sleep(0)
+
+    # a busy stream, the pod gets a change more often than the heartbeat interval, none of the subscriber's node
+    for index in range(50):
+        if pending.done():
+            break
+        change_stream.publish((f"{index + 1}-0", get_message()))
+        await asyncio.sleep(0.01)
+
+    assert pending.done()
+    assert pending.result() is None
+    await events.aclose()
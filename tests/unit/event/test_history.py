@@ -0,0 +1,88 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from app.common.enums.enums import EntityTypeEnum, EventTypeEnum
+from app.components.events.history import history_response
+from app.components.events.models.event import EventModel
+from app.components.events.service import HISTORY_SORT_FIELD, EventService
+from app.components.utils.pagination import decode_cursor, encode_cursor, keyset_pagination
+from matter_persistence.sql.utils import SortMethodModel
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+
+class FakeEventDAL:
+    def __init__(self, event_models=()):
+        self.calls = []
+        self.event_models = list(event_models)
+
+    async def find_events(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.event_models[: kwargs["limit"]]
+
+
+@pytest.mark.asyncio
+async def test_find_node_history_reads_the_node_events_newest_first():
+    dal = FakeEventDAL()
+    node_id = uuid4()
+    created_from = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    last_event = EventModel(id=uuid4(), created=datetime(2026, 2, 1, tzinfo=timezone.utc))
+    cursor = encode_cursor(last_event, HISTORY_SORT_FIELD)
+
+    await EventService(dal=dal).find_node_history(
+        entity_type=EntityTypeEnum.METRIC, node_id=node_id, limit=10, cursor=cursor, created_from=created_from
+    )
+
+    assert dal.calls == [
+        {
+            "limit": 10,
+            "sort_field": "created",
+            "sort_method": SortMethodModel.DESC,
+            "with_deleted": False,
+            "filters": {"entity_type": EntityTypeEnum.METRIC, "node_id": node_id, "created_from": created_from},
+            "after": decode_cursor(cursor, HISTORY_SORT_FIELD),
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_history_response_pages_the_node_events():
+    node_id = uuid4()
+    event_models = [
+        EventModel(
+            id=uuid4(),
+            event_type=EventTypeEnum.UPDATED,
+            entity_type=EntityTypeEnum.METRIC,
+            node_id=node_id,
+            new_data={"index": index},
+            created=datetime(2026, 2, 10 - index, tzinfo=timezone.utc),
+            updated=datetime(2026, 2, 10 - index, tzinfo=timezone.utc),
+        )
+        for index in range(3)
+    ]
+    dal = FakeEventDAL(event_models)
+
+    response_dto = await history_response(
+        EventService(dal=dal),
+        entity_type=EntityTypeEnum.METRIC,
+        node_id=node_id,
+        cursor=None,
+        limit=2,
+        created_from=None,
+        created_to=None,
+    )
+
+    assert response_dto.count == 2
+    assert [event.id for event in response_dto.events] == [event_model.id for event_model in event_models[:2]]
+    assert response_dto.next_cursor == encode_cursor(event_models[1], HISTORY_SORT_FIELD)
+    assert dal.calls[0]["filters"] == {"entity_type": EntityTypeEnum.METRIC, "node_id": node_id}
+
+
+def test_history_order_matches_the_node_index():
+    statement = keyset_pagination(EventModel, HISTORY_SORT_FIELD, SortMethodModel.DESC)(select(EventModel))
+
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert sql.endswith("ORDER BY events.created DESC, events.id DESC")
+    index = next(index for index in EventModel.__table__.indexes if index.name == "ix_events_node_id_created")
+    assert [str(expression) for expression in index.expressions] == ["events.node_id", "created DESC", "id DESC"]
@@ -0,0 +1,58 @@
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from app.common.enums.enums import EntityTypeEnum, EventTypeEnum
+from app.components.events.models.outbox_entry import OutboxEntryModel
+from app.components.events.outbox_relay import MemoryOutboxSink, OutboxRelay, outbox_message
+
+
+class FakeEventDAL:
+    """Hands out the outbox entries in batches, like the outbox table would."""
+
+    def __init__(self, outbox_entries):
+        self._outbox_entries = list(outbox_entries)
+
+    async def relay_outbox_entries(self, limit, publish):
+        outbox_entries = self._outbox_entries[:limit]
+        if outbox_entries:
+            await publish(outbox_entries)
+        self._outbox_entries = self._outbox_entries[limit:]
+        return len(outbox_entries)
+
+
+def get_outbox_entry(sequence: int, user_id=None) -> OutboxEntryModel:
+    return OutboxEntryModel(
+        sequence=sequence,
+        event_id=uuid4(),
+        event_type=EventTypeEnum.UPDATED,
+        entity_type=EntityTypeEnum.METRIC,
+        node_id=uuid4(),
+        user_id=user_id,
+        new_data={"name": "metric"},
+        created=datetime(2026, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def test_outbox_message_is_flat_strings():
+    outbox_entry = get_outbox_entry(7)
+
+    message = outbox_message(outbox_entry)
+
+    assert all(isinstance(value, str) for value in message.values())
+    assert message["sequence"] == "7"
+    assert message["event_type"] == "updated"
+    assert message["user_id"] == ""
+    assert json.loads(message["new_data"]) == {"name": "metric"}
+    assert message["created"] == "2026-01-01T00:00:00+00:00"
+
+
+@pytest.mark.asyncio
+async def test_relay_publishes_in_sequence_order():
+    outbox_entries = [get_outbox_entry(sequence) for sequence in range(1, 6)]
+    sink = MemoryOutboxSink()
+    outbox_relay = OutboxRelay(dal=FakeEventDAL(outbox_entries), sink=sink, batch_size=2)
+
+    assert [await outbox_relay.relay() for _ in range(4)] == [2, 2, 1, 0]
+    assert [message["sequence"] for message in sink.messages] == ["1", "2", "3", "4", "5"]
@@ -0,0 +1,86 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from app.components.events.dal import created_range
+from app.components.events.models.event import EventModel
+from app.components.events.partitions import (
+    add_months,
+    expired_partitions,
+    partition_bounds,
+    partition_month,
+    partition_name,
+    upcoming_months,
+)
+from app.components.events.service import EventService
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+
+class FakeEventDAL:
+    def __init__(self, partitions):
+        self.partitions = partitions
+        self.detached = []
+
+    async def find_event_partitions(self):
+        return self.partitions
+
+    async def create_event_partitions(self, months):
+        names = [partition_name(month) for month in months if partition_name(month) not in self.partitions]
+        self.partitions = self.partitions + names
+        return names
+
+    async def detach_event_partition(self, name, drop=False):
+        self.detached.append((name, drop))
+
+
+def test_add_months_crosses_years():
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+def test_partition_name_and_month():
+    assert partition_name(date(2026, 3, 1)) == "events_y2026m03"
+    assert partition_month("events_y2026m03") == date(2026, 3, 1)
+    assert partition_month("events_default") is None
+
+
+def test_partition_bounds():
+    assert partition_bounds(date(2026, 12, 1)) == (
+        datetime(2026, 12, 1, tzinfo=timezone.utc),
+        datetime(2027, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def test_upcoming_and_expired_partitions():
+    today = date(2026, 10, 17)
+
+    assert upcoming_months(today, 2) == [date(2026, 10, 1), date(2026, 11, 1), date(2026, 12, 1)]
+    assert expired_partitions(
+        ["events_default", "events_y2026m07", "events_y2026m06", "events_y2026m08", "events_y2025m12"],
+        today,
+        retention_months=3,
+    ) == ["events_y2025m12", "events_y2026m06"]
+
+
+def test_created_range_compares_the_partition_key():
+    custom_filter = created_range(
+        {"node_id": "ignored", "created_from": datetime(2026, 1, 1), "created_to": datetime(2026, 2, 1)}
+    )
+
+    sql = str(custom_filter(select(EventModel)).compile(dialect=postgresql.dialect()))
+    assert "events.created >= %(created_1)s AND events.created < %(created_2)s" in sql
+    assert created_range({"node_id": "ignored"}) is None
+
+
+@pytest.mark.asyncio
+async def test_manage_partitions_creates_the_missing_and_detaches_the_expired():
+    dal = FakeEventDAL(partitions=["events_default", "events_y2026m06", "events_y2026m10"])
+    event_service = EventService(dal=dal)
+
+    created, detached = await event_service.manage_partitions(
+        months_ahead=1, retention_months=3, drop=True, today=date(2026, 10, 17)
+    )
+
+    assert created == ["events_y2026m11"]
+    assert detached == ["events_y2026m06"]
+    assert dal.detached == [("events_y2026m06", True)]
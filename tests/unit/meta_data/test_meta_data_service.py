@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+from app.common.enums.enums import EntityTypeEnum
+from app.components.utils.meta_data_service import MetaDataService
+
+PROPERTY_ID = "8d3a6c1e-0f6b-4a5e-9c47-2b1f0e7d9a13"
+
+
+class FakePropertyCache:
+    """Serves the property maps of one property and records the single-row name lookups."""
+
+    def __init__(self):
+        self.name_lookups = []
+
+    def add_listener(self, listener):
+        pass
+
+    async def get_version(self, entity_type):
+        return 1
+
+    async def get_property_maps(self, entity_type):
+        return {"owner": PROPERTY_ID}, {PROPERTY_ID: "owner"}, {PROPERTY_ID: {"data_type": "string", "is_required": False}}
+
+    async def get_property_names(self, entity_type, property_ids):
+        self.name_lookups.append(property_ids)
+        return {PROPERTY_ID: "owner"}
+
+
+@pytest.mark.asyncio
+async def test_ids_to_names_refreshes_the_local_maps_after_a_lookup():
+    property_cache = FakePropertyCache()
+    meta_data_service = MetaDataService(property_service=None, property_cache=property_cache)
+
+    first = await meta_data_service.convert_metadata_ids_to_names(EntityTypeEnum.METRIC, {PROPERTY_ID: "team"})
+    # the maps are reloaded in the background
+    await asyncio.sleep(0)
+    second = await meta_data_service.convert_metadata_ids_to_names(EntityTypeEnum.METRIC, {PROPERTY_ID: "team"})
+
+    assert first == second == {"owner": "team"}
+    assert property_cache.name_lookups == [[PROPERTY_ID]]
@@ -0,0 +1,31 @@
+from app.components.data_metrics.models.data_metric import DataMetricModel
+
+# the related models are imported so the mappers can be configured
+from app.components.metric_set_trees.models.metric_set_tree import MetricSetTreeModel  # noqa: F401
+from app.components.metric_sets.models.metric_set import MetricSetModel  # noqa: F401
+from app.components.metrics.models.metric import MetricModel  # noqa: F401
+from app.components.utils.meta_data_sql import meta_data_filter
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+
+def compile_filter(meta_data_filters: dict) -> str:
+    statement = meta_data_filter(DataMetricModel, meta_data_filters)(select(DataMetricModel))
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_meta_data_filter_gathers_values_into_one_containment():
+    sql = compile_filter({"id-label": "a", "id-weight": 2})
+    assert sql.count("@>") == 1
+
+
+def test_meta_data_filter_list_matches_any_value():
+    sql = compile_filter({"id-weight": [1, 2]})
+    assert sql.count("@>") == 2
+    assert " OR " in sql
+
+
+def test_meta_data_filter_none_matches_absent_or_null():
+    sql = compile_filter({"id-label": None})
+    assert "meta_data IS NULL" in sql
+    assert "?" in sql
@@ -0,0 +1,77 @@
+from uuid import uuid4
+
+import pytest
+from app.components.utils.meta_data_validator import MetaDataValidator
+
+
+@pytest.fixture
+def validator():
+    return MetaDataValidator(
+        names_to_ids={"label": "id-label", "weight": "id-weight", "enabled": "id-enabled", "source": "id-source"},
+        schema={
+            "id-label": {"data_type": "string", "is_required": True},
+            "id-weight": {"data_type": "number", "is_required": False},
+            "id-enabled": {"data_type": "boolean", "is_required": False},
+            "id-source": {"data_type": "UUID", "is_required": False},
+        },
+    )
+
+
+def test_validate_valid_meta_data(validator):
+    source = str(uuid4())
+    converted, errors = validator.validate({"label": "a", "weight": 1.5, "enabled": True, "source": source})
+    assert errors == {}
+    assert converted == {"id-label": "a", "id-weight": 1.5, "id-enabled": True, "id-source": source}
+
+
+def test_validate_invalid_key(validator):
+    _, errors = validator.validate({"label": "a", "unknown": "b"})
+    assert errors["invalid_keys"] == ["unknown"]
+    assert set(errors["valid_keys"]) == {"label", "weight", "enabled", "source"}
+
+
+@pytest.mark.parametrize(
+    "key, value",
+    [
+        ("weight", "1"),
+        ("weight", True),
+        ("enabled", 1),
+        ("source", "not-a-uuid"),
+        ("label", 5),
+    ],
+)
+def test_validate_invalid_value_type(validator, key, value):
+    meta_data = {"label": "a", key: value}
+    _, errors = validator.validate(meta_data)
+    assert key in errors["invalid_values"]
+
+
+def test_validate_missing_required_key(validator):
+    _, errors = validator.validate({"weight": 2})
+    assert errors == {"missing_required_keys": ["label"]}
+
+
+def test_validate_null_values(validator):
+    _, errors = validator.validate({"label": None, "weight": None})
+    assert errors == {"invalid_values": {"label": "string"}}
+
+
+def test_validate_filters(validator):
+    converted, errors = validator.validate_filters({"weight": [1, 2.5], "enabled": True, "source": None})
+    assert errors == {}
+    assert converted == {"id-weight": [1, 2.5], "id-enabled": True, "id-source": None}
+
+
+@pytest.mark.parametrize(
+    "meta_data_filters, error",
+    [
+        ({"unknown": "b"}, "invalid_keys"),
+        ({"weight": "1"}, "invalid_values"),
+        ({"weight": [1, "2"]}, "invalid_values"),
+        ({"weight": []}, "invalid_values"),
+    ],
+)
+def test_validate_invalid_filters(validator, meta_data_filters, error):
+    _, errors = validator.validate_filters(meta_data_filters)
+    assert error in errors
+    assert "missing_required_keys" not in errors
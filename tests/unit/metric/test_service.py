@@ -0,0 +1,54 @@
+import pytest
+
+# the related models are imported so the mappers can be configured
+from app.components.data_metrics.models.data_metric import DataMetricModel  # noqa: F401
+from app.components.metric_set_trees.models.metric_set_tree import MetricSetTreeModel  # noqa: F401
+from app.components.metric_sets.models.metric_set import MetricSetModel  # noqa: F401
+from app.components.metrics.models.metric import MetricModel
+from app.components.metrics.models.metric_update import MetricUpdateModel
+from app.components.metrics.service import MetricService
+from matter_exceptions.exceptions.fastapi import ValidationError
+
+
+class RequiredPropertyMetaDataService:
+    """Rejects the metadata missing the required property, as the compiled validator does."""
+
+    def __init__(self):
+        self.validated = []
+
+    async def convert_metadata_names_to_ids(self, entity_type, meta_data):
+        self.validated.append(meta_data)
+        if "owner" not in meta_data:
+            raise ValidationError(description="The required property owner is missing.")
+        return meta_data
+
+
+class FailingMetricDAL:
+    async def create_metric(self, metric_model):
+        raise AssertionError("invalid metadata must not be stored")
+
+    async def update_metrics_where(self, **kwargs):
+        raise AssertionError("an update without changes must not be applied")
+
+
+@pytest.mark.asyncio
+async def test_create_metric_validates_missing_metadata():
+    meta_data_service = RequiredPropertyMetaDataService()
+    metric_service = MetricService(dal=FailingMetricDAL(), meta_data_service=meta_data_service)
+
+    with pytest.raises(ValidationError):
+        await metric_service.create_metric(MetricModel(name="metric", meta_data=None))
+
+    assert meta_data_service.validated == [{}]
+
+
+@pytest.mark.asyncio
+async def test_update_metrics_where_rejects_empty_changes():
+    metric_service = MetricService(dal=FailingMetricDAL(), meta_data_service=RequiredPropertyMetaDataService())
+
+    with pytest.raises(ValidationError):
+        await metric_service.update_metrics_where(
+            filters={"status": "ACTIVE"},
+            metric_update_model=MetricUpdateModel(),
+            event_model=None,
+        )
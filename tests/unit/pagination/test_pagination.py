@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from app.common.enums.enums import EntityTypeEnum, EventTypeEnum
+from app.components.events.models.event import EventModel
+from app.components.utils.pagination import decode_cursor, encode_cursor, keyset_pagination, next_cursor
+from matter_exceptions.exceptions.fastapi import ValidationError
+from matter_persistence.sql.utils import SortMethodModel
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+
+@pytest.fixture
+def event():
+    return EventModel(
+        id=uuid4(),
+        event_type=EventTypeEnum.CREATED,
+        entity_type=EntityTypeEnum.METRIC,
+        node_id=uuid4(),
+        created=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        updated=datetime(2024, 1, 2, tzinfo=timezone.utc),
+    )
+
+
+@pytest.mark.parametrize("sort_field", [None, "created", "updated"])
+def test_cursor_round_trip(event, sort_field):
+    value, row_id = decode_cursor(encode_cursor(event, sort_field), sort_field)
+
+    assert row_id == event.id
+    assert value == (getattr(event, sort_field) if sort_field else None)
+
+
+def test_decode_cursor_for_other_sort_field(event):
+    with pytest.raises(ValidationError):
+        decode_cursor(encode_cursor(event, "created"), "updated")
+
+
+def test_decode_invalid_cursor():
+    with pytest.raises(ValidationError):
+        decode_cursor("not-a-cursor", None)
+
+
+def test_next_cursor(event):
+    assert next_cursor([event], None, limit=1) is not None
+    assert next_cursor([event], None, limit=2) is None
+    assert next_cursor([event], "name", limit=1) is None
+
+
+def test_keyset_pagination_orders_by_id_as_tie_breaker(event):
+    custom_filter = keyset_pagination(
+        EventModel, "created", SortMethodModel.DESC, after=decode_cursor(encode_cursor(event, "created"), "created")
+    )
+
+    statement = str(custom_filter(select(EventModel)).compile(dialect=postgresql.dialect()))
+
+    assert "(events.created, events.id) < (" in statement
+    assert statement.endswith("ORDER BY events.created DESC, events.id DESC")
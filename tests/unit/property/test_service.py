@@ -0,0 +1,99 @@
+import uuid
+
+import pytest
+from app.common.enums.enums import DataTypeEnum, EntityTypeEnum
+from app.components.properties.models.property import PropertyModel
+from app.components.properties.service import PropertyService
+
+
+class FakeDatabaseManager:
+    """Holds the after commit callbacks until the test commits or rolls back."""
+
+    def __init__(self):
+        self.callbacks = []
+
+    async def after_commit(self, callback):
+        self.callbacks.append(callback)
+
+    async def commit(self):
+        for callback in self.callbacks:
+            await callback()
+        self.callbacks = []
+
+
+class FakePropertyDAL:
+    async def create_property(self, property_model):
+        return property_model
+
+    async def delete_property(self, property_id, soft_delete):
+        return get_property_model(property_id)
+
+
+class RecordingPropertyCache:
+    def __init__(self):
+        self.calls = []
+
+    async def save_property(self, property_model):
+        self.calls.append(("save", property_model.property_name))
+
+    async def delete_property(self, property_model):
+        self.calls.append(("delete", property_model.property_name))
+
+    async def publish_invalidation(self, entity_type):
+        self.calls.append(("invalidate", entity_type))
+
+
+def get_property_model(property_id: uuid.UUID | None = None) -> PropertyModel:
+    return PropertyModel(
+        id=property_id or uuid.uuid4(),
+        property_name="owner",
+        entity_type=EntityTypeEnum.METRIC,
+        data_type=DataTypeEnum.STRING,
+    )
+
+
+@pytest.fixture
+def database_manager():
+    return FakeDatabaseManager()
+
+
+@pytest.fixture
+def property_cache():
+    return RecordingPropertyCache()
+
+
+@pytest.fixture
+def property_service(database_manager, property_cache):
+    return PropertyService(dal=FakePropertyDAL(), property_cache=property_cache, database_manager=database_manager)
+
+
+@pytest.mark.asyncio
+async def test_create_property_updates_the_cache_after_the_commit(property_service, database_manager, property_cache):
+    await property_service.create_property(get_property_model())
+    assert property_cache.calls == []
+
+    await database_manager.commit()
+
+    assert property_cache.calls == [("save", "owner"), ("invalidate", EntityTypeEnum.METRIC)]
+
+
+@pytest.mark.asyncio
+async def test_delete_property_updates_the_cache_after_the_commit(property_service, database_manager, property_cache):
+    await property_service.delete_property(uuid.uuid4())
+    assert property_cache.calls == []
+
+    await database_manager.commit()
+
+    assert property_cache.calls == [("delete", "owner"), ("invalidate", EntityTypeEnum.METRIC)]
+
+
+@pytest.mark.asyncio
+async def test_a_failed_cache_update_does_not_fail_the_commit(property_service, database_manager, property_cache):
+    async def fail(property_model):
+        raise ConnectionError("unreachable")
+
+    property_cache.save_property = fail
+    property_model = get_property_model()
+
+    assert await property_service.create_property(property_model) is property_model
+    await database_manager.commit()
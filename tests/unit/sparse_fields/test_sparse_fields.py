@@ -0,0 +1,74 @@
+import json
+from uuid import uuid4
+
+import pytest
+from app.common.enums.enums import StatusEnum
+from app.components.data_metrics.models.data_metric import DataMetricModel
+
+# the related models are imported so the mappers can be configured
+from app.components.metric_set_trees.models.metric_set_tree import MetricSetTreeModel  # noqa: F401
+from app.components.metric_sets.models.metric_set import MetricSetModel  # noqa: F401
+from app.components.metrics.dtos import FullMetricOutDTO, MetricListOutDTO
+from app.components.metrics.models.metric import MetricModel
+from app.components.utils.sparse_fields import (
+    load_fields,
+    parse_fields,
+    sparse_dto,
+    sparse_list_dto,
+    sparse_response,
+)
+from matter_exceptions.exceptions.fastapi import ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+
+def test_parse_fields_accepts_aliases_and_names():
+    assert parse_fields("name, metaData,status,name_suffix", FullMetricOutDTO) == (
+        "id",
+        "status",
+        "name",
+        "name_suffix",
+        "meta_data",
+    )
+
+
+def test_parse_fields_normalizes_the_order():
+    assert parse_fields("id,name,status", FullMetricOutDTO) == parse_fields("status,name,id", FullMetricOutDTO)
+    assert parse_fields("name,name,status", FullMetricOutDTO) == ("id", "status", "name")
+
+
+def test_parse_fields_without_fields():
+    assert parse_fields(None, FullMetricOutDTO) is None
+    assert parse_fields("", FullMetricOutDTO) is None
+
+
+@pytest.mark.parametrize("fields", ["name,unknown", "createdAt"])
+def test_parse_fields_rejects_unknown_fields(fields):
+    with pytest.raises(ValidationError):
+        parse_fields(fields, FullMetricOutDTO)
+
+
+def test_load_fields_narrows_the_select():
+    statement = load_fields(DataMetricModel, ("id", "name"))(select(DataMetricModel))
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    assert "data_metrics.name" in sql
+    assert "data_metrics.meta_data" not in sql
+
+
+def test_sparse_dto_serializes_only_the_fields():
+    metric = MetricModel(id=uuid4(), name="metric", status=StatusEnum.DEPLOYED)
+    fields = ("id", "name", "status")
+
+    response_dto = sparse_list_dto(MetricListOutDTO, "metrics", FullMetricOutDTO, fields)(
+        count=1, metrics=sparse_dto(FullMetricOutDTO, fields).parse_obj([metric])
+    )
+    body = json.loads(sparse_response(response_dto, fields).body)
+
+    assert set(body["metrics"][0]) == {"id", "name", "status", "createdAt", "createdAtTimestamp"}
+    assert sparse_dto(FullMetricOutDTO, fields) is sparse_dto(FullMetricOutDTO, fields)
+
+
+def test_sparse_dto_without_fields_is_the_dto():
+    assert sparse_dto(FullMetricOutDTO, None) is FullMetricOutDTO
+    assert sparse_list_dto(MetricListOutDTO, "metrics", FullMetricOutDTO, None) is MetricListOutDTO